@@ -0,0 +1,233 @@
+"""
+Rendering of whole libraries of comics, where every folder with images
+becomes separate pdf file. Volumes are rendered in shared pool of processes.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, NamedTuple, Optional, TYPE_CHECKING
+
+from comix_pdf import exceptions
+from comix_pdf.types import Comics
+from comix_pdf.utils.folder_scanning import list_files_with_stats
+
+if TYPE_CHECKING:
+    from comix_pdf.cache import PageCache
+
+RENDERED = "rendered"
+SKIPPED = "skipped"
+FAILED = "failed"
+
+
+class VolumeResult(NamedTuple):
+    """
+    Result of rendering one folder of library.
+    """
+
+    folder: Path
+    output_file: Path
+    status: str
+    message: str = ""
+
+
+class BatchSummary(list, List[VolumeResult]):
+    @property
+    def rendered(self) -> List[VolumeResult]:
+        return [result for result in self if result.status == RENDERED]
+
+    @property
+    def skipped(self) -> List[VolumeResult]:
+        return [result for result in self if result.status == SKIPPED]
+
+    @property
+    def failed(self) -> List[VolumeResult]:
+        return [result for result in self if result.status == FAILED]
+
+
+def find_image_folders(root: Path) -> List[Path]:
+    """
+    Finds all folders that have files and no subfolders.
+
+    :param root: root folder of library.
+    :return: sorted list of folders.
+    """
+    folders: List[Path] = []
+    for folder, subfolders, files in os.walk(root):
+        if not subfolders and files:
+            folders.append(Path(folder))
+
+    return sorted(folders)
+
+
+def output_file_for(
+    root: Path, folder: Path, output_dir: Optional[Path] = None
+) -> Path:
+    """
+    Builds path of pdf for folder of library.
+
+    :param root: root folder of library.
+    :param folder: folder with images.
+    :param output_dir: where all pdf files are stored. By default, pdf is
+        stored inside of folder with images.
+    :return: path to output file.
+    """
+    if output_dir is None:
+        return folder / Comics.sanitize_output_file_name(folder.name)
+
+    # Folders with same names can be in different parts of library
+    relative_parts = folder.relative_to(root).parts or (folder.name,)
+    return output_dir / Comics.sanitize_output_file_name(
+        " - ".join(relative_parts)
+    )
+
+
+def is_up_to_date(folder: Path, output_file: Path) -> bool:
+    """
+    Checks that pdf is newer than all files in folder.
+
+    :param folder: folder with images.
+    :param output_file: path to rendered pdf.
+    :return: True if pdf doesn't need rendering.
+    """
+    if not output_file.is_file():
+        return False
+
+    output_mtime: float = output_file.stat().st_mtime
+    return all(
+        stat.st_mtime < output_mtime
+        for path, stat in list_files_with_stats(folder)
+        if path.name != output_file.name
+    )
+
+
+def render_volume(
+    folder: Path, output_file: Path,
+    quality: int = 90, resolution: int = 300,
+    jpeg_passthrough: bool = False,
+    page_cache: Optional['PageCache'] = None,
+    max_dpi: Optional[int] = None,
+    detect_grayscale: bool = False,
+    grayscale_tolerance: int = 8,
+    deduplicate: bool = False,
+    compression: str = "jpeg",
+    memory_limit: Optional[int] = None
+) -> VolumeResult:
+    """
+    Renders one folder of library, catching any errors.
+
+    :param folder: folder with images.
+    :param output_file: path to output file.
+    :param quality: the quality of images to be exported to pdf.
+    :param resolution: DPI resolution that will be used when printing.
+    :param jpeg_passthrough: if set, JPEG images are embedded as is.
+    :param page_cache: if set, encoded pages are taken from and stored
+        into that cache.
+    :param max_dpi: if set, pages are downscaled to that DPI.
+    :param detect_grayscale: if set, pages without visible color are
+        encoded as grayscale.
+    :param grayscale_tolerance: largest difference between color channels
+        of pixel that is still considered gray.
+    :param deduplicate: if set, pages with same content are embedded once.
+    :param compression: how pages are compressed: "jpeg", "flate", "auto"
+        or "smallest".
+    :param memory_limit: if set, memory budget in bytes for pages that are
+        encoded at once.
+    :return: result of rendering.
+    """
+    try:
+        comics = Comics.load_from_folder(folder)
+        comics.output_folder = output_file.parent
+        comics.output_file_name = output_file.name
+        comics.render(
+            quality, resolution, streaming=True,
+            jpeg_passthrough=jpeg_passthrough, page_cache=page_cache,
+            max_dpi=max_dpi, detect_grayscale=detect_grayscale,
+            grayscale_tolerance=grayscale_tolerance,
+            deduplicate=deduplicate, compression=compression,
+            memory_limit=memory_limit
+        )
+
+    except exceptions.DirectoryHasNoImages:
+        return VolumeResult(folder, output_file, SKIPPED, "no images")
+
+    except Exception as exc:
+        return VolumeResult(folder, output_file, FAILED, repr(exc))
+
+    return VolumeResult(folder, output_file, RENDERED)
+
+
+def render_library(
+    root: Path, output_dir: Optional[Path] = None,
+    quality: int = 90, resolution: int = 300,
+    workers: int = 1, jpeg_passthrough: bool = False,
+    page_cache: Optional['PageCache'] = None,
+    max_dpi: Optional[int] = None,
+    detect_grayscale: bool = False,
+    grayscale_tolerance: int = 8,
+    deduplicate: bool = False,
+    compression: str = "jpeg",
+    memory_limit: Optional[int] = None
+) -> BatchSummary:
+    """
+    Renders every folder of library that has images into its own pdf.
+    Pdf files that are newer than all of their images are skipped.
+
+    :param root: root folder of library.
+    :param output_dir: where all pdf files are stored. By default, pdf is
+        stored inside of folder with images.
+    :param quality: the quality of images to be exported to pdf.
+    :param resolution: DPI resolution that will be used when printing.
+    :param workers: how many volumes are rendered at once.
+    :param jpeg_passthrough: if set, JPEG images are embedded as is.
+    :param page_cache: if set, encoded pages are taken from and stored
+        into that cache.
+    :param max_dpi: if set, pages are downscaled to that DPI.
+    :param detect_grayscale: if set, pages without visible color are
+        encoded as grayscale.
+    :param grayscale_tolerance: largest difference between color channels
+        of pixel that is still considered gray.
+    :param deduplicate: if set, pages with same content are embedded once.
+    :param compression: how pages are compressed: "jpeg", "flate", "auto"
+        or "smallest".
+    :param memory_limit: if set, memory budget in bytes for pages that are
+        encoded at once.
+    :return: summary of rendering every volume.
+    :raises InputPathIsNotAFolder: if root isn't a directory.
+    """
+    if not root.is_dir():
+        raise exceptions.InputPathIsNotAFolder(f"{root} isn't a folder")
+
+    summary = BatchSummary()
+    volumes: List[VolumeResult] = []
+
+    for folder in find_image_folders(root):
+        output_file: Path = output_file_for(root, folder, output_dir)
+
+        if is_up_to_date(folder, output_file):
+            summary.append(
+                VolumeResult(folder, output_file, SKIPPED, "up to date")
+            )
+
+        else:
+            volumes.append(VolumeResult(folder, output_file, RENDERED))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                render_volume, volume.folder, volume.output_file,
+                quality, resolution, jpeg_passthrough, page_cache,
+                max_dpi, detect_grayscale, grayscale_tolerance,
+                deduplicate, compression, memory_limit
+            )
+            for volume in volumes
+        ]
+        summary.extend(future.result() for future in futures)
+
+    if page_cache is not None:
+        # Pages stored by processes of volumes are accounted and size limit
+        # is applied to all of them
+        page_cache.reload()
+
+    summary.sort(key=lambda result: result.folder)
+    return summary
@@ -0,0 +1,8 @@
+"""
+Benchmarks of ComixPDF rendering pipeline.
+Run python -m comix_pdf.bench to measure every stage of rendering on
+synthetic comics and compare results with stored baseline.
+"""
+
+from .generator import generate_comic
+from .runner import find_regressions, run_benchmark
@@ -0,0 +1,132 @@
+"""
+Benchmarks rendering pipeline on synthetic comics.
+
+Run it with: python -m comix_pdf.bench --output results.json
+Compare with previous run: python -m comix_pdf.bench --baseline results.json
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+from PIL import __version__ as pillow_version
+
+from comix_pdf import __version__
+from comix_pdf.pdf import COMPRESSIONS
+from comix_pdf.types import FillColor, RenderSettings
+from .generator import generate_comic
+from .runner import find_regressions, run_benchmark
+
+parser = argparse.ArgumentParser(
+    description="Benchmarks ComixPDF rendering on synthetic comics."
+)
+parser.add_argument("--pages", type=int, default=20)
+parser.add_argument(
+    "--size", type=str, default="1200x1800",
+    help="Size of pages in WIDTHxHEIGHT format"
+)
+parser.add_argument(
+    "--mode", type=str, default="RGB", choices=["RGB", "RGBA", "L", "P"]
+)
+parser.add_argument(
+    "--format", type=str, default="JPEG", dest="image_format",
+    choices=["JPEG", "PNG", "WEBP"]
+)
+parser.add_argument("--quality", type=int, default=90)
+parser.add_argument("--resolution", type=int, default=300)
+parser.add_argument(
+    "--compression", type=str, default="jpeg", choices=COMPRESSIONS
+)
+parser.add_argument(
+    "--jpeg-passthrough", action="store_true", dest="jpeg_passthrough"
+)
+parser.add_argument(
+    "--detect-grayscale", action="store_true", dest="detect_grayscale"
+)
+parser.add_argument(
+    "--repeats", type=int, default=3,
+    help="How many times pipeline is run, best time is kept"
+)
+parser.add_argument(
+    "--output", type=str, default=None,
+    help="Where to save results in JSON format"
+)
+parser.add_argument(
+    "--baseline", type=str, default=None,
+    help="Results of previous run to compare with"
+)
+parser.add_argument(
+    "--threshold", type=float, default=0.1,
+    help="Allowed slowdown of every stage compared to baseline"
+)
+
+
+def main() -> int:
+    args = parser.parse_args()
+    width, height = (int(value) for value in args.size.lower().split("x"))
+
+    with tempfile.TemporaryDirectory() as folder:
+        generate_comic(
+            Path(folder), args.pages, (width, height),
+            args.mode, args.image_format
+        )
+        fill_color = None
+        if args.mode in ("RGBA", "P"):
+            fill_color = FillColor(255, 255, 255)
+
+        settings = RenderSettings(
+            args.quality, args.resolution, fill_color,
+            jpeg_passthrough=args.jpeg_passthrough,
+            detect_grayscale=args.detect_grayscale,
+            compression=args.compression
+        )
+        stages = run_benchmark(Path(folder), args.repeats, settings)
+
+    results = {
+        "config": {
+            "pages": args.pages,
+            "size": [width, height],
+            "mode": args.mode,
+            "format": args.image_format,
+            "quality": args.quality,
+            "resolution": args.resolution,
+            "compression": args.compression,
+            "jpeg_passthrough": args.jpeg_passthrough,
+            "detect_grayscale": args.detect_grayscale,
+            "repeats": args.repeats,
+            "comix_pdf": __version__,
+            "pillow": pillow_version,
+        },
+        "stages": stages,
+    }
+
+    for stage, result in stages.items():
+        print(
+            f"{stage:>8}: {result['seconds']:.3f}s, "
+            f"added memory: {result['added_rss'] / 2 ** 20:.1f} MB"
+        )
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+
+        regressions = find_regressions(
+            stages, baseline["stages"], args.threshold
+        )
+        for regression in regressions:
+            print(f"Regression in {regression}")
+
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
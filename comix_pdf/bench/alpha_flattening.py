@@ -0,0 +1,118 @@
+"""
+Compares flattening of transparent pages with splitting alpha channel
+out of image against compositing in one pass.
+
+Run it with: python -m comix_pdf.bench.alpha_flattening
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+from PIL import Image
+
+from comix_pdf.types import FillColor
+from comix_pdf.types.image import flatten_transparency
+
+FILL_COLOR = FillColor(255, 255, 255)
+
+
+def flatten_by_splitting(img: Image.Image) -> Image.Image:
+    """
+    Previous way of flattening that splits RGBA image into channels first.
+
+    :param img: decoded transparent image.
+    :return: flattened image.
+    """
+    img = img.convert("RGBA")
+    transparency = img.split()[3]
+    new_img = Image.new(
+        "RGB", img.size, (FILL_COLOR.Red, FILL_COLOR.Green, FILL_COLOR.Blue)
+    )
+    new_img.paste(img, mask=transparency)
+    return new_img
+
+
+def flatten_by_compositing(img: Image.Image) -> Image.Image:
+    """
+    Current way of flattening.
+
+    :param img: decoded transparent image.
+    :return: flattened image.
+    """
+    return flatten_transparency(img, FILL_COLOR)
+
+
+def make_transparent_page(path: Path, mode: str, width: int, height: int):
+    """
+    Saves PNG page with gradient of transparency.
+
+    :param path: where to save page.
+    :param mode: one of modes with transparency.
+    :param width: width of page.
+    :param height: height of page.
+    :return: nothing.
+    """
+    noise: Image.Image = Image.effect_noise((width, height), 64)
+    alpha: Image.Image = Image.linear_gradient("L").resize((width, height))
+
+    if mode == "P":
+        page = noise.convert("P")
+        page.info["transparency"] = 0
+        page.save(path, transparency=0)
+        return
+
+    bands: List[Image.Image] = [noise] * (len(mode) - 1) + [alpha]
+    Image.merge(mode, bands).save(path)
+
+
+def measure(function: Callable[[Image.Image], Image.Image],
+            img: Image.Image, repeats: int) -> float:
+    """
+    Measures best time of flattening decoded image.
+
+    :param function: flattening function.
+    :param img: decoded transparent image.
+    :param repeats: how many times to repeat measurement.
+    :return: best time in seconds.
+    """
+    best: float = float("inf")
+    for _ in range(repeats):
+        started: float = time.perf_counter()
+        function(img)
+        best = min(best, time.perf_counter() - started)
+
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--width", type=int, default=4000)
+    parser.add_argument("--height", type=int, default=6000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for mode in ("RGBA", "LA", "P"):
+            path = Path(directory) / f"page_{mode}.png"
+            make_transparent_page(path, mode, args.width, args.height)
+            with Image.open(path) as img:
+                img.load()
+                splitting: float = measure(
+                    flatten_by_splitting, img, args.repeats
+                )
+                compositing: float = measure(
+                    flatten_by_compositing, img, args.repeats
+                )
+            print(
+                f"{mode:>4} {args.width}x{args.height}: "
+                f"splitting {splitting:.3f}s, "
+                f"compositing {compositing:.3f}s, "
+                f"speedup x{splitting / compositing:.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Generator of synthetic comics used by benchmarks.
+"""
+
+import random
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+from PIL import Image, ImageDraw
+
+# Modes that every format can store
+SUPPORTED_MODES: Dict[str, Set[str]] = {
+    "JPEG": {"RGB", "L"},
+    "PNG": {"RGB", "RGBA", "L", "P"},
+    "WEBP": {"RGB", "RGBA"},
+}
+EXTENSIONS: Dict[str, str] = {
+    "JPEG": "jpg",
+    "PNG": "png",
+    "WEBP": "webp",
+}
+
+
+def generate_page(
+    size: Tuple[int, int], mode: str, seed: int
+) -> Image.Image:
+    """
+    Draws page that looks like comics page: noisy panels with frames and
+    some flat colored shapes.
+
+    :param size: width and height of page.
+    :param mode: one of RGB, RGBA, L or P modes.
+    :param seed: seed of random generator, so pages are reproducible.
+    :return: generated page.
+    """
+    generator = random.Random(seed)
+    width, height = size
+
+    page: Image.Image = Image.new("RGB", size, (255, 255, 255))
+    draw = ImageDraw.Draw(page)
+
+    panels_in_row: int = 2
+    panels_in_column: int = 3
+    panel_width: int = width // panels_in_row
+    panel_height: int = height // panels_in_column
+    margin: int = max(1, min(width, height) // 50)
+
+    for column in range(panels_in_column):
+        for row in range(panels_in_row):
+            box = (
+                row * panel_width + margin,
+                column * panel_height + margin,
+                (row + 1) * panel_width - margin,
+                (column + 1) * panel_height - margin,
+            )
+            noise: Image.Image = Image.effect_noise(
+                (box[2] - box[0], box[3] - box[1]), generator.randint(10, 80)
+            )
+            page.paste(noise.convert("RGB"), box[:2])
+
+            for _ in range(3):
+                x = generator.randint(box[0], box[2])
+                y = generator.randint(box[1], box[3])
+                radius = generator.randint(margin, margin * 5)
+                draw.ellipse(
+                    (x - radius, y - radius, x + radius, y + radius),
+                    fill=tuple(generator.randint(0, 255) for _ in range(3))
+                )
+
+            draw.rectangle(box, outline=(0, 0, 0), width=margin // 2 + 1)
+
+    if mode == "RGBA":
+        alpha: Image.Image = Image.linear_gradient("L").resize(size)
+        page.putalpha(alpha)
+        return page
+
+    if mode == "P":
+        return page.quantize(64)
+
+    return page.convert(mode)
+
+
+def generate_comic(
+    folder: Path, pages: int = 20, size: Tuple[int, int] = (1200, 1800),
+    mode: str = "RGB", image_format: str = "JPEG", seed: int = 0
+) -> List[Path]:
+    """
+    Saves synthetic comics into folder.
+
+    :param folder: where to save pages.
+    :param pages: amount of pages.
+    :param size: width and height of pages.
+    :param mode: one of RGB, RGBA, L or P modes.
+    :param image_format: one of JPEG, PNG or WEBP formats.
+    :param seed: seed of random generator, so comics are reproducible.
+    :return: list of saved pages paths.
+    :raises ValueError: if format can't store pages of requested mode.
+    """
+    image_format = image_format.upper()
+    if mode not in SUPPORTED_MODES.get(image_format, set()):
+        raise ValueError(f"{image_format} can't store images in {mode} mode")
+
+    folder.mkdir(parents=True, exist_ok=True)
+    paths: List[Path] = []
+
+    for page_number in range(pages):
+        path = folder / f"page_{page_number:04d}.{EXTENSIONS[image_format]}"
+        generate_page(size, mode, seed + page_number).save(path, image_format)
+        paths.append(path)
+
+    return paths
@@ -0,0 +1,159 @@
+"""
+Measures separate stages of rendering pipeline: scanning folder,
+converting images to RGB, encoding them and writing pdf. Encoding stage
+runs same encoder as rendering, which decodes and converts images itself.
+"""
+
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+from comix_pdf.pdf import EncodedPage, PdfWriter, encode_image
+from comix_pdf.types import Comics, RenderSettings
+from comix_pdf.utils.memory import peak_rss
+
+STAGES = ("scan", "convert", "encode", "write")
+
+
+def run_once(
+    folder: Path, settings: RenderSettings = RenderSettings()
+) -> Dict[str, dict]:
+    """
+    Runs every stage of pipeline once. Every stage runs in its own fresh
+    process, so peak memory of process belongs to that stage only.
+
+    :param folder: folder with comics.
+    :param settings: settings of rendering used by encoder.
+    :return: seconds, peak memory of process and memory added by every
+        stage.
+    """
+    results: Dict[str, dict] = {}
+
+    with tempfile.TemporaryDirectory() as output_folder:
+        comics, results["scan"] = _run_stage(
+            _scan, Path(output_folder), folder
+        )
+        _, results["convert"] = _run_stage(_convert, comics, settings)
+        pages, results["encode"] = _run_stage(_encode, comics, settings)
+        output_size, results["write"] = _run_stage(
+            _write, pages, comics.output_file_path, settings.resolution
+        )
+        results["write"]["output_size"] = output_size
+
+    return results
+
+
+def run_benchmark(
+    folder: Path, repeats: int = 3,
+    settings: RenderSettings = RenderSettings()
+) -> Dict[str, dict]:
+    """
+    Runs pipeline several times keeping best time of every stage.
+
+    :param folder: folder with comics.
+    :param repeats: how many times pipeline is run.
+    :param settings: settings of rendering used by encoder.
+    :return: best seconds and memory of every stage.
+    """
+    best: Dict[str, dict] = {}
+
+    for _ in range(repeats):
+        for stage, result in run_once(folder, settings).items():
+            if stage not in best or result["seconds"] < best[stage]["seconds"]:
+                best[stage] = result
+
+    return best
+
+
+def _run_stage(
+    stage: Callable[..., Any], *args: Any
+) -> Tuple[Any, Dict[str, Any]]:
+    # Peak memory of process only grows, so every stage gets new process
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        return executor.submit(_measure_stage, stage, *args).result()
+
+
+def _measure_stage(
+    stage: Callable[..., Any], *args: Any
+) -> Tuple[Any, Dict[str, Any]]:
+    # Runs in fresh process, memory taken by interpreter and arguments is
+    # already counted in peak before stage starts
+    rss_before: int = peak_rss() or 0
+    started: float = time.perf_counter()
+    result: Any = stage(*args)
+    seconds: float = time.perf_counter() - started
+    rss_after: int = peak_rss() or 0
+
+    return result, {
+        "seconds": seconds,
+        "peak_rss": rss_after or None,
+        "added_rss": rss_after - rss_before,
+    }
+
+
+def _scan(output_folder: Path, folder: Path) -> Comics:
+    comics = Comics(output_folder, "benchmark.pdf")
+    comics.append_from_folder(folder)
+    return comics
+
+
+def _convert(comics: Comics, settings: RenderSettings) -> None:
+    for image in comics:
+        if settings.fill_color is None:
+            converted = image.convert_to_rgb()
+
+        else:
+            converted = image.convert_to_rgb_with_fill_color(
+                settings.fill_color
+            )
+
+        converted.close()
+
+
+def _encode(comics: Comics, settings: RenderSettings) -> List[EncodedPage]:
+    # Same encoder as rendering uses, including passthrough, reuse of PNG
+    # data, grayscale detection and choice of compression
+    return [encode_image(image, settings) for image in comics]
+
+
+def _write(
+    pages: List[EncodedPage], output_file_path: Path, resolution: int
+) -> int:
+    with output_file_path.open("w+b") as output_file:
+        writer = PdfWriter(output_file, resolution)
+        for page in pages:
+            writer.add_page(page)
+
+        writer.close()
+
+    return output_file_path.stat().st_size
+
+
+def find_regressions(
+    stages: Dict[str, dict], baseline: Dict[str, dict],
+    threshold: float = 0.1
+) -> List[str]:
+    """
+    Compares stages with baseline.
+
+    :param stages: measured stages.
+    :param baseline: stages of baseline run.
+    :param threshold: allowed slowdown, 0.1 means 10%.
+    :return: descriptions of stages that got slower than allowed.
+    """
+    regressions: List[str] = []
+
+    for stage in STAGES:
+        if stage not in stages or stage not in baseline:
+            continue
+
+        current: float = stages[stage]["seconds"]
+        previous: float = baseline[stage]["seconds"]
+        if current > previous * (1 + threshold):
+            regressions.append(
+                f"{stage}: {current:.3f}s against {previous:.3f}s in baseline"
+            )
+
+    return regressions
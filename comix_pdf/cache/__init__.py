@@ -0,0 +1,7 @@
+"""
+Persistent caches that let repeated runs skip work done previously.
+"""
+
+from .cache_dir import user_cache_dir
+from .page_cache import PageCache
+from .probe_cache import ProbeCache, ProbeResult
@@ -0,0 +1,25 @@
+"""
+Location of caches of current user.
+"""
+
+import os
+from pathlib import Path
+
+
+def user_cache_dir() -> Path:
+    """
+    Finds directory where ComixPDF stores caches of current user.
+
+    :return: path to cache directory.
+    """
+    if os.name == "nt":
+        cache_root = Path(
+            os.environ.get("LOCALAPPDATA", Path.home() / "AppData/Local")
+        )
+
+    else:
+        cache_root = Path(
+            os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")
+        )
+
+    return cache_root / "comix_pdf"
@@ -0,0 +1,216 @@
+"""
+Contains PageCache class that stores compressed streams of pages on disk,
+so pages that didn't change aren't encoded again on re-renders.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, TYPE_CHECKING
+
+from comix_pdf.pdf.encoding import EncodedPage
+from .cache_dir import user_cache_dir
+
+if TYPE_CHECKING:
+    from comix_pdf.types.image import ComicsImage
+    from comix_pdf.types.render_settings import RenderSettings
+
+# 1 GiB
+DEFAULT_MAX_SIZE = 1024 ** 3
+PAGE_FILE_SUFFIX = ".page"
+
+
+class PageCache:
+    """
+    Content addressed cache of encoded pages with limited size.
+    Least recently used pages are evicted first.
+    """
+
+    def __init__(self, directory: Path, max_size: int = DEFAULT_MAX_SIZE):
+        """
+        Opens or creates cache directory.
+
+        :param directory: where cached pages are stored.
+        :param max_size: maximum size of cache in bytes.
+        """
+        self.directory: Path = directory
+        self.max_size: int = max_size
+        self.hits: int = 0
+        self.misses: int = 0
+        self.total_size: int = 0
+
+        directory.mkdir(parents=True, exist_ok=True)
+
+        # Key to size of file, from least to most recently used
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self.reload()
+
+    def reload(self) -> None:
+        """
+        Reads entries of cache directory again, so pages that were stored or
+        evicted by other processes are accounted, and evicts least recently
+        used pages if cache got too big.
+
+        :return: nothing.
+        """
+        cached_files = []
+        for entry in os.scandir(self.directory):
+            if not entry.is_file() or not entry.name.endswith(
+                PAGE_FILE_SUFFIX
+            ):
+                continue
+
+            try:
+                stat = entry.stat()
+
+            except FileNotFoundError:
+                # Evicted by other process while directory was listed
+                continue
+
+            cached_files.append((stat.st_mtime_ns, entry.name, stat.st_size))
+
+        self._entries.clear()
+        self.total_size = 0
+        for _, name, size in sorted(cached_files):
+            self._entries[name[:-len(PAGE_FILE_SUFFIX)]] = size
+            self.total_size += size
+
+        while self.total_size > self.max_size:
+            oldest_key: str = next(iter(self._entries))
+            self._forget(oldest_key)
+
+    @classmethod
+    def in_user_cache_dir(
+        cls, max_size: int = DEFAULT_MAX_SIZE
+    ) -> "PageCache":
+        """
+        Opens cache stored in cache directory of current user.
+
+        :param max_size: maximum size of cache in bytes.
+        :return: instance of PageCache.
+        """
+        return cls(user_cache_dir() / "pages", max_size)
+
+    @staticmethod
+    def key_for(image: "ComicsImage", settings: "RenderSettings") -> str:
+        """
+        Builds key of page from identity of source file and render settings.
+
+        :param image: image of page.
+        :param settings: settings of rendering.
+        :return: hex digest used as key.
+        """
+        key_source: str = repr((image.source_identity, tuple(settings)))
+        return hashlib.sha256(key_source.encode("utf-8")).hexdigest()
+
+    def _path_of(self, key: str) -> Path:
+        return self.directory / f"{key}{PAGE_FILE_SUFFIX}"
+
+    def get(self, key: str) -> Optional[EncodedPage]:
+        """
+        Loads encoded page from cache.
+
+        :param key: key of page.
+        :return: encoded page or None if page isn't cached.
+        """
+        if key not in self._entries:
+            self.misses += 1
+            return None
+
+        path: Path = self._path_of(key)
+        try:
+            with path.open("rb") as cached_file:
+                header: dict = json.loads(cached_file.readline())
+                data: bytes = cached_file.read()
+
+            source_size = header["source_size"]
+
+            # Marking page as recently used for next runs
+            os.utime(path)
+
+        except (OSError, ValueError, KeyError):
+            self._forget(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+
+        return EncodedPage(
+            data, tuple(header["size"]),
+            color_space=header["color_space"],
+            filter=header["filter"],
+            passed_through=header["passed_through"],
+            source_size=tuple(source_size) if source_size else None,
+            converted_to_grayscale=header.get(
+                "converted_to_grayscale", False
+            ),
+            saved_size=header.get("saved_size", 0),
+            decode_parms=header.get("decode_parms"),
+            bits_per_component=header.get("bits_per_component", 8)
+        )
+
+    def put(self, key: str, page: EncodedPage) -> None:
+        """
+        Stores encoded page in cache, evicting least recently used pages
+        if cache gets too big.
+
+        :param key: key of page.
+        :param page: encoded page.
+        :return: nothing.
+        """
+        header: bytes = json.dumps({
+            "size": page.size,
+            "color_space": page.color_space,
+            "filter": page.filter,
+            "passed_through": page.passed_through,
+            "source_size": page.source_size,
+            "converted_to_grayscale": page.converted_to_grayscale,
+            "saved_size": page.saved_size,
+            "decode_parms": page.decode_parms,
+            "bits_per_component": page.bits_per_component,
+        }).encode("utf-8") + b"\n"
+        size: int = len(header) + len(page.data)
+
+        if size > self.max_size:
+            return
+
+        # Every writer gets its own temporary file, so processes that share
+        # cache directory don't write into same file
+        cached_file = tempfile.NamedTemporaryFile(
+            dir=self.directory, prefix=f"{key}.", suffix=".tmp", delete=False
+        )
+        try:
+            with cached_file:
+                cached_file.write(header)
+                cached_file.write(page.data)
+
+            os.replace(cached_file.name, self._path_of(key))
+
+        except BaseException:
+            os.remove(cached_file.name)
+            raise
+
+        self._forget(key, remove_file=False)
+        self._entries[key] = size
+        self.total_size += size
+
+        while self.total_size > self.max_size:
+            oldest_key: str = next(iter(self._entries))
+            self._forget(oldest_key)
+
+    def _forget(self, key: str, remove_file: bool = True) -> None:
+        size: Optional[int] = self._entries.pop(key, None)
+        if size is None:
+            return
+
+        self.total_size -= size
+        if remove_file:
+            try:
+                self._path_of(key).unlink()
+
+            except FileNotFoundError:
+                pass
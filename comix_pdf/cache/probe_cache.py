@@ -0,0 +1,214 @@
+"""
+Contains ProbeCache class that stores results of reading images headers
+in SQLite database, so unchanged files aren't opened again on next runs.
+"""
+
+import os
+import sqlite3
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Iterable, NamedTuple, Optional
+
+from comix_pdf.types.image import ImageHeader
+from .cache_dir import user_cache_dir
+
+SCHEMA_VERSION = 3
+
+
+class ProbeResult(NamedTuple):
+    """
+    Cached result of probing one file.
+    """
+
+    size: int
+    mtime_ns: int
+    # None if file isn't an image
+    header: Optional[ImageHeader]
+    verified: bool
+
+    def matches(self, stat: os.stat_result) -> bool:
+        """
+        Checks that file wasn't changed since it was probed.
+
+        :param stat: current stat of file.
+        :return: True if cached result can be used.
+        """
+        return self.size == stat.st_size and self.mtime_ns == stat.st_mtime_ns
+
+
+class ProbeCache:
+    """
+    Cache of images headers keyed by path, size and modification time.
+    Entries of files that were changed or deleted are evicted while
+    scanning folders.
+    """
+
+    def __init__(self, cache_file: Path):
+        """
+        Opens or creates cache database.
+
+        :param cache_file: path to SQLite database file.
+        """
+        self.cache_file: Path = cache_file
+        self.hits: int = 0
+        self.misses: int = 0
+        self._lock = Lock()
+
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        # Folders might be scanned from executor threads
+        self._connection = sqlite3.connect(
+            str(cache_file), check_same_thread=False
+        )
+
+        version: int = self._connection.execute(
+            "PRAGMA user_version"
+        ).fetchone()[0]
+        if version != SCHEMA_VERSION:
+            self._connection.execute("DROP TABLE IF EXISTS probes")
+
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS probes (
+                path TEXT PRIMARY KEY,
+                folder TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                valid INTEGER NOT NULL,
+                verified INTEGER NOT NULL,
+                format TEXT,
+                width INTEGER,
+                height INTEGER,
+                mode TEXT,
+                capture_timestamp REAL
+            )
+            """
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS probes_folder ON probes (folder)"
+        )
+        self._connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._connection.commit()
+
+    @classmethod
+    def in_user_cache_dir(cls) -> "ProbeCache":
+        """
+        Opens cache stored in cache directory of current user.
+
+        :return: instance of ProbeCache.
+        """
+        return cls(user_cache_dir() / "probes.sqlite3")
+
+    def load_folder(self, folder: Path) -> Dict[str, ProbeResult]:
+        """
+        Loads all cached results of files directly inside of folder.
+
+        :param folder: folder that is scanned.
+        :return: dictionary of file names and cached results.
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT path, size, mtime_ns, valid, verified, format, "
+                "width, height, mode, capture_timestamp "
+                "FROM probes WHERE folder = ?",
+                (os.path.abspath(folder),)
+            ).fetchall()
+
+        results: Dict[str, ProbeResult] = {}
+        for (
+            path, size, mtime_ns, valid, verified, image_format,
+            width, height, mode, capture_timestamp
+        ) in rows:
+            header: Optional[ImageHeader] = None
+            if valid:
+                header = ImageHeader(
+                    image_format, (width, height), mode, capture_timestamp
+                )
+
+            results[os.path.basename(path)] = ProbeResult(
+                size, mtime_ns, header, bool(verified)
+            )
+
+        return results
+
+    def store(
+        self, path: Path, stat: os.stat_result,
+        header: Optional[ImageHeader], verified: bool = False
+    ) -> None:
+        """
+        Saves result of probing file, replacing outdated entry.
+
+        :param path: path to file.
+        :param stat: stat of file at moment of probing.
+        :param header: header of image or None if file isn't an image.
+        :param verified: if image was fully verified.
+        :return: nothing.
+        """
+        absolute_path: str = os.path.abspath(path)
+        folder: str = os.path.dirname(absolute_path)
+
+        if header is None:
+            row = (
+                absolute_path, folder, stat.st_size, stat.st_mtime_ns,
+                0, 0, None, None, None, None, None
+            )
+
+        else:
+            row = (
+                absolute_path, folder, stat.st_size, stat.st_mtime_ns,
+                1, int(verified), header.format, header.size[0],
+                header.size[1], header.mode, header.capture_timestamp
+            )
+
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO probes VALUES "
+                "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                row
+            )
+
+    def evict_missing(self, folder: Path, existing: Iterable[str]) -> None:
+        """
+        Removes entries of files that were deleted from folder.
+
+        :param folder: folder that was scanned.
+        :param existing: names of files that are currently in folder.
+        :return: nothing.
+        """
+        existing_names = set(existing)
+
+        with self._lock:
+            cached_paths = self._connection.execute(
+                "SELECT path FROM probes WHERE folder = ?",
+                (os.path.abspath(folder),)
+            ).fetchall()
+            self._connection.executemany(
+                "DELETE FROM probes WHERE path = ?",
+                [
+                    (path,) for (path,) in cached_paths
+                    if os.path.basename(path) not in existing_names
+                ]
+            )
+
+    def commit(self) -> None:
+        """
+        Writes pending changes to disk.
+
+        :return: nothing.
+        """
+        with self._lock:
+            self._connection.commit()
+
+    def close(self) -> None:
+        """
+        Saves changes and closes database.
+
+        :return: nothing.
+        """
+        self.commit()
+        self._connection.close()
+
+    def __enter__(self) -> "ProbeCache":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
@@ -0,0 +1,8 @@
+"""
+Tools for writing comics into CBZ archives.
+Source files of pages are copied into archive as is, without decoding
+or compressing them again.
+"""
+
+from .comic_info import ComicInfo
+from .writer import CbzWriter
@@ -0,0 +1,68 @@
+"""
+Contains ComicInfo type that describes ComicInfo.xml metadata file which
+comic book readers use to show title, series and pages information.
+"""
+
+from io import BytesIO
+from typing import List, NamedTuple, Optional, Tuple
+from xml.etree import ElementTree
+
+
+class ComicInfoPage(NamedTuple):
+    """
+    Information about one page of CBZ archive.
+    """
+
+    size: Tuple[int, int]
+    # Size of image file inside of archive
+    file_size: int
+
+
+class ComicInfo(NamedTuple):
+    """
+    Metadata of comics. Fields that aren't set are not written.
+    """
+
+    title: Optional[str] = None
+    series: Optional[str] = None
+    number: Optional[str] = None
+    writer: Optional[str] = None
+    summary: Optional[str] = None
+
+    def to_xml(self, pages: List[ComicInfoPage]) -> bytes:
+        """
+        Makes ComicInfo.xml content.
+
+        :param pages: pages in order of archive.
+        :return: UTF-8 encoded xml document.
+        """
+        root = ElementTree.Element("ComicInfo")
+        # Schema of ComicInfo defines sequence, so elements are written in
+        # its order
+        fields = (
+            ("Title", self.title),
+            ("Series", self.series),
+            ("Number", self.number),
+            ("Summary", self.summary),
+            ("Writer", self.writer),
+            ("PageCount", str(len(pages))),
+        )
+        for tag, value in fields:
+            if value is not None:
+                ElementTree.SubElement(root, tag).text = value
+
+        pages_element = ElementTree.SubElement(root, "Pages")
+        for index, page in enumerate(pages):
+            ElementTree.SubElement(
+                pages_element, "Page",
+                Image=str(index),
+                ImageWidth=str(page.size[0]),
+                ImageHeight=str(page.size[1]),
+                ImageSize=str(page.file_size),
+            )
+
+        buffer = BytesIO()
+        ElementTree.ElementTree(root).write(
+            buffer, encoding="utf-8", xml_declaration=True
+        )
+        return buffer.getvalue()
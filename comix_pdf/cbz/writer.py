@@ -0,0 +1,120 @@
+"""
+Contains CbzWriter class that copies source files of pages into CBZ
+archive without compressing them.
+"""
+
+import shutil
+import time
+import zipfile
+from typing import BinaryIO, List, Optional, TYPE_CHECKING
+
+from .comic_info import ComicInfo, ComicInfoPage
+
+if TYPE_CHECKING:
+    from comix_pdf.types.image import ComicsImage
+
+# Size of chunks used to copy files
+COPY_BUFFER_SIZE = 1024 * 1024
+# Zip archives can't store earlier dates
+MIN_ZIP_TIMESTAMP = time.mktime((1980, 1, 1, 0, 0, 0, 0, 0, -1))
+# Entries bigger than that need zip64 headers
+ZIP64_LIMIT = zipfile.ZIP64_LIMIT
+# Extensions of formats that comic readers understand
+FORMAT_EXTENSIONS = {
+    "JPEG": ".jpg",
+    "PNG": ".png",
+    "GIF": ".gif",
+    "WEBP": ".webp",
+    "BMP": ".bmp",
+    "TIFF": ".tif",
+}
+
+
+class CbzWriter:
+    """
+    Writes pages into CBZ archive one by one.
+    Entries are stored, so archive is written at speed of disk.
+    """
+
+    def __init__(
+        self, output_file: BinaryIO, total_pages: int,
+        comic_info: Optional[ComicInfo] = None
+    ):
+        """
+        Starts new CBZ archive.
+
+        :param output_file: file opened in "w+b" mode.
+        :param total_pages: how many pages will be written, used to name
+            entries so that they are sorted correctly by any reader.
+        :param comic_info: if set, ComicInfo.xml is written into archive.
+        """
+        self.comic_info: Optional[ComicInfo] = comic_info
+        self._name_width: int = max(3, len(str(total_pages)))
+        self._pages: List[ComicInfoPage] = []
+        self._archive = zipfile.ZipFile(
+            output_file, "w", compression=zipfile.ZIP_STORED
+        )
+
+    def add_page(self, image: "ComicsImage") -> int:
+        """
+        Copies source file of image into archive byte for byte.
+
+        :param image: image of page.
+        :return: size of copied file.
+        """
+        info = zipfile.ZipInfo(
+            self.entry_name(len(self._pages), image),
+            date_time=time.localtime(
+                max(image.modification_timestamp, MIN_ZIP_TIMESTAMP)
+            )[:6]
+        )
+        info.compress_type = zipfile.ZIP_STORED
+        file_size: int = image.stored_size
+
+        with image.open_source() as source, self._archive.open(
+            info, "w", force_zip64=file_size >= ZIP64_LIMIT
+        ) as entry:
+            shutil.copyfileobj(source, entry, COPY_BUFFER_SIZE)
+
+        self._pages.append(ComicInfoPage(image.size, file_size))
+        return file_size
+
+    def entry_name(self, page_index: int, image: "ComicsImage") -> str:
+        """
+        Names page inside of archive by its position.
+
+        :param page_index: index of page.
+        :param image: image of page.
+        :return: name like "007.jpg".
+        """
+        extension: str = FORMAT_EXTENSIONS.get(
+            image.format, image.path.suffix.lower()
+        )
+        return f"{page_index:0{self._name_width}d}{extension}"
+
+    def discard(self) -> None:
+        """
+        Closes archive after writing failed, output file must be removed
+        by caller.
+
+        :return: nothing.
+        """
+        self._archive.close()
+
+    def close(self) -> None:
+        """
+        Writes ComicInfo.xml if needed and central directory of archive.
+
+        :return: nothing.
+        :raises ValueError: if no pages were added.
+        """
+        if len(self._pages) == 0:
+            self._archive.close()
+            raise ValueError("No images to render as CBZ")
+
+        if self.comic_info is not None:
+            self._archive.writestr(
+                "ComicInfo.xml", self.comic_info.to_xml(self._pages)
+            )
+
+        self._archive.close()
@@ -24,4 +24,28 @@ class InputPathIsNotAFolder(NotAFolder):
 class DirectoryHasNoImages(ValueError):
     """
     If input directory doesn't have any images this error is raised.
-    """
\ No newline at end of file
+    """
+
+
+class NotAnArchive(ValueError):
+    """
+    Input file isn't ZIP or TAR archive.
+    """
+
+
+class ArchiveHasNoImages(ValueError):
+    """
+    If input archive doesn't have any images this error is raised.
+    """
+
+
+class OutputFileIsInput(ValueError):
+    """
+    Output file would overwrite archive that images are read from.
+    """
+
+
+class OperationCancelled(Exception):
+    """
+    Rendering or scanning was stopped with cancellation token.
+    """
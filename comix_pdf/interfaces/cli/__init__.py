@@ -1,16 +1,26 @@
-from .inline_interface import parser, inline_render
+from .inline_interface import parser, inline_render, batch_render
 
 
 args, _ = parser.parse_known_args()
 
 
-if len(args.parts_paths):
+if len(args.parts_paths) or args.batch:
     from pathlib import Path
     paths: list[str] = list(args.parts_paths)
     title: str = args.title
-    output_directory: Path = Path(args.output_dir)
+    output_directory: Path = Path(args.output_dir or "./")
     resolution: int = args.resolution
     quality: int = args.quality
+    jobs: int = args.jobs
+    jpeg_passthrough: bool = args.jpeg_passthrough
+    scan_threads: int = args.scan_threads
+    probe_cache_path = Path(args.probe_cache) if args.probe_cache else None
+    page_cache = None
+    if args.page_cache:
+        from comix_pdf.cache import PageCache
+        page_cache = PageCache(
+            Path(args.page_cache), args.page_cache_size * 1024 ** 2
+        )
 
     if resolution < 1:
         raise ValueError("Too low value for printing quality")
@@ -20,13 +30,105 @@ if len(args.parts_paths):
             "Resolution must be set between 1 and 100 including both ends"
         )
 
-    print('renders')
-    inline_render(
-        title, paths,
-        output_directory,
-        quality, resolution
-    )
+    if args.max_dpi is not None and args.max_dpi < 1:
+        raise ValueError("Too low value for maximum DPI")
+
+    if jobs < 1:
+        raise ValueError("At least one job is required for rendering")
+
+    if args.memory_limit is not None and args.memory_limit < 1:
+        raise ValueError("Too low value for memory limit")
+
+    if args.volume_pages is not None and args.volume_pages < 1:
+        raise ValueError("Volume must have at least one page")
+
+    if args.volume_size is not None and args.volume_size < 1:
+        raise ValueError("Too low value for volume size")
+
+    if args.volume_jobs < 1:
+        raise ValueError("At least one job is required for rendering volumes")
+
+    if args.watch and (
+        len(paths) != 1 or not Path(paths[0]).is_dir()
+        or args.output_format != "pdf"
+    ):
+        raise ValueError("Watch mode renders pdf from exactly one folder")
+
+    if args.watch and (
+        args.volume_pages is not None or args.volume_size is not None
+        or args.split_by_folder
+    ):
+        raise ValueError("Watch mode renders single pdf file")
+
+    if args.append and (
+        args.output_format != "pdf" or args.volume_pages is not None
+        or args.volume_size is not None or args.split_by_folder
+    ):
+        raise ValueError("Only single pdf file can be appended to")
+
+    if args.compact and (
+        args.output_format != "pdf" or args.volume_pages is not None
+        or args.volume_size is not None or args.split_by_folder
+    ):
+        raise ValueError("Only single pdf file can be compacted")
+
+    if args.settle_time < 0:
+        raise ValueError("Settle time can't be negative")
+
+    if args.grayscale_tolerance not in range(0, 256):
+        raise ValueError(
+            "Grayscale tolerance must be set between 0 and 255"
+        )
+
+    if args.batch and (
+        args.output_format != "pdf" or args.profile or args.watch
+        or args.append or args.compact or args.volume_pages is not None
+        or args.volume_size is not None or args.split_by_folder
+    ):
+        raise ValueError("Batch mode renders single pdf file for every folder")
+
+    if args.batch:
+        batch_render(
+            Path(args.batch),
+            Path(args.output_dir) if args.output_dir else None,
+            quality, resolution, jobs,
+            jpeg_passthrough, page_cache,
+            args.max_dpi,
+            args.detect_grayscale,
+            args.grayscale_tolerance,
+            args.deduplicate,
+            args.compression,
+            args.memory_limit * 1024 ** 2 if args.memory_limit else None
+        )
+
+    else:
+        print('renders')
+        inline_render(
+            title, paths,
+            output_directory,
+            quality, resolution, jobs,
+            jpeg_passthrough, scan_threads,
+            probe_cache_path, page_cache,
+            args.max_dpi,
+            Path(args.profile) if args.profile else None,
+            args.natural_order,
+            args.output_format,
+            args.comic_info,
+            args.detect_grayscale,
+            args.grayscale_tolerance,
+            args.deduplicate,
+            args.compression,
+            args.memory_limit * 1024 ** 2 if args.memory_limit else None,
+            args.volume_pages,
+            args.volume_size * 1024 ** 2 if args.volume_size else None,
+            args.split_by_folder,
+            args.volume_jobs,
+            args.watch,
+            args.settle_time,
+            args.append,
+            args.compact
+        )
 
 else:
     from .cli_interface import ComixCLI
-    ComixCLI()
+    ComixCLI(not args.no_page_cache, args.page_cache_size * 1024 ** 2)
@@ -1,17 +1,33 @@
-from os import system
+from os import cpu_count, system
 from math import ceil
 from pathlib import Path
 from sys import exit
 from typing import Optional, List
 
+from PIL.PdfParser import PdfFormatError
 from PyInquirer import prompt, Separator, Validator, ValidationError
 from transitions import Machine
 
-from comix_pdf.types import Comics, ComicsImage, ExcludedImage
+from comix_pdf.cache import PageCache
+from comix_pdf.cache.page_cache import DEFAULT_MAX_SIZE
+from comix_pdf.cbz import ComicInfo
+from comix_pdf.types import (
+    Comics, ComicsImage, ExcludedImage, ExcludePages
+)
+from comix_pdf.utils.duplicates import DuplicateGroup, find_duplicates
+from .progress_bar import ProgressBar
 from .states import states
 
 # How many images can be displayed on one page in menus
 IMAGES_PER_PAGE = 8
+# Sorting options of images manager and orders of Comics.sort_images
+SORTING_OPTIONS = {
+    "Sort by names": "name",
+    "Sort by names with numbers": "natural_name",
+    "Sort by dates modified": "modification_timestamp",
+    "Sort by capture dates": "capture_timestamp",
+    "Sort by sizes": "size",
+}
 
 
 class IntValidator(Validator):
@@ -83,7 +99,10 @@ class ComixCLI:
     total_pages: int
     sort_in_reverse: bool
 
-    def __init__(self):
+    def __init__(
+        self, use_page_cache: bool = True,
+        page_cache_size: int = DEFAULT_MAX_SIZE
+    ):
         # Maybe will add more translations
         self.resolution: int = 300
         self.quality: int = 90
@@ -93,6 +112,17 @@ class ComixCLI:
         self.total_pages = 0
         self.excluded_images_page = 1
         self.excluded_images_pages_total = 0
+        # Pages that weren't changed aren't encoded again on re-renders
+        self.page_cache: Optional[PageCache] = None
+        if use_page_cache:
+            try:
+                self.page_cache = PageCache.in_user_cache_dir(
+                    page_cache_size
+                )
+
+            except OSError as error:
+                print(f"Pages cache is disabled: {error}")
+
         self.machine = Machine(
             model=self, states=states, initial="start menu",
         )
@@ -285,6 +315,10 @@ class ComixCLI:
                     Separator(" = Comics management = "),
                     "Images manager",
                     "Render comics",
+                    "Render comics as CBZ",
+                    "Render comics in volumes",
+                    "Append new pages to PDF",
+                    "Compact PDF",
                     Separator(" = Finishing working = "),
                     "Close loaded comics",
                     "Exit"
@@ -311,6 +345,18 @@ class ComixCLI:
         elif answer == "Render comics":
             self.render_comics()
 
+        elif answer == "Render comics as CBZ":
+            self.render_comics_as_cbz()
+
+        elif answer == "Render comics in volumes":
+            self.render_comics_in_volumes()
+
+        elif answer == "Append new pages to PDF":
+            self.append_new_pages()
+
+        elif answer == "Compact PDF":
+            self.compact_pdf()
+
         elif answer == "Close loaded comics":
             self.close_loaded_comics()
 
@@ -441,13 +487,17 @@ class ComixCLI:
                     Separator(" = Actions = "),
                     "Insert images",
                     "Excluded images",
+                    "Duplicate images",
                     Separator(" = Change page = "),
                     Separator(f"Current page: {self.page}"),
                     "Previous page",
                     "Next page",
                     Separator(" = Sorting = "),
                     "Sort by names",
+                    "Sort by names with numbers",
                     "Sort by dates modified",
+                    "Sort by capture dates",
+                    "Sort by sizes",
                     f"Change current sorting order to: {setting_sorting_mode_to}",
                     Separator(" = Return = "),
                     "Return to comics menu",
@@ -470,17 +520,9 @@ class ComixCLI:
                 self.page += 1
             self.images_manager_menu()
 
-        elif answer == "Sort by names":
-            self.comics.sort(
-                reverse=self.sort_in_reverse,
-                key=lambda img: img.name
-            )
-            self.images_manager_menu()
-
-        elif answer == "Sort by dates modified":
-            self.comics.sort(
-                reverse=self.sort_in_reverse,
-                key=lambda img: img.modification_timestamp
+        elif answer in SORTING_OPTIONS:
+            self.comics.sort_images(
+                SORTING_OPTIONS[answer], reverse=self.sort_in_reverse
             )
             self.images_manager_menu()
 
@@ -490,6 +532,9 @@ class ComixCLI:
         elif answer == "Excluded images":
             self.excluded_images()
 
+        elif answer == "Duplicate images":
+            self.duplicate_images()
+
         elif answer == "Exit":
             exit(0)
 
@@ -508,6 +553,47 @@ class ComixCLI:
         else:
             raise ValueError(f"Unknown answer: {answer}")
 
+    def duplicate_images(self):
+        groups: List[DuplicateGroup] = find_duplicates(
+            self.comics, near_duplicates=True
+        )
+        if not groups:
+            print("No duplicate images found")
+            self.images_manager_menu()
+            return
+
+        choices = []
+        for group in groups:
+            first_image: ComicsImage = self.comics[group.indices[0]]
+            kind: str = "same file" if group.exact else "looks alike"
+            # Pages are numbered from 1, like in images manager
+            choices.append(Separator(
+                f"= {group.indices[0] + 1}. {first_image.name} ({kind}) ="
+            ))
+            choices.extend(
+                {"name": f"{index + 1}. {self.comics[index].name}"}
+                for index in group.duplicates
+            )
+
+        duplicates_menu = [
+            {
+                "type": "checkbox",
+                "name": "excluded",
+                "message": "Select duplicates to exclude: ",
+                "choices": choices
+            }
+        ]
+        answer: List[str] = prompt(duplicates_menu)["excluded"]
+
+        # Indices of batch refer to order before exclusion
+        self.comics.apply_operations([
+            ExcludePages([
+                int(choice.split(".")[0]) - 1 for choice in answer
+            ])
+        ])
+
+        self.images_manager_menu()
+
     def select_image(self, image_index: int):
         image: ComicsImage = self.comics[image_index]
         excluded_image_at_index: int = -1
@@ -547,7 +633,7 @@ class ComixCLI:
                 exit(0)
 
             elif answer == "Show image":
-                image._img.show() # noqa: need to show image
+                image.show()
 
             elif answer == "Exclude image":
                 excluded_image_at_index = self.comics.exclude_image_from_output(
@@ -578,6 +664,13 @@ class ComixCLI:
 
     def excluded_images(self):
         while True:
+            self.excluded_images_pages_total = ceil(
+                len(self.comics.excluded_images) / IMAGES_PER_PAGE
+            )
+            # Last page might be emptied by restoring its images
+            self.excluded_images_page = max(1, min(
+                self.excluded_images_page, self.excluded_images_pages_total
+            ))
             images_page: list[ComicsImage] = self.current_excluded_page
             loaded_comics_menu = [
                 {
@@ -586,9 +679,21 @@ class ComixCLI:
                     "message": "Select action with images: ",
                     "choices": [
                         Separator(" = Images = "),
-                        *[f"{original_index}. {img.name}\n" for img, original_index in images_page],
+                        # Numbers are positions in list of excluded images,
+                        # that are used to restore them
+                        *[
+                            f"{n}. {excluded.image.name}\n"
+                            for n, excluded in enumerate(
+                                images_page,
+                                start=1 + (
+                                    self.excluded_images_page - 1
+                                ) * IMAGES_PER_PAGE
+                            )
+                        ],
                         Separator(" = Change page = "),
-                        Separator(f"Current page: {self.page}"),
+                        Separator(
+                            f"Current page: {self.excluded_images_page}"
+                        ),
                         "Previous page",
                         "Next page",
                         Separator(" = Return = "),
@@ -602,14 +707,17 @@ class ComixCLI:
 
             if answer == "Previous page":
                 # If we're still not on first page - we can go back
-                if self.page > 1:
-                    self.page -= 1
+                if self.excluded_images_page > 1:
+                    self.excluded_images_page -= 1
                 self.excluded_images()
 
             elif answer == "Next page":
                 # If we still hadn't reached final page - it is fine
-                if self.page < self.total_pages:
-                    self.page += 1
+                if (
+                    self.excluded_images_page
+                    < self.excluded_images_pages_total
+                ):
+                    self.excluded_images_page += 1
                 self.excluded_images()
 
             elif answer == "Return to images menu":
@@ -653,7 +761,7 @@ class ComixCLI:
                         exit(0)
 
                     elif answer == "Show image":
-                        excluded_image._img.show()  # noqa: need to show image
+                        excluded_image.image.show()
 
                     elif answer == "Restore image":
                         self.comics.restore_image_from_excluded(image_index)
@@ -673,7 +781,110 @@ class ComixCLI:
             return
 
     def render_comics(self):
-        self.comics.render(self.quality, self.resolution)
+        try:
+            self.comics.render(
+                self.quality, self.resolution, page_cache=self.page_cache,
+                on_event=ProgressBar()
+            )
+
+        except KeyboardInterrupt:
+            print("Rendering cancelled")
+
+        self.comics_loaded_menu()
+
+    def render_comics_as_cbz(self):
+        comic_info = ComicInfo(title=self.comics.output_file_path.stem)
+        try:
+            self.comics.render_cbz(comic_info, on_event=ProgressBar())
+
+        except KeyboardInterrupt:
+            print("Rendering cancelled")
+
+        self.comics_loaded_menu()
+
+    def render_comics_in_volumes(self):
+        split_prompt = [
+            {
+                "type": "list",
+                "name": "split",
+                "message": "Select how comics is split into volumes: ",
+                "choices": [
+                    "By amount of pages",
+                    "By size in megabytes",
+                    "By folders",
+                    "Return to comics menu"
+                ]
+            },
+            {
+                "type": "input",
+                "name": "limit",
+                "message":
+                    'Input "x" to close this menu\n'
+                    "Input maximum for one volume:",
+                "validate": IntValidator,
+                "when": lambda answers: answers["split"] in (
+                    "By amount of pages", "By size in megabytes"
+                )
+            }
+        ]
+        answer: dict = prompt(split_prompt)
+        if (
+            answer["split"] == "Return to comics menu"
+            or answer.get("limit") == "x"
+        ):
+            self.comics_loaded_menu()
+            return
+
+        max_volume_pages: Optional[int] = None
+        max_volume_size: Optional[int] = None
+        if answer["split"] == "By amount of pages":
+            max_volume_pages = max(int(answer["limit"]), 1)
+
+        elif answer["split"] == "By size in megabytes":
+            max_volume_size = max(int(answer["limit"]), 1) * 1024 ** 2
+
+        try:
+            report = self.comics.render(
+                self.quality, self.resolution, page_cache=self.page_cache,
+                on_event=ProgressBar(), max_volume_pages=max_volume_pages,
+                max_volume_size=max_volume_size,
+                split_by_folder=answer["split"] == "By folders",
+                volume_workers=cpu_count() or 1
+            )
+            print(f"Rendered {len(report.volumes)} volumes")
+
+        except KeyboardInterrupt:
+            print("Rendering cancelled")
+
+        self.comics_loaded_menu()
+
+    def append_new_pages(self):
+        try:
+            report = self.comics.render(
+                self.quality, self.resolution, page_cache=self.page_cache,
+                on_event=ProgressBar(), append_to_existing=True
+            )
+            print(f"Appended {len(report)} pages")
+
+        except ValueError as error:
+            print(error)
+
+        except KeyboardInterrupt:
+            print("Rendering cancelled")
+
+        self.comics_loaded_menu()
+
+    def compact_pdf(self):
+        try:
+            saved_size: int = self.comics.compact_output_file()
+            print(f"PDF file compacted, saved: {saved_size / 2 ** 20:.1f} MB")
+
+        except FileNotFoundError:
+            print("PDF file wasn't rendered yet")
+
+        except PdfFormatError as error:
+            print(f"PDF file can't be compacted: {error}")
+
         self.comics_loaded_menu()
 
     def close_loaded_comics(self):
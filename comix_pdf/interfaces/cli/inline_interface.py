@@ -1,10 +1,19 @@
 import argparse
 from pathlib import Path
+from typing import Optional
 
 from PIL import UnidentifiedImageError
 
-from comix_pdf import __version__
-from comix_pdf.types import Comics, ComicsImage
+from comix_pdf import __version__, exceptions
+from comix_pdf.batch import BatchSummary, render_library
+from comix_pdf.cache import PageCache, ProbeCache
+from comix_pdf.cbz import ComicInfo
+from comix_pdf.pdf import COMPRESSIONS
+from comix_pdf.types import (
+    Comics, ComicsImage, RenderReport, RenderSettings
+)
+from comix_pdf.utils import archive_scanning, profiling
+from .progress_bar import ProgressBar
 
 parser = argparse.ArgumentParser(
     description=f"ComixPDF (pip release version {__version__})."
@@ -24,17 +33,33 @@ parser.add_argument(
     nargs="*",
     action="store",
     dest="parts_paths",
-    help="Pass here directories or some images paths you would like insert"
-    "in that exact order"
+    help="Pass here directories, archives or some images paths you would "
+    "like insert in that exact order"
+)
+parser.add_argument(
+    "--natural-order",
+    action="store_true",
+    dest="natural_order",
+    help="Sorts images inside of archives by names with numbers compared "
+    "by value instead of keeping order of archive"
 )
 parser.add_argument(
     "--output-dir",
     "-od", type=str,
-    default="./",
+    default=None,
     action="store",
     dest="output_dir",
     help="which directory should be used for output"
 )
+parser.add_argument(
+    "--batch",
+    type=str,
+    default=None,
+    action="store",
+    dest="batch",
+    help="Renders every folder with images inside of passed library folder "
+    "into separate pdf"
+)
 parser.add_argument(
     "--quality",
     "-q", type=int,
@@ -51,6 +76,193 @@ parser.add_argument(
     dest="resolution",
     help="Sets printing quality (defaults to 300dpi)"
 )
+parser.add_argument(
+    "--max-dpi",
+    type=int,
+    default=None,
+    action="store",
+    dest="max_dpi",
+    help="Downscales pages that have higher DPI at printing resolution"
+)
+parser.add_argument(
+    "--jobs",
+    "-j", type=int,
+    default=1,
+    action="store",
+    dest="jobs",
+    help="How many processes are used to encode pages"
+)
+parser.add_argument(
+    "--scan-threads",
+    type=int,
+    default=1,
+    action="store",
+    dest="scan_threads",
+    help="How many threads are used to read images headers in directories"
+)
+parser.add_argument(
+    "--probe-cache",
+    type=str,
+    default=None,
+    action="store",
+    dest="probe_cache",
+    help="Path to SQLite file that caches images headers between runs"
+)
+parser.add_argument(
+    "--page-cache",
+    type=str,
+    default=None,
+    action="store",
+    dest="page_cache",
+    help="Directory where encoded pages are cached for faster re-renders"
+)
+parser.add_argument(
+    "--page-cache-size",
+    type=int,
+    default=1024,
+    action="store",
+    dest="page_cache_size",
+    help="Maximum size of pages cache in megabytes (defaults to 1024)"
+)
+parser.add_argument(
+    "--no-page-cache",
+    action="store_true",
+    dest="no_page_cache",
+    help="Disables pages cache that CLI mode keeps in user cache directory"
+)
+parser.add_argument(
+    "--profile",
+    type=str,
+    default=None,
+    action="store",
+    dest="profile",
+    help="Saves time and amount of data spent on every stage of rendering "
+    "into JSON file"
+)
+parser.add_argument(
+    "--format",
+    type=str,
+    default="pdf",
+    choices=("pdf", "cbz"),
+    action="store",
+    dest="output_format",
+    help="Output format. CBZ archive stores source files of images as is, "
+    "without re-encoding them (defaults to pdf)"
+)
+parser.add_argument(
+    "--comic-info",
+    action="store_true",
+    dest="comic_info",
+    help="Adds ComicInfo.xml with title and pages information into CBZ"
+)
+parser.add_argument(
+    "--detect-grayscale",
+    action="store_true",
+    dest="detect_grayscale",
+    help="Encodes color pages that have no visible color as grayscale"
+)
+parser.add_argument(
+    "--grayscale-tolerance",
+    type=int,
+    default=8,
+    action="store",
+    dest="grayscale_tolerance",
+    help="Largest difference between color channels of pixel that is "
+    "still considered gray (defaults to 8)"
+)
+parser.add_argument(
+    "--compression",
+    type=str,
+    default="jpeg",
+    choices=COMPRESSIONS,
+    action="store",
+    dest="compression",
+    help="How pages are compressed: jpeg, flate (lossless), auto (flate for "
+    "PNG and other lossless sources) or smallest (defaults to jpeg)"
+)
+parser.add_argument(
+    "--memory-limit",
+    type=int,
+    default=None,
+    action="store",
+    dest="memory_limit",
+    help="Memory budget in megabytes for pages that are encoded at once by "
+    "jobs, pages bigger than budget are encoded one at a time"
+)
+parser.add_argument(
+    "--deduplicate",
+    action="store_true",
+    dest="deduplicate",
+    help="Embeds pages with same source data only once"
+)
+parser.add_argument(
+    "--volume-pages",
+    type=int,
+    default=None,
+    action="store",
+    dest="volume_pages",
+    help="Splits output into volumes with at most that many pages"
+)
+parser.add_argument(
+    "--volume-size",
+    type=int,
+    default=None,
+    action="store",
+    dest="volume_size",
+    help="Splits output into volumes which images take at most that many "
+    "megabytes"
+)
+parser.add_argument(
+    "--split-by-folder",
+    action="store_true",
+    dest="split_by_folder",
+    help="Splits output into volumes where folder or archive of images "
+    "changes"
+)
+parser.add_argument(
+    "--volume-jobs",
+    type=int,
+    default=1,
+    action="store",
+    dest="volume_jobs",
+    help="How many volumes are rendered at once in separate processes"
+)
+parser.add_argument(
+    "--watch",
+    action="store_true",
+    dest="watch",
+    help="Keeps watching passed folder and appends pages of new images to "
+    "pdf until interrupted"
+)
+parser.add_argument(
+    "--settle-time",
+    type=float,
+    default=2.0,
+    action="store",
+    dest="settle_time",
+    help="How many seconds new file must stay unchanged before it is added "
+    "in watch mode (defaults to 2)"
+)
+parser.add_argument(
+    "--append",
+    action="store_true",
+    dest="append",
+    help="Appends only pages that existing pdf doesn't have yet to its end "
+    "by incremental update"
+)
+parser.add_argument(
+    "--compact",
+    action="store_true",
+    dest="compact",
+    help="Rewrites pdf into single section after rendering, dropping data "
+    "left by incremental updates"
+)
+parser.add_argument(
+    "--jpeg-passthrough",
+    action="store_true",
+    dest="jpeg_passthrough",
+    help="Embeds RGB and grayscale JPEG images without re-encoding them"
+)
 
 
 def inline_render(
@@ -58,14 +270,55 @@ def inline_render(
     paths: list[str],
     output_directory: Path,
     quality: int,
-    resolution: int
+    resolution: int,
+    jobs: int = 1,
+    jpeg_passthrough: bool = False,
+    scan_threads: int = 1,
+    probe_cache_path: Optional[Path] = None,
+    page_cache: Optional[PageCache] = None,
+    max_dpi: Optional[int] = None,
+    profile_path: Optional[Path] = None,
+    natural_order: bool = False,
+    output_format: str = "pdf",
+    with_comic_info: bool = False,
+    detect_grayscale: bool = False,
+    grayscale_tolerance: int = 8,
+    deduplicate: bool = False,
+    compression: str = "jpeg",
+    memory_limit: Optional[int] = None,
+    volume_pages: Optional[int] = None,
+    volume_size: Optional[int] = None,
+    split_by_folder: bool = False,
+    volume_jobs: int = 1,
+    watch: bool = False,
+    settle_time: float = 2.0,
+    append: bool = False,
+    compact: bool = False
 ):
+    profiler: Optional[profiling.Profiler] = None
+    if profile_path is not None:
+        profiler = profiling.enable()
+
     comics = Comics(output_folder=output_directory, output_file_name=title)
+    probe_cache: Optional[ProbeCache] = None
+    if probe_cache_path is not None:
+        probe_cache = ProbeCache(probe_cache_path)
 
     for path in paths:
         path: Path = Path(path)
         if path.is_dir():
-            comics.append_from_folder(path)
+            try:
+                comics.append_from_folder(
+                    path, workers=scan_threads, probe_cache=probe_cache
+                )
+
+            except exceptions.DirectoryHasNoImages:
+                # Watched folder is usually empty until first pages arrive
+                if not watch:
+                    raise
+
+        elif archive_scanning.is_archive(path):
+            comics.append_from_archive(path, natural_order)
 
         elif path.is_file():
             try:
@@ -76,6 +329,192 @@ def inline_render(
                 # We delete object if file isn't image
                 continue
 
-    comics.render(quality, resolution)
-    print(f"PDF file in: {comics.output_file_path}")
+    if probe_cache is not None:
+        print(
+            f"Probe cache hits: {probe_cache.hits}, "
+            f"misses: {probe_cache.misses}"
+        )
+        probe_cache.close()
+
+    try:
+        if watch:
+            watch_render(
+                comics, Path(paths[0]),
+                RenderSettings(
+                    quality, resolution, None, jpeg_passthrough, max_dpi,
+                    detect_grayscale, grayscale_tolerance, compression
+                ),
+                jobs, page_cache, memory_limit, settle_time, compact
+            )
+            return
+
+        if output_format == "cbz":
+            comic_info: Optional[ComicInfo] = None
+            if with_comic_info:
+                comic_info = ComicInfo(title=comics.output_file_path.stem)
+
+            report: RenderReport = comics.render_cbz(
+                comic_info, on_event=ProgressBar()
+            )
+            print(f"CBZ file in: {comics.output_cbz_file_path}")
+
+        else:
+            report = comics.render(
+                quality, resolution, streaming=True, workers=jobs,
+                jpeg_passthrough=jpeg_passthrough, page_cache=page_cache,
+                max_dpi=max_dpi, on_event=ProgressBar(),
+                detect_grayscale=detect_grayscale,
+                grayscale_tolerance=grayscale_tolerance,
+                deduplicate=deduplicate,
+                compression=compression,
+                memory_limit=memory_limit,
+                max_volume_pages=volume_pages,
+                max_volume_size=volume_size,
+                split_by_folder=split_by_folder,
+                volume_workers=volume_jobs,
+                append_to_existing=append
+            )
+            if report.volumes is None:
+                if append:
+                    print(f"Appended pages: {len(report)}")
+
+                print(f"PDF file in: {comics.output_file_path}")
+                if compact:
+                    print_compaction(comics)
+
+            else:
+                print(f"PDF files of {len(report.volumes)} volumes:")
+                for volume_file in report.volumes:
+                    print(volume_file)
+
+            if report.peak_rss is not None:
+                workers_memory: str = ""
+                if report.workers_peak_rss is not None:
+                    workers_memory = (
+                        ", largest job: "
+                        f"{report.workers_peak_rss / 2 ** 20:.1f} MB"
+                    )
+
+                print(
+                    f"Peak memory: {report.peak_rss / 2 ** 20:.1f} MB"
+                    f"{workers_memory}"
+                )
+
+            if deduplicate:
+                print(f"Duplicated pages: {len(report.duplicates)}")
+                for page in report.duplicates:
+                    print(
+                        f"Page {page.page_index + 1} ({page.name}) repeats "
+                        f"page {page.duplicate_of + 1}"
+                    )
+
+            if detect_grayscale:
+                print(
+                    "Pages converted to grayscale: "
+                    f"{len(report.converted_to_grayscale)}, "
+                    "estimated saved size: "
+                    f"{report.saved_size / 2 ** 20:.1f} MB"
+                )
+
+        if jpeg_passthrough:
+            print(
+                f"Pages passed through: {len(report.passed_through)}, "
+                f"re-encoded: {len(report.re_encoded)}"
+            )
+            for page in report.re_encoded:
+                print(
+                    f"Re-encoded page {page.page_index + 1}: {page.name}"
+                )
+
+    finally:
+        if page_cache is not None:
+            print(
+                f"Page cache hits: {page_cache.hits}, "
+                f"misses: {page_cache.misses}"
+            )
+
+        if profiler is not None:
+            profiling.disable()
+            profiler.save(profile_path)
+            print(f"Profile in: {profile_path}")
+
+            for page, wall_time in profiler.slowest_pages():
+                print(f"Slow page {page}: {wall_time:.3f}s")
+
+
+def watch_render(
+    comics: Comics,
+    folder: Path,
+    settings: RenderSettings,
+    jobs: int = 1,
+    page_cache: Optional[PageCache] = None,
+    memory_limit: Optional[int] = None,
+    settle_time: float = 2.0,
+    compact: bool = False
+):
+    def on_update(report: RenderReport) -> None:
+        print(
+            f"Appended pages: {len(report)}, "
+            f"pages in PDF: {len(comics)}"
+        )
+
+    def on_error(error: Exception) -> None:
+        print(
+            "Update failed, new files are skipped until they change: "
+            f"{error}"
+        )
+
+    print(f"Watching {folder}, PDF file in: {comics.output_file_path}")
+    try:
+        comics.watch_folder(
+            folder, settings, jobs, page_cache, memory_limit,
+            on_update=on_update, settle_time=settle_time,
+            on_error=on_error
+        )
+
+    except KeyboardInterrupt:
+        print("Watching stopped")
+
+    if compact and comics.output_file_path.is_file():
+        print_compaction(comics)
+
+
+def print_compaction(comics: Comics):
+    saved_size: int = comics.compact_output_file()
+    print(f"PDF file compacted, saved: {saved_size / 2 ** 20:.1f} MB")
+
+
+def batch_render(
+    root: Path,
+    output_directory: Optional[Path],
+    quality: int,
+    resolution: int,
+    jobs: int = 1,
+    jpeg_passthrough: bool = False,
+    page_cache: Optional[PageCache] = None,
+    max_dpi: Optional[int] = None,
+    detect_grayscale: bool = False,
+    grayscale_tolerance: int = 8,
+    deduplicate: bool = False,
+    compression: str = "jpeg",
+    memory_limit: Optional[int] = None
+):
+    summary: BatchSummary = render_library(
+        root, output_directory, quality, resolution,
+        workers=jobs, jpeg_passthrough=jpeg_passthrough,
+        page_cache=page_cache, max_dpi=max_dpi,
+        detect_grayscale=detect_grayscale,
+        grayscale_tolerance=grayscale_tolerance,
+        deduplicate=deduplicate, compression=compression,
+        memory_limit=memory_limit
+    )
+
+    for result in summary:
+        message = f" ({result.message})" if result.message else ""
+        print(f"[{result.status}] {result.folder}{message}")
 
+    print(
+        f"Rendered: {len(summary.rendered)}, "
+        f"skipped: {len(summary.skipped)}, "
+        f"failed: {len(summary.failed)}"
+    )
@@ -0,0 +1,62 @@
+import sys
+import time
+from typing import Optional, TextIO
+
+from comix_pdf.types import Event
+from comix_pdf.types import events
+
+# How many characters bar itself takes
+BAR_WIDTH = 30
+
+
+class ProgressBar:
+    """
+    Event callback that draws rendering progress in one terminal line.
+    """
+
+    def __init__(self, output: TextIO = sys.stdout):
+        self.output = output
+        self.started_at: Optional[float] = None
+        # Pages that were already in the file before this run, like in
+        # append mode. They aren't counted in progress and speed
+        self.existing_pages: Optional[int] = None
+        self.written_pages: int = 0
+
+    def __call__(self, event: Event) -> None:
+        if self.started_at is None:
+            self.started_at = time.perf_counter()
+
+        if event.kind == events.BYTES_WRITTEN:
+            if self.existing_pages is None:
+                self.existing_pages = event.index
+
+            self.written_pages += 1
+            self.draw(event.total - self.existing_pages, event.bytes_written)
+
+        elif event.kind in (events.FINISHED, events.ERROR):
+            self.output.write("\n")
+            self.output.flush()
+
+    def draw(self, total_pages: int, bytes_written: int) -> None:
+        """
+        Redraws progress bar line.
+
+        :param total_pages: how many pages are rendered in this run.
+        :param bytes_written: size of output file so far.
+        :return: nothing.
+        """
+        elapsed: float = max(time.perf_counter() - self.started_at, 1e-6)
+        pages_per_second: float = self.written_pages / elapsed
+        remaining: float = (
+            (total_pages - self.written_pages) / pages_per_second
+        )
+
+        filled: int = BAR_WIDTH * self.written_pages // total_pages
+        bar: str = "#" * filled + "-" * (BAR_WIDTH - filled)
+        self.output.write(
+            f"\r[{bar}] {self.written_pages}/{total_pages} pages "
+            f"{pages_per_second:.1f} pages/s "
+            f"{bytes_written / 2 ** 20:.1f} MB "
+            f"ETA {remaining:.0f}s "
+        )
+        self.output.flush()
@@ -0,0 +1,11 @@
+"""
+Low level tools for writing comics pages into pdf files.
+Pages are encoded one by one and written straight into output file, so
+only currently processed page is kept in memory.
+"""
+
+from .compaction import compact_pdf
+from .encoding import (
+    COMPRESSIONS, EncodedPage, encode_image, encode_images
+)
+from .writer import PdfAppender, PdfWriter
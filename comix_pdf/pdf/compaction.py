@@ -0,0 +1,143 @@
+"""
+Contains function that rewrites pdf with incremental updates into one
+section, so objects replaced by updates don't take space anymore.
+"""
+
+import os
+from collections import deque
+from pathlib import Path
+from typing import Any, BinaryIO, Deque, Dict, List
+
+from PIL import PdfParser
+
+# Attributes that pages inherit from nodes of pages tree
+INHERITED_PAGE_KEYS = (b"Resources", b"MediaBox", b"CropBox", b"Rotate")
+
+
+def compact_pdf(path: Path) -> int:
+    """
+    Rewrites pdf keeping only objects that are reachable from its catalog
+    and info, with one cross-reference section and flat pages tree.
+    Data of streams is copied as is, without decoding it. File is replaced
+    only after compacted copy is fully written and only if copy is smaller.
+
+    :param path: path to pdf file.
+    :return: how many bytes were saved, 0 if file was left as is.
+    :raises PIL.PdfParser.PdfFormatError: if file isn't valid pdf.
+    """
+    size_before: int = path.stat().st_size
+    compacted_path: Path = path.with_name(f"{path.name}.compacting")
+
+    source = PdfParser.PdfParser(str(path))
+    try:
+        with open(compacted_path, "w+b") as compacted_file:
+            _copy_objects(source, compacted_file)
+
+    except BaseException:
+        if compacted_path.exists():
+            compacted_path.unlink()
+
+        raise
+
+    finally:
+        source.close()
+
+    saved_size: int = size_before - compacted_path.stat().st_size
+    if saved_size <= 0:
+        compacted_path.unlink()
+        return 0
+
+    os.replace(compacted_path, path)
+    return saved_size
+
+
+def _copy_objects(source: PdfParser.PdfParser, output_file: BinaryIO) -> None:
+    target = PdfParser.PdfParser(f=output_file, mode="w+b")
+    target.start_writing()
+    target.write_header()
+    target.write_comment("compacted by ComixPDF")
+
+    # Old references and references of their copies
+    new_refs: Dict[
+        PdfParser.IndirectReference, PdfParser.IndirectReference
+    ] = {}
+    pending: Deque[PdfParser.IndirectReference] = deque()
+
+    def translate(value: Any) -> Any:
+        if isinstance(value, PdfParser.IndirectReference):
+            if value not in new_refs:
+                new_refs[value] = target.next_object_id(0)
+                pending.append(value)
+
+            return new_refs[value]
+
+        if isinstance(value, PdfParser.PdfDict):
+            return PdfParser.PdfDict(
+                (key, translate(item)) for key, item in value.items()
+            )
+
+        if isinstance(value, list):
+            return [translate(item) for item in value]
+
+        return value
+
+    # Pages and pages tree are written separately, so nodes of previous
+    # tree aren't copied even if pages are referenced from elsewhere
+    pages_ref: PdfParser.IndirectReference = target.next_object_id(0)
+    new_refs[source.pages_ref] = pages_ref
+    for page_ref in source.pages:
+        new_refs[page_ref] = target.next_object_id(0)
+
+    page_refs: List[PdfParser.IndirectReference] = []
+    for page_ref in source.pages:
+        page = translate(_page_with_inherited_keys(source, page_ref))
+        page.Parent = pages_ref
+        page_refs.append(target.write_obj(new_refs[page_ref], page))
+
+    target.write_obj(
+        pages_ref,
+        Type=PdfParser.PdfName("Pages"),
+        Count=len(page_refs),
+        Kids=page_refs,
+    )
+    root_ref = target.write_obj(None, translate(source.root))
+    target.info = translate(source.info)
+
+    while pending:
+        old_ref: PdfParser.IndirectReference = pending.popleft()
+        value = source.read_indirect(old_ref)
+        if isinstance(value, PdfParser.PdfStream):
+            # Length is set again and might be stored as separate object
+            dictionary: Dict[str, Any] = {
+                PdfParser.PdfName(key).name_as_str(): translate(item)
+                for key, item in value.dictionary.items()
+                if key != b"Length"
+            }
+            target.write_obj(
+                new_refs[old_ref], stream=bytes(value.buf), **dictionary
+            )
+
+        else:
+            target.write_obj(new_refs[old_ref], translate(value))
+
+    target.write_xref_and_trailer(root_ref)
+    target.close()
+
+
+def _page_with_inherited_keys(
+    source: PdfParser.PdfParser, page_ref: PdfParser.IndirectReference
+) -> PdfParser.PdfDict:
+    # Page is moved under new root, so attributes it inherited from its
+    # previous ancestors are copied into page itself
+    page = PdfParser.PdfDict(source.read_indirect(page_ref))
+    parent_ref = page.get(b"Parent")
+    while parent_ref is not None:
+        parent = source.read_indirect(parent_ref)
+        for key in INHERITED_PAGE_KEYS:
+            if key not in page and key in parent:
+                page[key] = parent[key]
+
+        parent_ref = parent.get(b"Parent")
+
+    del page[b"Parent"]
+    return page
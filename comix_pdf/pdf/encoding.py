@@ -0,0 +1,448 @@
+"""
+Contains functions that turn ComicsImage into compressed image stream that
+can be embedded into pdf.
+"""
+
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from io import BytesIO
+from typing import (
+    Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple,
+    TYPE_CHECKING
+)
+
+from PIL import Image
+
+from comix_pdf.utils import profiling
+from . import grayscale, png
+
+if TYPE_CHECKING:
+    # Types package depends on this module when rendering
+    from comix_pdf.cache.page_cache import PageCache
+    from comix_pdf.types.image import ComicsImage
+    from comix_pdf.types.render_settings import RenderSettings
+
+
+class EncodedPage(NamedTuple):
+    """
+    Compressed image data of one page with information needed to embed it.
+    """
+
+    data: bytes
+    size: Tuple[int, int]
+    color_space: str = "DeviceRGB"
+    filter: str = "DCTDecode"
+    passed_through: bool = False
+    # Size of source image in pixels that defines size of pdf page,
+    # if image was downscaled
+    source_size: Optional[Tuple[int, int]] = None
+    converted_to_grayscale: bool = False
+    # Estimated size that grayscale encoding saved
+    saved_size: int = 0
+    # Parameters of filter, like PNG predictors of Flate compressed pages
+    decode_parms: Optional[Dict[str, int]] = None
+    bits_per_component: int = 8
+
+    @property
+    def page_size(self) -> Tuple[int, int]:
+        """
+        Size in pixels that is used to calculate size of pdf page.
+
+        :return: width and height.
+        """
+        return self.source_size or self.size
+
+
+# Ways of compressing pages
+JPEG = "jpeg"
+FLATE = "flate"
+# Flate for lossless source formats, JPEG for rest of them
+AUTO = "auto"
+# Whichever of JPEG and Flate is smaller for every page
+SMALLEST = "smallest"
+COMPRESSIONS = (JPEG, FLATE, AUTO, SMALLEST)
+# Source formats that don't lose quality when saved
+LOSSLESS_FORMATS = {"PNG", "GIF", "BMP", "TIFF", "PPM"}
+
+# Modes of JPEG files that pdf readers can display without any conversion
+PASSTHROUGH_JPEG_COLOR_SPACES = {
+    "RGB": "DeviceRGB",
+    "L": "DeviceGray",
+}
+
+
+def target_size(
+    image: "ComicsImage", settings: "RenderSettings"
+) -> Optional[Tuple[int, int]]:
+    """
+    Calculates size to which image must be downscaled to not exceed
+    maximum DPI on printed page.
+
+    :param image: image that is checked.
+    :param settings: settings of rendering.
+    :return: new size or None if image must not be resized.
+    """
+    if settings.max_dpi is None or settings.max_dpi >= settings.resolution:
+        return None
+
+    scale: float = settings.max_dpi / settings.resolution
+    width, height = image.size
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def can_pass_through(
+    image: "ComicsImage", settings: "RenderSettings"
+) -> bool:
+    """
+    Checks if image can be embedded into pdf as is.
+
+    :param image: image that is checked.
+    :param settings: settings of rendering.
+    :return: True if source file can be used as page stream.
+    """
+    return (
+        settings.jpeg_passthrough
+        and image.format == "JPEG"
+        and image.mode in PASSTHROUGH_JPEG_COLOR_SPACES
+        and target_size(image, settings) is None
+    )
+
+
+def choose_compression(
+    image: "ComicsImage", settings: "RenderSettings"
+) -> str:
+    """
+    Resolves automatic compression for image by its source format.
+
+    :param image: image that is encoded.
+    :param settings: settings of rendering.
+    :return: one of JPEG, FLATE and SMALLEST.
+    """
+    if settings.compression != AUTO:
+        return settings.compression
+
+    if image.format in LOSSLESS_FORMATS:
+        return FLATE
+
+    return JPEG
+
+
+def reuse_png_stream(
+    image: "ComicsImage", settings: "RenderSettings"
+) -> Optional[EncodedPage]:
+    """
+    Embeds compressed samples of PNG file as is, without inflating and
+    deflating them again.
+
+    :param image: image that is encoded.
+    :param settings: settings of rendering.
+    :return: encoded page or None if PNG must be decoded.
+    """
+    if image.format != "PNG" or target_size(image, settings) is not None:
+        return None
+
+    stream: Optional[png.PngStream] = png.read_png_stream(image.read_bytes())
+    if stream is None or stream.size != image.size:
+        return None
+
+    return EncodedPage(
+        stream.data, stream.size,
+        color_space=stream.color_space,
+        filter="FlateDecode",
+        passed_through=True,
+        decode_parms=stream.decode_parms,
+        bits_per_component=stream.bits_per_component
+    )
+
+
+def encode_image(
+    image: "ComicsImage", settings: "RenderSettings"
+) -> EncodedPage:
+    """
+    Decodes image, converts it to RGB and compresses it as JPEG or
+    losslessly with Flate, depending on compression in settings.
+    JPEG images that need no conversion are embedded byte for byte if
+    passthrough is enabled in settings, compressed samples of PNG images
+    are embedded as is if Flate is chosen. Images that exceed maximum DPI
+    are downscaled, JPEG images are decoded at reduced scale right away.
+    If grayscale detection is enabled, pages without visible color are
+    encoded with one channel. Passed through pages aren't analyzed.
+
+    :param image: image that must be encoded.
+    :param settings: settings of rendering.
+    :return: encoded page.
+    """
+    if can_pass_through(image, settings):
+        return EncodedPage(
+            image.read_bytes(), image.size,
+            color_space=PASSTHROUGH_JPEG_COLOR_SPACES[image.mode],
+            passed_through=True
+        )
+
+    compression: str = choose_compression(image, settings)
+    reused_page: Optional[EncodedPage] = None
+    if compression in (FLATE, SMALLEST):
+        reused_page = reuse_png_stream(image, settings)
+        if reused_page is not None and compression == FLATE:
+            return reused_page
+
+    size: Optional[Tuple[int, int]] = target_size(image, settings)
+    if settings.fill_color is None:
+        converted_image: Image.Image = image.convert_to_rgb(size)
+
+    else:
+        converted_image = image.convert_to_rgb_with_fill_color(
+            settings.fill_color, size
+        )
+
+    view: Optional[Image.Image] = None
+    if settings.detect_grayscale:
+        with profiling.stage("analyze", str(image.path)):
+            view = grayscale.analysis_view(converted_image)
+            if grayscale.is_near_grayscale(
+                view, settings.grayscale_tolerance
+            ):
+                converted_image = converted_image.convert("L")
+
+            else:
+                view = None
+
+    candidates: List[EncodedPage] = []
+    if reused_page is not None:
+        candidates.append(reused_page)
+
+    if compression in (JPEG, SMALLEST):
+        candidates.append(_encode_converted(
+            image, converted_image, settings, size, view
+        ))
+
+    if compression == FLATE or (
+        compression == SMALLEST and reused_page is None
+    ):
+        candidates.append(_encode_converted(
+            image, converted_image, settings, size, view, lossless=True
+        ))
+
+    return min(candidates, key=lambda page: len(page.data))
+
+
+def _encode_converted(
+    image: "ComicsImage", converted_image: Image.Image,
+    settings: "RenderSettings", size: Optional[Tuple[int, int]],
+    view: Optional[Image.Image], lossless: bool = False
+) -> EncodedPage:
+    """
+    Compresses converted image of page.
+
+    :param image: source image of page.
+    :param converted_image: RGB or grayscale image.
+    :param settings: settings of rendering.
+    :param size: size to which image was downscaled.
+    :param view: view of color image that was converted to grayscale.
+    :param lossless: if set, image is compressed with Flate and PNG
+        predictors instead of JPEG.
+    :return: encoded page.
+    """
+    decode_parms: Optional[Dict[str, int]] = None
+    with profiling.stage("encode", str(image.path)) as stage:
+        buffer = BytesIO()
+        if lossless:
+            # PNG encoder already picks best row filter for every row,
+            # its compressed samples are stream of FlateDecode filter
+            converted_image.save(buffer, "PNG", transparency=None)
+            stream: png.PngStream = png.read_png_stream(buffer.getvalue())
+            data: bytes = stream.data
+            decode_parms = stream.decode_parms
+
+        else:
+            converted_image.save(buffer, "JPEG", quality=settings.quality)
+            data = buffer.getvalue()
+
+        stage.add_written(len(data))
+
+    saved_size: int = 0
+    if view is not None:
+        with profiling.stage("analyze", str(image.path)):
+            saved_size = grayscale.estimate_saved_size(
+                view, settings.quality, converted_image.size, lossless
+            )
+
+    return EncodedPage(
+        data, converted_image.size,
+        color_space=(
+            "DeviceGray" if converted_image.mode == "L" else "DeviceRGB"
+        ),
+        filter="FlateDecode" if lossless else "DCTDecode",
+        source_size=image.size if size is not None else None,
+        converted_to_grayscale=view is not None,
+        saved_size=saved_size,
+        decode_parms=decode_parms
+    )
+
+
+def page_footprint(image: "ComicsImage", settings: "RenderSettings") -> int:
+    """
+    Estimates how much memory encoding of page needs, using only header
+    of image: decoded source image and its converted RGB copy.
+
+    :param image: image that is encoded.
+    :param settings: settings of rendering.
+    :return: amount of bytes.
+    """
+    if can_pass_through(image, settings):
+        return image.stored_size
+
+    width, height = image.size
+    converted_width, converted_height = (
+        target_size(image, settings) or image.size
+    )
+
+    return (
+        width * height * Image.getmodebands(image.mode)
+        + converted_width * converted_height * 3
+    )
+
+
+def encode_images(
+    images: Iterable["ComicsImage"], settings: "RenderSettings",
+    workers: int = 1, page_cache: Optional["PageCache"] = None,
+    memory_limit: Optional[int] = None
+) -> Iterator[EncodedPage]:
+    """
+    Encodes images keeping their order. If more than one worker requested,
+    images are encoded in pool of processes with only limited amount of
+    pages waiting to be written at once.
+
+    :param images: images that must be encoded.
+    :param settings: settings of rendering.
+    :param workers: how many processes are used for encoding.
+    :param page_cache: if set, pages which source files and settings didn't
+        change are taken from cache instead of being encoded.
+    :param memory_limit: if set, pages are given to workers only while
+        estimated memory of pages that are being encoded fits into limit.
+        Pages that don't fit into limit alone are encoded one at a time.
+    :return: iterator over encoded pages in same order as images.
+    """
+    if workers <= 1:
+        for image in images:
+            key: Optional[str] = _cache_key(image, settings, page_cache)
+            cached_page: Optional[EncodedPage] = None
+            if key is not None:
+                cached_page = page_cache.get(key)
+
+            if cached_page is not None:
+                yield cached_page
+
+            else:
+                yield _store_in_cache(
+                    encode_image(image, settings), key, page_cache
+                )
+
+        return
+
+    profiler: Optional[profiling.Profiler] = profiling.active_profiler()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: Deque[Tuple[Optional[str], Future, int]] = deque()
+        # Estimated memory of pages that are given to workers
+        admitted_size: int = 0
+
+        for image in images:
+            key = _cache_key(image, settings, page_cache)
+            cached_page = None
+            if key is not None:
+                cached_page = page_cache.get(key)
+
+            if cached_page is not None:
+                future: Future = Future()
+                future.set_result(cached_page)
+                pending.append((None, future, 0))
+
+            else:
+                footprint: int = 0
+                if memory_limit is not None:
+                    footprint = page_footprint(image, settings)
+
+                    # Waiting for previous pages until new one fits into
+                    # limit, page bigger than limit waits for all of them
+                    while pending and admitted_size + footprint > memory_limit:
+                        key_of_done, future, size = pending.popleft()
+                        admitted_size -= size
+                        yield _store_in_cache(
+                            _take_result(future, profiler), key_of_done,
+                            page_cache
+                        )
+
+                if profiler is None:
+                    future = executor.submit(encode_image, image, settings)
+
+                else:
+                    future = executor.submit(
+                        _encode_image_profiled, image, settings
+                    )
+
+                pending.append((key, future, footprint))
+                admitted_size += footprint
+
+            # Keeping bounded window of pages, so memory stays flat
+            if len(pending) >= workers * 2:
+                key, future, size = pending.popleft()
+                admitted_size -= size
+                yield _store_in_cache(
+                    _take_result(future, profiler), key, page_cache
+                )
+
+        while pending:
+            key, future, _ = pending.popleft()
+            yield _store_in_cache(
+                _take_result(future, profiler), key, page_cache
+            )
+
+
+class _ProfiledPage(NamedTuple):
+    page: EncodedPage
+    records: List[profiling.StageRecord]
+
+
+def _encode_image_profiled(
+    image: "ComicsImage", settings: "RenderSettings"
+) -> _ProfiledPage:
+    # Measurements of worker process are passed back to main process
+    profiler: profiling.Profiler = profiling.enable()
+    try:
+        page: EncodedPage = encode_image(image, settings)
+
+    finally:
+        profiling.disable()
+
+    return _ProfiledPage(page, profiler.records)
+
+
+def _take_result(
+    future: Future, profiler: Optional[profiling.Profiler]
+) -> EncodedPage:
+    result = future.result()
+    if isinstance(result, _ProfiledPage):
+        profiler.merge(result.records)
+        return result.page
+
+    return result
+
+
+def _cache_key(
+    image: "ComicsImage", settings: "RenderSettings",
+    page_cache: Optional["PageCache"]
+) -> Optional[str]:
+    # Passed through pages are cheaper to read from source than from cache
+    if page_cache is None or can_pass_through(image, settings):
+        return None
+
+    return page_cache.key_for(image, settings)
+
+
+def _store_in_cache(
+    page: EncodedPage, key: Optional[str], page_cache: Optional["PageCache"]
+) -> EncodedPage:
+    if key is not None:
+        page_cache.put(key, page)
+
+    return page
@@ -0,0 +1,104 @@
+"""
+Contains functions for finding pages that are stored as color images,
+but have no visible color, so they can be encoded with one channel.
+"""
+
+from functools import lru_cache
+from io import BytesIO
+from typing import Tuple
+
+from PIL import Image, ImageChops
+
+# Longest side of downsampled view that is analyzed
+ANALYSIS_SIZE = 256
+
+
+def analysis_view(img: Image.Image) -> Image.Image:
+    """
+    Makes small copy of image for analysis. Pixels are averaged,
+    so compression noise doesn't look like color.
+
+    :param img: RGB image.
+    :return: downsampled image.
+    """
+    factor: int = max(img.size) // ANALYSIS_SIZE
+    if factor <= 1:
+        return img
+
+    return img.reduce(factor)
+
+
+def is_near_grayscale(view: Image.Image, tolerance: int) -> bool:
+    """
+    Checks if channels of every pixel differ at most by tolerance.
+    Differences are computed for whole image at once.
+
+    :param view: RGB image.
+    :param tolerance: largest allowed difference between channels.
+    :return: True if image can be stored as grayscale.
+    """
+    red, green, blue = view.split()
+    difference: Image.Image = ImageChops.lighter(
+        ImageChops.difference(red, green), ImageChops.difference(green, blue)
+    )
+    difference = ImageChops.lighter(
+        difference, ImageChops.difference(red, blue)
+    )
+
+    return difference.getextrema()[1] <= tolerance
+
+
+def estimate_saved_size(
+    view: Image.Image, quality: int, size: Tuple[int, int],
+    lossless: bool = False
+) -> int:
+    """
+    Estimates how many bytes grayscale encoding saves compared to RGB
+    encoding, by compressing small view in both ways. Size of color data
+    grows with amount of pixels, while JPEG color tables are stored
+    only once.
+
+    :param view: downsampled RGB image.
+    :param quality: quality of JPEG compression.
+    :param size: size of encoded page.
+    :param lossless: if set, page is compressed with Flate instead of JPEG.
+    :return: estimated amount of saved bytes.
+    """
+    if lossless:
+        tables_size: int = 0
+        color_data_size: int = (
+            _png_size(view) - _png_size(view.convert("L"))
+        )
+
+    else:
+        tables_size = _color_tables_size(quality)
+        color_data_size = (
+            _jpeg_size(view, quality) - _jpeg_size(view.convert("L"), quality)
+            - tables_size
+        )
+
+    scale: float = (size[0] * size[1]) / (view.size[0] * view.size[1])
+
+    return max(0, round(tables_size + color_data_size * scale))
+
+
+@lru_cache(maxsize=None)
+def _color_tables_size(quality: int) -> int:
+    # Smallest RGB image has same data as grayscale one, so difference
+    # is size of color quantization and huffman tables
+    blank: Image.Image = Image.new("RGB", (8, 8), (128, 128, 128))
+    return (
+        _jpeg_size(blank, quality) - _jpeg_size(blank.convert("L"), quality)
+    )
+
+
+def _jpeg_size(img: Image.Image, quality: int) -> int:
+    buffer = BytesIO()
+    img.save(buffer, "JPEG", quality=quality)
+    return buffer.tell()
+
+
+def _png_size(img: Image.Image) -> int:
+    buffer = BytesIO()
+    img.save(buffer, "PNG")
+    return buffer.tell()
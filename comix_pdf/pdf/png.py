@@ -0,0 +1,95 @@
+"""
+Contains functions for taking compressed image data out of PNG files,
+so it can be embedded into pdf with FlateDecode filter without
+decompressing it.
+"""
+
+import struct
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# PNG color types that pdf can display with same layout of samples
+GRAY_COLOR_TYPE = 0
+RGB_COLOR_TYPE = 2
+# Tells pdf reader that every row starts with PNG filter type
+PNG_PREDICTOR = 15
+
+
+class PngStream(NamedTuple):
+    """
+    Compressed samples of PNG image and information about their layout.
+    """
+
+    data: bytes
+    size: Tuple[int, int]
+    color_space: str
+    bits_per_component: int
+
+    @property
+    def decode_parms(self) -> Dict[str, int]:
+        """
+        Parameters of FlateDecode filter that undo PNG row filters.
+
+        :return: dictionary for DecodeParms entry of image.
+        """
+        return {
+            "Predictor": PNG_PREDICTOR,
+            "Colors": 1 if self.color_space == "DeviceGray" else 3,
+            "BitsPerComponent": self.bits_per_component,
+            "Columns": self.size[0],
+        }
+
+
+def read_png_stream(data: bytes) -> Optional[PngStream]:
+    """
+    Joins IDAT chunks of PNG file into one zlib stream.
+    Only images which samples pdf understands as is are supported:
+    non-interlaced grayscale up to 8 bits and 8 bit RGB without
+    transparency.
+
+    :param data: content of PNG file.
+    :return: compressed samples or None if PNG can't be embedded as is.
+    """
+    if not data.startswith(PNG_SIGNATURE):
+        return None
+
+    header: Optional[Tuple[int, ...]] = None
+    chunks: List[bytes] = []
+    position: int = len(PNG_SIGNATURE)
+    while position + 8 <= len(data):
+        length, chunk_type = struct.unpack(
+            ">I4s", data[position:position + 8]
+        )
+        chunk_data: bytes = data[position + 8:position + 8 + length]
+        position += 12 + length
+
+        if chunk_type == b"IHDR":
+            header = struct.unpack(">IIBBBBB", chunk_data)
+
+        elif chunk_type == b"IDAT":
+            chunks.append(chunk_data)
+
+        elif chunk_type == b"tRNS":
+            # Transparent color must be flattened
+            return None
+
+        elif chunk_type == b"IEND":
+            break
+
+    if header is None or not chunks:
+        return None
+
+    width, height, bit_depth, color_type, _, _, interlace = header
+    if interlace != 0:
+        return None
+
+    if color_type == GRAY_COLOR_TYPE and bit_depth in (1, 2, 4, 8):
+        color_space = "DeviceGray"
+
+    elif color_type == RGB_COLOR_TYPE and bit_depth == 8:
+        color_space = "DeviceRGB"
+
+    else:
+        return None
+
+    return PngStream(b"".join(chunks), (width, height), color_space, bit_depth)
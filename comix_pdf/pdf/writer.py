@@ -0,0 +1,217 @@
+"""
+Contains PdfWriter class that writes pages into pdf file as soon as they
+are encoded instead of collecting all of them in memory first, and
+PdfAppender class that adds pages to existing pdf file.
+"""
+
+import time
+from typing import BinaryIO, Optional
+
+from PIL import PdfParser
+
+from .encoding import EncodedPage
+
+
+class PdfWriter:
+    """
+    Writes encoded pages into pdf one by one.
+    Layout of pages matches one that Pillow pdf plugin produces.
+    """
+
+    def __init__(
+        self, output_file: BinaryIO, resolution: int = 300,
+        title: Optional[str] = None
+    ):
+        """
+        Starts new pdf document.
+
+        :param output_file: file opened in "w+b" mode.
+        :param resolution: DPI resolution that will be used when printing.
+        :param title: title of document.
+        """
+        self.resolution: int = resolution
+        self._pdf = PdfParser.PdfParser(f=output_file, mode="w+b")
+
+        if title:
+            self._pdf.info.Title = title
+
+        self._pdf.info.CreationDate = time.gmtime()
+        self._pdf.info.ModDate = time.gmtime()
+
+        self._pdf.start_writing()
+        self._pdf.write_header()
+        self._pdf.write_comment("created by ComixPDF")
+
+        # Pages tree is written last, when all pages are known
+        self._pdf.pages_ref = self._pdf.next_object_id(0)
+
+    def add_page(
+        self, page: EncodedPage,
+        image_ref: Optional[PdfParser.IndirectReference] = None
+    ) -> PdfParser.IndirectReference:
+        """
+        Writes image of page and page itself into pdf.
+
+        :param page: encoded image of page.
+        :param image_ref: if set, page shows already written image and
+            data of page isn't written again.
+        :return: reference to page object.
+        """
+        if image_ref is None:
+            image_ref = self.add_image(page)
+
+        width: float = page.page_size[0] * 72.0 / self.resolution
+        height: float = page.page_size[1] * 72.0 / self.resolution
+
+        if page.color_space == "DeviceGray":
+            procset = "ImageB"
+
+        else:
+            procset = "ImageC"
+
+        contents_ref = self._pdf.write_obj(
+            None, stream=b"q %f 0 0 %f 0 0 cm /image Do Q\n" % (width, height)
+        )
+        page_ref = self._pdf.write_page(
+            None,
+            Resources=PdfParser.PdfDict(
+                ProcSet=[
+                    PdfParser.PdfName("PDF"), PdfParser.PdfName(procset)
+                ],
+                XObject=PdfParser.PdfDict(image=image_ref),
+            ),
+            MediaBox=[0, 0, width, height],
+            Contents=contents_ref,
+        )
+        self._pdf.pages.append(page_ref)
+
+        return page_ref
+
+    def add_image(self, page: EncodedPage) -> PdfParser.IndirectReference:
+        """
+        Writes image of page into pdf, so it can be shown on many pages.
+
+        :param page: encoded image of page.
+        :return: reference to image object.
+        """
+        parameters = {}
+        if page.decode_parms is not None:
+            parameters["DecodeParms"] = PdfParser.PdfDict(page.decode_parms)
+
+        return self._pdf.write_obj(
+            None,
+            stream=page.data,
+            Type=PdfParser.PdfName("XObject"),
+            Subtype=PdfParser.PdfName("Image"),
+            Width=page.size[0],
+            Height=page.size[1],
+            Filter=PdfParser.PdfName(page.filter),
+            BitsPerComponent=page.bits_per_component,
+            ColorSpace=PdfParser.PdfName(page.color_space),
+            **parameters
+        )
+
+    def close(self) -> None:
+        """
+        Writes pages tree, catalog and trailer of pdf.
+
+        :return: nothing.
+        :raises ValueError: if no pages were added.
+        """
+        if len(self._pdf.pages) == 0:
+            raise ValueError("No images to render as PDF")
+
+        self._pdf.write_obj(
+            self._pdf.pages_ref,
+            Type=PdfParser.PdfName("Pages"),
+            Count=len(self._pdf.pages),
+            Kids=self._pdf.pages,
+        )
+        root_ref = self._pdf.write_obj(
+            None,
+            Type=PdfParser.PdfName("Catalog"),
+            Pages=self._pdf.pages_ref,
+        )
+        self._pdf.write_xref_and_trailer(root_ref)
+        self._pdf.close()
+
+
+class PdfAppender(PdfWriter):
+    """
+    Adds pages to the end of existing pdf by writing incremental update
+    after its last byte. Objects of existing pages aren't written again,
+    only root of pages tree and catalog are replaced.
+    """
+
+    def __init__(self, output_file: BinaryIO, resolution: int = 300):
+        """
+        Reads trailer, cross-reference table and pages tree of pdf.
+
+        :param output_file: file opened in "r+b" mode.
+        :param resolution: DPI resolution that will be used when printing.
+        :raises PIL.PdfParser.PdfFormatError: if file isn't valid pdf.
+        """
+        self.resolution: int = resolution
+        self._pdf = PdfParser.PdfParser(f=output_file, mode="r+b")
+
+        self.existing_pages: int = len(self._pdf.pages)
+        self._previous_pages_ref = self._pdf.pages_ref
+        self._previous_pages_tree = self._pdf.page_tree_root
+        self._pdf.info.ModDate = time.gmtime()
+
+        self._pdf.start_writing()
+
+        # New root of pages tree has previous root as its first kid,
+        # so previous pages keep their objects
+        self._pdf.pages_ref = self._pdf.next_object_id(0)
+        self._pdf.pages = []
+        self._started: bool = False
+
+    def add_image(self, page: EncodedPage) -> PdfParser.IndirectReference:
+        self._start_update()
+        return super().add_image(page)
+
+    def add_page(
+        self, page: EncodedPage,
+        image_ref: Optional[PdfParser.IndirectReference] = None
+    ) -> PdfParser.IndirectReference:
+        self._start_update()
+        return super().add_page(page, image_ref)
+
+    def _start_update(self) -> None:
+        if self._started:
+            return
+
+        # Last line of pdf might not end with new line
+        self._pdf.f.write(b"\n")
+        self._pdf.write_comment("updated by ComixPDF")
+        self._started = True
+
+    def close(self) -> None:
+        """
+        Writes new pages tree, catalog and cross-reference section that
+        points to previous one. If no pages were added, file isn't changed.
+
+        :return: nothing.
+        """
+        if len(self._pdf.pages) == 0:
+            self._pdf.close()
+            return
+
+        previous_pages_tree = PdfParser.PdfDict(self._previous_pages_tree)
+        previous_pages_tree.Parent = self._pdf.pages_ref
+        self._pdf.write_obj(self._previous_pages_ref, previous_pages_tree)
+
+        self._pdf.write_obj(
+            self._pdf.pages_ref,
+            Type=PdfParser.PdfName("Pages"),
+            Count=self.existing_pages + len(self._pdf.pages),
+            Kids=[self._previous_pages_ref, *self._pdf.pages],
+        )
+
+        catalog = PdfParser.PdfDict(self._pdf.root)
+        catalog.Pages = self._pdf.pages_ref
+        self._pdf.write_obj(self._pdf.root_ref, catalog)
+
+        self._pdf.write_xref_and_trailer()
+        self._pdf.close()
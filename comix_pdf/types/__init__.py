@@ -3,7 +3,15 @@ Types for manipulating content of outputted pdf file and collected images.
 All work related to rendering images to pdf and needed for that types are here.
 """
 
+from .archive_image import ArchiveImage, ArchiveMember
 from .comics import Comics
+from .events import CancellationToken, Event, EventCallback
 from .excluded_images import ExcludedImages, ExcludedImage
 from .fill_color import FillColor
-from .image import ComicsImage
+from .image import ComicsImage, ImageHeader
+from .page_operations import (
+    ExcludePages, InsertPages, MovePages, PageOperation, RestorePages
+)
+from .render_report import PageReport, RenderReport
+from .render_settings import RenderSettings
+from .sort_keys import SortKeys
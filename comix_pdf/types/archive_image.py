@@ -0,0 +1,261 @@
+"""
+Contains ArchiveImage class that reads images stored inside of ZIP and TAR
+archives (including CBZ and CBT comics) without extracting them to disk.
+"""
+import os
+import tarfile
+import zipfile
+from collections import OrderedDict
+from contextlib import contextmanager
+from io import BytesIO
+from pathlib import Path, PurePosixPath
+from threading import Lock
+from typing import (
+    ContextManager, Dict, IO, Iterator, NamedTuple, Optional, Tuple
+)
+
+from PIL import Image
+
+from comix_pdf.utils import profiling
+from .image import ComicsImage, ImageHeader, read_capture_timestamp
+from .sort_keys import SortKeys, natural_sort_key
+
+# How many zip archives every process keeps opened
+MAX_OPENED_ZIP_ARCHIVES = 8
+
+# Zip archives opened by process, keyed by path, size and modification time
+# of archive, so central directory of archive isn't read for every member
+_opened_zip_archives: Dict[Tuple[str, int, int], zipfile.ZipFile] = (
+    OrderedDict()
+)
+# Process that opened archives, child processes share offsets of files
+# with parent, so they open archives again
+_opened_zip_archives_pid: int = os.getpid()
+_opened_zip_archives_lock = Lock()
+
+
+class ArchiveMember(NamedTuple):
+    """
+    Information about file inside of archive that is needed to read it
+    without scanning whole archive again.
+    """
+
+    name: str
+    # Uncompressed size of member
+    size: int
+    modification_timestamp: float
+    # Offset of member data inside of tar stream, None for zip members
+    offset: Optional[int] = None
+
+
+@contextmanager
+def open_member(
+    archive_path: Path, member: ArchiveMember,
+    spool_path: Optional[Path] = None
+) -> Iterator[IO[bytes]]:
+    """
+    Opens stream of archive member. Zip members are decompressed while
+    being read from archive that stays opened, members of plain tar archives
+    are read directly from their offset.
+
+    :param archive_path: where archive is stored on disk.
+    :param member: member of archive.
+    :param spool_path: decompressed copy of compressed tar archive. Members
+        of compressed tar are read from start of archive every time
+        without it.
+    :return: context manager with readable stream.
+    """
+    if member.offset is None:
+        with open_zip_archive(archive_path).open(member.name) as stream:
+            yield stream
+
+        return
+
+    with tarfile.open(spool_path or archive_path) as archive:
+        with archive.extractfile(tar_info_for(member)) as stream:
+            yield stream
+
+
+def open_zip_archive(archive_path: Path) -> zipfile.ZipFile:
+    """
+    Opens zip archive or takes one that this process already opened.
+    Members of returned archive can be read from many threads at once.
+    Archive must not be closed by caller.
+
+    :param archive_path: where archive is stored on disk.
+    :return: opened zip archive.
+    """
+    global _opened_zip_archives_pid
+
+    stat: os.stat_result = os.stat(archive_path)
+    key: Tuple[str, int, int] = (
+        os.path.abspath(archive_path), stat.st_size, stat.st_mtime_ns
+    )
+    with _opened_zip_archives_lock:
+        if _opened_zip_archives_pid != os.getpid():
+            _opened_zip_archives.clear()
+            _opened_zip_archives_pid = os.getpid()
+
+        archive: Optional[zipfile.ZipFile] = _opened_zip_archives.get(key)
+        if archive is not None:
+            _opened_zip_archives.move_to_end(key)
+            return archive
+
+        archive = zipfile.ZipFile(archive_path)
+        _opened_zip_archives[key] = archive
+        while len(_opened_zip_archives) > MAX_OPENED_ZIP_ARCHIVES:
+            # File is closed after members that are being read are closed
+            _, oldest_archive = _opened_zip_archives.popitem(last=False)
+            oldest_archive.close()
+
+        return archive
+
+
+def tar_info_for(member: ArchiveMember) -> tarfile.TarInfo:
+    """
+    Makes information about tar member that lets reading it without
+    searching for member in archive.
+
+    :param member: member of tar archive.
+    :return: TarInfo instance with offset and size of member.
+    """
+    info = tarfile.TarInfo(member.name)
+    info.offset_data = member.offset
+    info.size = member.size
+    return info
+
+
+class ArchiveImage(ComicsImage):
+    """
+    Image stored inside of archive. Member is read only when its pixels or
+    data are needed, nothing is extracted to disk.
+    """
+
+    # Member is read into memory by open before it is decoded
+    reads_source_on_decode: bool = False
+
+    def __init__(
+        self, archive_path: Path, member: ArchiveMember,
+        header: Optional[ImageHeader] = None,
+        spool_path: Optional[Path] = None
+    ):
+        """
+        Initializes image of archive member reading only header of image.
+
+        :param archive_path: where archive is stored on disk.
+        :param member: member of archive with image.
+        :param header: already known header of image. If set, member isn't
+            read at all.
+        :param spool_path: decompressed copy of compressed tar archive that
+            member is read from.
+        :raises PIL.UnidentifiedImageError: member is not an image.
+        """
+        self.archive_path: Path = archive_path
+        self.member: ArchiveMember = member
+        self.spool_path: Optional[Path] = spool_path
+        # Path of member as if archive was a folder, file itself doesn't
+        # exist and is only used for names and labels
+        path: Path = archive_path.joinpath(*PurePosixPath(member.name).parts)
+
+        if header is None:
+            with open_member(archive_path, member, spool_path) as stream:
+                header = self.probe_stream_header(stream, str(path))
+
+        super().__init__(path, header)
+
+    @staticmethod
+    def probe_stream_header(stream: IO[bytes], label: str) -> ImageHeader:
+        """
+        Reads format, size and mode of image from stream.
+
+        :param stream: readable and seekable stream with image.
+        :param label: name of image used by profiling.
+        :return: header of image.
+        :raises PIL.UnidentifiedImageError: stream has no image.
+        """
+        with profiling.stage("probe", label):
+            with Image.open(stream) as img:
+                return ImageHeader(
+                    img.format, img.size, img.mode,
+                    read_capture_timestamp(img)
+                )
+
+    def _make_sort_keys(
+        self, stat: Optional[os.stat_result] = None
+    ) -> SortKeys:
+        # Keys are made from member information read while listing archive
+        return SortKeys(
+            natural_sort_key(self.path.name),
+            self.member.modification_timestamp, self.member.size,
+            self.header.capture_timestamp,
+            int(self.member.modification_timestamp * 10 ** 9)
+        )
+
+    def refresh_sort_keys(self) -> bool:
+        """
+        Members of archive are listed once when archive is loaded, so their
+        keys never change.
+
+        :return: always False.
+        """
+        return False
+
+    def open(self) -> Image.Image:
+        """
+        Reads archive member and opens image from it.
+        Returned image must be closed by caller.
+
+        :return: lazily loaded Image instance.
+        """
+        return Image.open(BytesIO(self.read_bytes()))
+
+    def open_source(self) -> ContextManager[IO[bytes]]:
+        """
+        Opens stream of archive member for reading.
+
+        :return: context manager with readable stream.
+        """
+        return open_member(self.archive_path, self.member, self.spool_path)
+
+    def read_bytes(self) -> bytes:
+        """
+        Reads uncompressed data of archive member.
+
+        :return: content of image file.
+        """
+        with profiling.stage("read", str(self.path)) as stage:
+            with open_member(
+                self.archive_path, self.member, self.spool_path
+            ) as stream:
+                data: bytes = stream.read()
+
+            stage.add_read(len(data))
+
+        return data
+
+    @property
+    def stored_size(self) -> int:
+        return self.member.size
+
+    @property
+    def source_identity(self) -> Tuple[str, int, int]:
+        """
+        Identifies current content of member without reading it.
+
+        :return: absolute path of member inside archive, its size and
+            modification time of archive in nanoseconds.
+        """
+        stat = self.archive_path.stat()
+        return (
+            f"{os.path.abspath(self.archive_path)}!{self.member.name}",
+            self.member.size, stat.st_mtime_ns
+        )
+
+    @property
+    def modification_timestamp(self) -> float:
+        """
+        When image was modified before being archived.
+
+        :return: modification time of member in unix time format.
+        """
+        return self.member.modification_timestamp
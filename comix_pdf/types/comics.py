@@ -4,17 +4,53 @@ needs to be rendered and contains methods for manipulating where and how images
 are placed in files pages.
 """
 
+import asyncio
+import multiprocessing
+import os
 import textwrap
+from concurrent.futures import (
+    Executor, Future, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+)
 from copy import copy
+from functools import partial
 from pathlib import Path
-from typing import List, Optional
-from PIL import Image, UnidentifiedImageError
+from typing import (
+    Any, AsyncIterator, BinaryIO, Callable, Dict, Generator, Iterable,
+    Iterator, List, Optional, Set, Tuple, TYPE_CHECKING
+)
+from PIL import Image, PdfParser
 
 from pathvalidate import sanitize_filename
 from comix_pdf import exceptions
+from comix_pdf.cbz import CbzWriter, ComicInfo
+from comix_pdf.pdf import (
+    COMPRESSIONS, EncodedPage, PdfAppender, PdfWriter, compact_pdf,
+    encode_images
+)
+from comix_pdf.utils import (
+    archive_scanning, duplicates, folder_scanning, folder_watching,
+    images_sorting, memory, profiling, volumes
+)
+from . import events
+from .archive_image import ArchiveImage
+from .events import CancellationToken, Event, EventCallback
 from .excluded_images import ExcludedImage, ExcludedImages
 from .image import ComicsImage
 from .fill_color import FillColor
+from .page_operations import (
+    ExcludePages, InsertPages, MovePages, PageOperation, RestorePages
+)
+from .render_report import PageReport, RenderReport
+from .render_settings import RenderSettings
+
+if TYPE_CHECKING:
+    from comix_pdf.cache import PageCache, ProbeCache
+
+# How often rendering of volumes in other processes checks for cancellation
+CANCELLATION_POLL_INTERVAL = 0.1
+# Longest name of output file without extension, so whole name fits into
+# 255 bytes limit of most file systems
+MAX_FILE_STEM_LENGTH = 251
 
 
 class Comics(list, List[ComicsImage]):
@@ -34,6 +70,10 @@ class Comics(list, List[ComicsImage]):
 
         self.output_file_name = output_file_name
         self.excluded_images = ExcludedImages()
+        # Positions of pages by their IDs, rebuilt when it gets outdated.
+        # Always replaced instead of being changed, because copies of comics
+        # share it
+        self._page_positions: Dict[int, int] = {}
         super().__init__(*args, **kwargs)
 
     def move_image(self, from_index: int, to_index: int) -> None:
@@ -65,9 +105,13 @@ class Comics(list, List[ComicsImage]):
         if image_index not in range(0, len(self)):
             raise IndexError("Image for exclusion is out of reach")
 
+        image: ComicsImage = self.pop(image_index)
+        next_page_id: Optional[int] = None
+        if image_index < len(self):
+            next_page_id = self[image_index].page_id
+
         excluded_image: ExcludedImage = ExcludedImage(
-            self.pop(image_index),
-            image_index
+            image, image_index, next_page_id
         )
         self.excluded_images.append(excluded_image)
         return len(self.excluded_images) - 1
@@ -82,7 +126,8 @@ class Comics(list, List[ComicsImage]):
         :param excluded_image_index: index of excluded image inside
             excluded_images parameter.
         :param restore_to_index: where to put restored image. By default
-        restores image to previous index (shifts images after its index by +1).
+        restores image before page that followed it when it was excluded
+        (shifts images after its index by +1).
         :return: nothing.
         :raises IndexError: if supplied image index inside of excluded images
             is out of range.
@@ -92,14 +137,215 @@ class Comics(list, List[ComicsImage]):
                 "Image for restoration is out of reach in excluded images list"
             )
 
+        if restore_to_index is None:
+            restore_to_index = self._restore_position(
+                self.excluded_images[excluded_image_index],
+                self._index_page_positions(),
+                self._index_excluded_images()
+            )
+
         excluded_image: ExcludedImage = self.excluded_images.pop(
             excluded_image_index
         )
-        if restore_to_index is None:
-            restore_to_index = excluded_image.previous_position_index
-
         self.insert(restore_to_index, excluded_image.image)
 
+    def apply_operations(self, operations: Iterable[PageOperation]) -> None:
+        """
+        Moves, excludes, restores and inserts many pages in one pass over
+        comics. Indices of pages in all operations refer to order of pages
+        before batch, so operations don't shift each other. If any
+        operation is invalid, nothing is changed.
+
+        :param operations: MovePages, ExcludePages, RestorePages and
+            InsertPages operations. Pages that are put before same page
+            keep order of operations.
+        :return: nothing.
+        :raises IndexError: if index of page or excluded image is out of
+            range.
+        :raises ValueError: if same page or excluded image is used by
+            several operations.
+        :raises TypeError: if operation is unknown.
+        """
+        total: int = len(self)
+        # Images that are put before page at index, last list is for
+        # images put at the end
+        placed_before: List[List[ComicsImage]] = [
+            [] for _ in range(total + 1)
+        ]
+        # Indices of pages taken from their places, True if page is excluded
+        taken: Dict[int, bool] = {}
+        restored: Set[int] = set()
+        page_positions: Dict[int, int] = self._index_page_positions()
+        excluded_by_id: Dict[int, ExcludedImage] = (
+            self._index_excluded_images()
+        )
+
+        def check_position(index: int) -> None:
+            if index not in range(0, total + 1):
+                raise IndexError(f"Position {index} is out of reach")
+
+        def take(index: int, excluded: bool) -> ComicsImage:
+            if index not in range(0, total):
+                raise IndexError(f"Image {index} is out of reach")
+
+            if index in taken:
+                raise ValueError(
+                    f"Image {index} is used by several operations"
+                )
+
+            taken[index] = excluded
+            return self[index]
+
+        for operation in operations:
+            if isinstance(operation, MovePages):
+                check_position(operation.to_index)
+                placed_before[operation.to_index].extend(
+                    take(index, False) for index in operation.indices
+                )
+
+            elif isinstance(operation, ExcludePages):
+                for index in operation.indices:
+                    take(index, True)
+
+            elif isinstance(operation, RestorePages):
+                for excluded_index in operation.excluded_indices:
+                    if excluded_index not in range(
+                        0, len(self.excluded_images)
+                    ):
+                        raise IndexError(
+                            f"Excluded image {excluded_index} is out of reach"
+                        )
+
+                    if excluded_index in restored:
+                        raise ValueError(
+                            f"Excluded image {excluded_index} is used by "
+                            "several operations"
+                        )
+
+                    restored.add(excluded_index)
+                    excluded_image: ExcludedImage = self.excluded_images[
+                        excluded_index
+                    ]
+                    to_index: Optional[int] = operation.to_index
+                    if to_index is None:
+                        to_index = self._restore_position(
+                            excluded_image, page_positions, excluded_by_id
+                        )
+
+                    check_position(to_index)
+                    placed_before[to_index].append(excluded_image.image)
+
+            elif isinstance(operation, InsertPages):
+                to_index = operation.to_index
+                if to_index is None:
+                    to_index = total
+
+                check_position(to_index)
+                placed_before[to_index].extend(operation.images)
+
+            else:
+                raise TypeError(f"Unknown page operation: {operation!r}")
+
+        pages: List[ComicsImage] = []
+        # Excluded pages with positions they would have in new order
+        excluded_pages: List[Tuple[ComicsImage, int]] = []
+        for index, images in enumerate(placed_before):
+            pages.extend(images)
+            if index == total:
+                break
+
+            if index not in taken:
+                pages.append(self[index])
+
+            elif taken[index]:
+                excluded_pages.append((self[index], len(pages)))
+
+        excluded_images: List[ExcludedImage] = [
+            excluded_image
+            for index, excluded_image in enumerate(self.excluded_images)
+            if index not in restored
+        ]
+        for image, position in excluded_pages:
+            next_page_id: Optional[int] = None
+            if position < len(pages):
+                next_page_id = pages[position].page_id
+
+            excluded_images.append(
+                ExcludedImage(image, position, next_page_id)
+            )
+
+        self[:] = pages
+        self.excluded_images[:] = excluded_images
+        self._index_page_positions()
+
+    def page_index(self, page_id: int) -> int:
+        """
+        Finds current index of page by its ID. Positions of pages are
+        indexed, so lookup is done without searching, index is rebuilt
+        only after pages were rearranged.
+
+        :param page_id: ComicsImage.page_id of page.
+        :return: index of page inside of comics.
+        :raises KeyError: if page isn't in comics.
+        """
+        index: Optional[int] = self._page_positions.get(page_id)
+        if (
+            index is None or index >= len(self)
+            or self[index].page_id != page_id
+        ):
+            index = self._index_page_positions()[page_id]
+
+        return index
+
+    def page(self, page_id: int) -> ComicsImage:
+        """
+        Finds page by its ID.
+
+        :param page_id: ComicsImage.page_id of page.
+        :return: image of page.
+        :raises KeyError: if page isn't in comics.
+        """
+        return self[self.page_index(page_id)]
+
+    def _index_page_positions(self) -> Dict[int, int]:
+        self._page_positions = {
+            image.page_id: index for index, image in enumerate(self)
+        }
+        return self._page_positions
+
+    def _index_excluded_images(self) -> Dict[int, ExcludedImage]:
+        return {
+            excluded_image.image.page_id: excluded_image
+            for excluded_image in self.excluded_images
+        }
+
+    def _restore_position(
+        self, excluded_image: ExcludedImage, page_positions: Dict[int, int],
+        excluded_by_id: Dict[int, ExcludedImage]
+    ) -> int:
+        # Image goes before page that followed it. If that page was excluded
+        # too, page that followed excluded one is used and so on
+        next_page_id: Optional[int] = excluded_image.next_page_id
+        visited: Set[int] = set()
+        while next_page_id is not None and next_page_id not in visited:
+            if next_page_id in page_positions:
+                return page_positions[next_page_id]
+
+            visited.add(next_page_id)
+            following: Optional[ExcludedImage] = excluded_by_id.get(
+                next_page_id
+            )
+            if following is None:
+                break
+
+            next_page_id = following.next_page_id
+
+        if next_page_id is None:
+            return len(self)
+
+        # Page that followed image was removed from comics by other means
+        return min(excluded_image.previous_position_index, len(self))
+
     def insert_image(
         self, image: ComicsImage, to_index: Optional[int] = None
     ) -> None:
@@ -116,10 +362,54 @@ class Comics(list, List[ComicsImage]):
 
         self.insert(to_index, image)
 
+    def sort_images(self, order: str = "name", reverse: bool = False) -> None:
+        """
+        Sorts images by keys that were read while images were loaded,
+        so files aren't accessed while sorting.
+
+        :param order: one of images_sorting.SORTING_ORDERS: "name",
+            "natural_name", "modification_timestamp", "size" or
+            "capture_timestamp".
+        :param reverse: if set, sorts in descending order.
+        :return: nothing.
+        :raises ValueError: if order is unknown.
+        """
+        if order not in images_sorting.SORTING_ORDERS:
+            raise ValueError(f"Unknown sorting order: {order}")
+
+        self.sort(key=images_sorting.SORTING_ORDERS[order], reverse=reverse)
+
+    def refresh_sort_keys(self) -> int:
+        """
+        Checks if files of images were changed and updates sort keys only
+        of changed ones.
+
+        :return: how many images were changed.
+        :raises OSError: if file of image was removed.
+        :raises PIL.UnidentifiedImageError: if file is no longer an image.
+        """
+        return sum(image.refresh_sort_keys() for image in self)
+
     def render(
         self, quality: int = 90, resolution: int = 300,
-        fill_color: Optional[FillColor] = None
-    ) -> None:
+        fill_color: Optional[FillColor] = None,
+        streaming: bool = False, workers: int = 1,
+        jpeg_passthrough: bool = False,
+        page_cache: Optional['PageCache'] = None,
+        max_dpi: Optional[int] = None,
+        on_event: Optional[EventCallback] = None,
+        cancellation_token: Optional[CancellationToken] = None,
+        detect_grayscale: bool = False,
+        grayscale_tolerance: int = 8,
+        deduplicate: bool = False,
+        compression: str = "jpeg",
+        memory_limit: Optional[int] = None,
+        max_volume_pages: Optional[int] = None,
+        max_volume_size: Optional[int] = None,
+        split_by_folder: bool = False,
+        volume_workers: int = 1,
+        append_to_existing: bool = False
+    ) -> RenderReport:
         """
         Renders the comics into PDF file.
 
@@ -128,8 +418,109 @@ class Comics(list, List[ComicsImage]):
         :param fill_color: by default outputs images with transparent
         background. If it needs to be filled with color - set fill_color
         parameter.
-        :return: nothing.
+        :param streaming: if set, pages are encoded and written into file
+        one by one, so memory usage doesn't depend on amount of pages.
+        :param workers: how many processes are used to encode pages. Using
+        more than one worker always renders in streaming mode.
+        :param jpeg_passthrough: if set, RGB and grayscale JPEG images are
+        embedded into pdf as is, without decoding and compressing them again.
+        Always renders in streaming mode.
+        :param page_cache: if set, pages that didn't change since previous
+        render are taken from cache instead of being encoded again.
+        Always renders in streaming mode.
+        :param max_dpi: if set, pages that have higher DPI at printing
+        resolution are downscaled. JPEG images are decoded at reduced scale.
+        Always renders in streaming mode.
+        :param on_event: called when pages are started, encoded and written,
+        when rendering is finished or failed. Always renders in streaming mode.
+        :param cancellation_token: token that can stop rendering. Partially
+        written file is removed. Always renders in streaming mode.
+        :param detect_grayscale: if set, color pages which channels differ
+        at most by grayscale_tolerance on downsampled view are encoded as
+        grayscale. Passed through pages aren't analyzed.
+        Always renders in streaming mode.
+        :param grayscale_tolerance: largest difference between channels of
+        pixel that is still considered gray.
+        :param deduplicate: if set, source data of pages is hashed and pages
+        with same data are encoded once and share one image object in pdf.
+        Always renders in streaming mode.
+        :param compression: "jpeg" compresses all pages with JPEG at quality,
+        "flate" compresses them losslessly with PNG predictors, "auto" picks
+        Flate for lossless source formats like PNG and JPEG for rest of them,
+        "smallest" keeps whichever is smaller for every page. Compressed data
+        of PNG files is embedded as is when possible. Anything except "jpeg"
+        always renders in streaming mode.
+        :param memory_limit: if set, workers get only as many pages at once
+        as fit into that many bytes, by estimating decoded size of every page
+        from its header. Pages bigger than limit are encoded one at a time.
+        Always renders in streaming mode.
+        :param max_volume_pages: if set, comics is split into volumes with at
+        most that many pages, every volume is rendered into its own file
+        named like "Title - Vol 01.pdf". Always renders in streaming mode.
+        :param max_volume_size: if set, comics is split into volumes which
+        source files take at most that many bytes.
+        Always renders in streaming mode.
+        :param split_by_folder: if set, comics is split into volumes where
+        folder or archive of images changes. Always renders in streaming mode.
+        :param volume_workers: how many volumes are rendered at once in
+        separate processes. Pages of volume are encoded by process of that
+        volume, so workers and on_event only apply when volumes are rendered
+        one by one. Cancellation stops volumes that are being rendered too.
+        :param append_to_existing: if set and output file exists, only pages
+        after ones that file already has are encoded and appended to it by
+        incremental update, so bytes that were written before stay as is.
+        Can't be used with volumes. Always renders in streaming mode.
+        :return: report about how each page was encoded and peak memory
+        usage. Report of split comics has paths of volumes files, report of
+        appended comics has only appended pages.
+        :raises ValueError: if compression is unknown, volume limits
+        aren't positive, volumes are appended or existing file has more pages
+        than comics.
+        :raises OperationCancelled: if rendering was cancelled.
         """
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown compression: {compression}")
+
+        if (
+            max_volume_pages is not None or max_volume_size is not None
+            or split_by_folder
+        ):
+            if append_to_existing:
+                raise ValueError("Volumes can't be appended to existing files")
+
+            render_options: Dict[str, Any] = dict(
+                quality=quality, resolution=resolution, fill_color=fill_color,
+                streaming=True, workers=workers,
+                jpeg_passthrough=jpeg_passthrough, page_cache=page_cache,
+                max_dpi=max_dpi, detect_grayscale=detect_grayscale,
+                grayscale_tolerance=grayscale_tolerance,
+                deduplicate=deduplicate, compression=compression,
+                memory_limit=memory_limit
+            )
+            return self._render_volumes(
+                volumes.split_volumes(
+                    self, max_volume_pages, max_volume_size, split_by_folder
+                ),
+                render_options, volume_workers, on_event, cancellation_token
+            )
+
+        settings = RenderSettings(
+            quality, resolution, fill_color, jpeg_passthrough, max_dpi,
+            detect_grayscale, grayscale_tolerance, compression
+        )
+
+        # Only Pillow pdf plugin defaults can be rendered without streaming
+        if (
+            streaming or workers > 1 or page_cache is not None
+            or settings != RenderSettings(quality, resolution, fill_color)
+            or on_event is not None or cancellation_token is not None
+            or deduplicate or memory_limit is not None or append_to_existing
+        ):
+            return self._render_streaming(
+                settings, workers, page_cache, on_event, cancellation_token,
+                deduplicate, memory_limit, append_to_existing
+            )
+
         images_render_queue: Comics = copy(self)
         converted_images: List[Image.Image] = []
 
@@ -154,16 +545,713 @@ class Comics(list, List[ComicsImage]):
         )
 
         del converted_images
-        del images_render_queue
+
+        return RenderReport(
+            PageReport(page_index, image.name, False)
+            for page_index, image in enumerate(images_render_queue)
+        )
+
+    def _render_streaming(
+        self, settings: RenderSettings, workers: int = 1,
+        page_cache: Optional['PageCache'] = None,
+        on_event: Optional[EventCallback] = None,
+        cancellation_token: Optional[CancellationToken] = None,
+        deduplicate: bool = False,
+        memory_limit: Optional[int] = None,
+        append: bool = False
+    ) -> RenderReport:
+        """
+        Renders comics into PDF file keeping only few pages in memory.
+
+        :param settings: settings of rendering.
+        :param workers: how many processes are used to encode pages.
+        :param page_cache: cache of encoded pages.
+        :param on_event: callback for progress events.
+        :param cancellation_token: token that can stop rendering.
+        :param deduplicate: if set, pages with same source data share one
+        image object.
+        :param memory_limit: memory budget of pages given to workers.
+        :param append: if set and output file exists, only pages after ones
+        that file already has are written, by appending incremental update
+        to file. If rendering fails, file is truncated back.
+        :return: report about how each written page was encoded.
+        """
+        images_render_queue: Comics = copy(self)
+        total_pages: int = len(images_render_queue)
+
+        if total_pages == 0:
+            raise ValueError("No images to render as PDF")
+
+        def emit(event: Event) -> None:
+            if on_event is not None:
+                on_event(event)
+
+        # Filled in when pages that output file already has are known
+        first_indices: List[int] = []
+        unique_indices: List[int] = []
+        shared_indices: Set[int] = set()
+
+        def find_shared_images(first_page: int) -> None:
+            first_indices.extend(range(total_pages))
+            if deduplicate:
+                # Images of pages that are already in file can't be shared
+                first_indices[first_page:] = [
+                    first_page + first_index
+                    for first_index in duplicates.first_occurrences(
+                        images_render_queue[first_page:]
+                    )
+                ]
+
+            for index in range(first_page, total_pages):
+                if first_indices[index] == index:
+                    unique_indices.append(index)
+
+                else:
+                    shared_indices.add(first_indices[index])
+
+        def started_images() -> Iterator[ComicsImage]:
+            # Pages are started when they are taken for encoding, which
+            # happens ahead of writing when multiple workers are used
+            for index in unique_indices:
+                if cancellation_token is not None:
+                    cancellation_token.raise_if_cancelled()
+
+                started_image: ComicsImage = images_render_queue[index]
+                emit(Event(
+                    events.PAGE_STARTED, index, total_pages,
+                    started_image.name
+                ))
+                yield started_image
+
+        # Images shown on many pages are kept without their data
+        shared_images: Dict[
+            int, Tuple[PdfParser.IndirectReference, EncodedPage]
+        ] = {}
+        report = RenderReport()
+        # Size of file that incremental update is appended to
+        appended_to: Optional[int] = None
+        if append and not self.output_file_path.is_file():
+            append = False
+
+        # File isn't removed if it couldn't even be opened
+        output_file_opened: bool = False
+        try:
+            with open(
+                self.output_file_path, "r+b" if append else "w+b"
+            ) as output_file:
+                output_file_opened = True
+                first_page: int = 0
+                if append:
+                    appended_to = output_file.seek(0, os.SEEK_END)
+                    writer: PdfWriter = PdfAppender(
+                        output_file, settings.resolution
+                    )
+                    first_page = writer.existing_pages
+                    if first_page > total_pages:
+                        raise ValueError(
+                            "PDF file has more pages than comics"
+                        )
+
+                else:
+                    writer = PdfWriter(
+                        output_file, settings.resolution,
+                        title=self.output_file_path.stem
+                    )
+
+                find_shared_images(first_page)
+
+                encoded_pages: Generator[EncodedPage, None, None] = (
+                    encode_images(
+                        started_images(), settings, workers, page_cache,
+                        memory_limit
+                    )
+                )
+                for page_index in range(first_page, total_pages):
+                    image: ComicsImage = images_render_queue[page_index]
+                    first_index: int = first_indices[page_index]
+                    image_ref: Optional[PdfParser.IndirectReference] = None
+                    if first_index == page_index:
+                        page: EncodedPage = next(encoded_pages)
+
+                    else:
+                        if cancellation_token is not None:
+                            cancellation_token.raise_if_cancelled()
+
+                        emit(Event(
+                            events.PAGE_STARTED, page_index, total_pages,
+                            image.name
+                        ))
+                        image_ref, page = shared_images[first_index]
+
+                    emit(Event(
+                        events.PAGE_ENCODED, page_index, total_pages,
+                        image.name, output_file.tell()
+                    ))
+                    with profiling.stage("write", str(image.path)) as stage:
+                        written_before: int = output_file.tell()
+                        if image_ref is None:
+                            image_ref = writer.add_image(page)
+
+                        writer.add_page(page, image_ref)
+                        stage.add_written(output_file.tell() - written_before)
+
+                    if page_index in shared_indices:
+                        shared_images[page_index] = (
+                            image_ref, page._replace(data=b"")
+                        )
+
+                    report.append(
+                        PageReport(
+                            page_index, image.name,
+                            page.passed_through, len(page.data),
+                            page.converted_to_grayscale, page.saved_size,
+                            first_index if first_index != page_index else None
+                        )
+                    )
+                    emit(Event(
+                        events.BYTES_WRITTEN, page_index, total_pages,
+                        image.name, output_file.tell()
+                    ))
+
+                # Workers are stopped before their memory is measured
+                encoded_pages.close()
+
+                if cancellation_token is not None:
+                    cancellation_token.raise_if_cancelled()
+
+                with profiling.stage("write"):
+                    writer.close()
+
+                report.peak_rss = memory.peak_rss()
+                if workers > 1:
+                    report.workers_peak_rss = memory.peak_rss(children=True)
+
+                emit(Event(
+                    events.FINISHED, total=total_pages,
+                    bytes_written=output_file.tell()
+                ))
+
+        except BaseException as error:
+            if appended_to is not None:
+                # Incremental update is dropped and previous version of
+                # pdf is left as is
+                with open(self.output_file_path, "r+b") as output_file:
+                    output_file.truncate(appended_to)
+
+            elif output_file_opened:
+                # Partially written pdf can't be opened anyway
+                self.output_file_path.unlink()
+
+            emit(Event(events.ERROR, total=total_pages, error=error))
+            raise
+
+        return report
+
+    def _render_volumes(
+        self, volumes_images: List[List[ComicsImage]],
+        render_options: Dict[str, Any], volume_workers: int = 1,
+        on_event: Optional[EventCallback] = None,
+        cancellation_token: Optional[CancellationToken] = None
+    ) -> RenderReport:
+        """
+        Renders every volume into its own PDF file. If rendering fails or is
+        cancelled, all files of volumes are removed.
+
+        :param volumes_images: images of every volume.
+        :param render_options: arguments of render for every volume.
+        :param volume_workers: how many volumes are rendered at once.
+        :param on_event: callback for progress events of all pages.
+        :param cancellation_token: token that can stop rendering.
+        :return: report about pages of all volumes.
+        """
+        total_pages: int = sum(len(images) for images in volumes_images)
+        if total_pages == 0:
+            raise ValueError("No images to render as PDF")
+
+        volumes_comics: List[Comics] = [
+            Comics(
+                self.output_folder,
+                self.volume_file_name(number, len(volumes_images)),
+                images
+            )
+            for number, images in enumerate(volumes_images, start=1)
+        ]
+        volumes_files: Set[Path] = {
+            volume.output_file_path for volume in volumes_comics
+        }
+        if len(volumes_files) != len(volumes_comics):
+            raise ValueError("Volumes must have different file names")
+
+        def emit(event: Event) -> None:
+            if on_event is not None:
+                on_event(event)
+
+        report = RenderReport()
+        report.volumes = [volume.output_file_path for volume in volumes_comics]
+        bytes_written: int = 0
+
+        def add_volume_report(volume_report: RenderReport) -> None:
+            first_page: int = len(report)
+            for page in volume_report:
+                duplicate_of: Optional[int] = page.duplicate_of
+                report.append(page._replace(
+                    page_index=first_page + page.page_index,
+                    duplicate_of=(
+                        first_page + duplicate_of
+                        if duplicate_of is not None else None
+                    )
+                ))
+
+        try:
+            if volume_workers <= 1:
+                for volume in volumes_comics:
+                    volume_report: RenderReport = volume.render(
+                        **render_options,
+                        on_event=self._volume_events(
+                            emit, len(report), total_pages, bytes_written
+                        ),
+                        cancellation_token=cancellation_token
+                    )
+                    add_volume_report(volume_report)
+                    bytes_written += volume.output_file_path.stat().st_size
+
+                report.peak_rss = memory.peak_rss()
+                if render_options["workers"] > 1:
+                    report.workers_peak_rss = memory.peak_rss(children=True)
+
+            else:
+                # Processes of volumes can't start their own pools of workers
+                render_options = dict(render_options, workers=1)
+                page_cache: Optional['PageCache'] = render_options[
+                    "page_cache"
+                ]
+                # Set when rendering fails or is cancelled, stops volumes
+                # that are already being rendered too
+                volumes_cancelled = multiprocessing.Event()
+                with ProcessPoolExecutor(
+                    max_workers=volume_workers,
+                    initializer=_start_volume_process,
+                    initargs=(volumes_cancelled,)
+                ) as pool:
+                    futures: List[Future] = [
+                        pool.submit(_render_volume, volume, render_options)
+                        for volume in volumes_comics
+                    ]
+                    try:
+                        # Progress is reported in order of volumes
+                        for volume, future in zip(volumes_comics, futures):
+                            volume_report, hits, misses = _wait_for_volume(
+                                future, cancellation_token
+                            )
+                            if page_cache is not None:
+                                page_cache.hits += hits
+                                page_cache.misses += misses
+
+                            bytes_written += (
+                                volume.output_file_path.stat().st_size
+                            )
+                            for page in volume_report:
+                                emit(Event(
+                                    events.BYTES_WRITTEN,
+                                    len(report) + page.page_index,
+                                    total_pages, page.name, bytes_written
+                                ))
+
+                            add_volume_report(volume_report)
+                            report.workers_peak_rss = max(
+                                report.workers_peak_rss or 0,
+                                volume_report.peak_rss or 0
+                            ) or None
+
+                    except BaseException:
+                        volumes_cancelled.set()
+                        for future in futures:
+                            future.cancel()
+
+                        raise
+
+                    finally:
+                        if page_cache is not None:
+                            # Pages stored by volumes are accounted and size
+                            # limit is applied to all of them
+                            page_cache.reload()
+
+                report.peak_rss = memory.peak_rss()
+
+            emit(Event(
+                events.FINISHED, total=total_pages,
+                bytes_written=bytes_written
+            ))
+
+        except BaseException as error:
+            # Set of volumes without some of them isn't useful
+            for volume_file in report.volumes:
+                if volume_file.exists():
+                    volume_file.unlink()
+
+            emit(Event(events.ERROR, total=total_pages, error=error))
+            raise
+
+        return report
+
+    @staticmethod
+    def _volume_events(
+        emit: EventCallback, first_page: int, total_pages: int,
+        bytes_before: int
+    ) -> EventCallback:
+        # Events of volume are reported as events of whole comics
+        def on_volume_event(event: Event) -> None:
+            if event.kind in (events.FINISHED, events.ERROR):
+                return
+
+            emit(event._replace(
+                index=first_page + event.index, total=total_pages,
+                bytes_written=bytes_before + event.bytes_written
+            ))
+
+        return on_volume_event
+
+    def compact_output_file(self) -> int:
+        """
+        Rewrites rendered PDF file into single section, dropping objects that
+        were replaced by incremental updates appended to it.
+
+        :return: how many bytes were saved, 0 if file was left as is.
+        :raises FileNotFoundError: if output file wasn't rendered.
+        :raises PIL.PdfParser.PdfFormatError: if output file isn't valid pdf.
+        """
+        return compact_pdf(self.output_file_path)
+
+    def render_cbz(
+        self, comic_info: Optional[ComicInfo] = None,
+        on_event: Optional[EventCallback] = None,
+        cancellation_token: Optional[CancellationToken] = None
+    ) -> RenderReport:
+        """
+        Writes the comics into CBZ archive next to pdf output file.
+        Source files are copied into archive byte for byte without
+        compression, so images are never decoded.
+
+        :param comic_info: if set, ComicInfo.xml with these metadata and
+        information about pages is added to archive.
+        :param on_event: called when pages are started and written,
+        when writing is finished or failed.
+        :param cancellation_token: token that can stop writing. Partially
+        written file is removed.
+        :return: report about pages, all of them are passed through.
+        :raises OutputFileIsInput: if images are read from output file.
+        :raises OperationCancelled: if writing was cancelled.
+        """
+        images_render_queue: Comics = copy(self)
+        total_pages: int = len(images_render_queue)
+
+        if total_pages == 0:
+            raise ValueError("No images to render as CBZ")
+
+        output_file_path: Path = self.output_cbz_file_path.resolve()
+        for image in images_render_queue:
+            if (
+                isinstance(image, ArchiveImage)
+                and image.archive_path.resolve() == output_file_path
+            ):
+                raise exceptions.OutputFileIsInput(
+                    f"{output_file_path} is source of images, "
+                    "set other output name or folder"
+                )
+
+        def emit(event: Event) -> None:
+            if on_event is not None:
+                on_event(event)
+
+        report = RenderReport()
+        # File isn't removed if it couldn't even be opened
+        output_file_opened: bool = False
+        try:
+            with open(self.output_cbz_file_path, "w+b") as output_file:
+                output_file_opened = True
+                writer = CbzWriter(output_file, total_pages, comic_info)
+                try:
+                    self._write_cbz_pages(
+                        writer, images_render_queue, report, output_file,
+                        emit, cancellation_token
+                    )
+
+                except BaseException:
+                    writer.discard()
+                    raise
+
+                with profiling.stage("write"):
+                    writer.close()
+
+                emit(Event(
+                    events.FINISHED, total=total_pages,
+                    bytes_written=output_file.tell()
+                ))
+
+        except BaseException as error:
+            if output_file_opened:
+                self.output_cbz_file_path.unlink()
+
+            emit(Event(events.ERROR, total=total_pages, error=error))
+            raise
+
+        return report
+
+    @staticmethod
+    def _write_cbz_pages(
+        writer: CbzWriter, images: List[ComicsImage], report: RenderReport,
+        output_file: BinaryIO, emit: EventCallback,
+        cancellation_token: Optional[CancellationToken] = None
+    ) -> None:
+        """
+        Copies images into CBZ archive.
+
+        :param writer: writer of archive.
+        :param images: images of pages.
+        :param report: report that is filled with written pages.
+        :param output_file: file of archive.
+        :param emit: callback for progress events.
+        :param cancellation_token: token that can stop writing.
+        :return: nothing.
+        """
+        total_pages: int = len(images)
+        for page_index, image in enumerate(images):
+            if cancellation_token is not None:
+                cancellation_token.raise_if_cancelled()
+
+            emit(Event(
+                events.PAGE_STARTED, page_index, total_pages, image.name
+            ))
+            with profiling.stage("write", str(image.path)) as stage:
+                copied_size: int = writer.add_page(image)
+                stage.add_read(copied_size)
+                stage.add_written(copied_size)
+
+            report.append(
+                PageReport(page_index, image.name, True, copied_size)
+            )
+            emit(Event(
+                events.BYTES_WRITTEN, page_index, total_pages,
+                image.name, output_file.tell()
+            ))
+
+    async def render_async(
+        self, quality: int = 90, resolution: int = 300,
+        fill_color: Optional[FillColor] = None,
+        workers: int = 1, jpeg_passthrough: bool = False,
+        page_cache: Optional['PageCache'] = None,
+        max_dpi: Optional[int] = None,
+        on_event: Optional[EventCallback] = None,
+        cancellation_token: Optional[CancellationToken] = None,
+        executor: Optional[Executor] = None,
+        semaphore: Optional[asyncio.Semaphore] = None,
+        detect_grayscale: bool = False,
+        grayscale_tolerance: int = 8,
+        deduplicate: bool = False,
+        compression: str = "jpeg",
+        memory_limit: Optional[int] = None,
+        max_volume_pages: Optional[int] = None,
+        max_volume_size: Optional[int] = None,
+        split_by_folder: bool = False,
+        volume_workers: int = 1,
+        append_to_existing: bool = False
+    ) -> RenderReport:
+        """
+        Renders the comics into PDF file without blocking event loop.
+        Rendering runs in executor and is always streamed. If awaiting task
+        is cancelled, rendering is stopped too.
+
+        :param quality: the quality of images to be exported to pdf.
+        :param resolution: DPI resolution that will be used when printing.
+        :param fill_color: color that fills transparent background.
+        :param workers: how many processes are used to encode pages.
+        :param jpeg_passthrough: if set, RGB and grayscale JPEG images are
+        embedded into pdf as is.
+        :param page_cache: cache of encoded pages.
+        :param max_dpi: if set, pages with higher DPI are downscaled.
+        :param on_event: called from executor thread on progress.
+        :param cancellation_token: token that can stop rendering.
+        :param executor: executor to run rendering in. By default uses
+        event loop default executor.
+        :param semaphore: if set, rendering waits for it, so many renders
+        can share one concurrency limit.
+        :param detect_grayscale: if set, color pages without visible color
+        are encoded as grayscale.
+        :param grayscale_tolerance: largest difference between channels of
+        pixel that is still considered gray.
+        :param deduplicate: if set, pages with same source data share one
+        image object.
+        :param compression: one of "jpeg", "flate", "auto" and "smallest".
+        :param memory_limit: if set, workers get only as many pages at once
+        as fit into that many bytes.
+        :param max_volume_pages: if set, comics is split into volumes with
+        at most that many pages.
+        :param max_volume_size: if set, comics is split into volumes which
+        source files take at most that many bytes.
+        :param split_by_folder: if set, comics is split into volumes where
+        folder of images changes.
+        :param volume_workers: how many volumes are rendered at once.
+        :param append_to_existing: if set, only pages that existing file
+        doesn't have yet are appended to it.
+        :return: report about how each page was encoded.
+        :raises OperationCancelled: if rendering was cancelled with token.
+        """
+        if cancellation_token is None:
+            cancellation_token = CancellationToken()
+
+        render = partial(
+            self.render, quality=quality, resolution=resolution,
+            fill_color=fill_color, streaming=True, workers=workers,
+            jpeg_passthrough=jpeg_passthrough, page_cache=page_cache,
+            max_dpi=max_dpi, on_event=on_event,
+            cancellation_token=cancellation_token,
+            detect_grayscale=detect_grayscale,
+            grayscale_tolerance=grayscale_tolerance,
+            deduplicate=deduplicate,
+            compression=compression,
+            memory_limit=memory_limit,
+            max_volume_pages=max_volume_pages,
+            max_volume_size=max_volume_size,
+            split_by_folder=split_by_folder,
+            volume_workers=volume_workers,
+            append_to_existing=append_to_existing
+        )
+
+        return await _run_in_executor(
+            render, cancellation_token, executor, semaphore
+        )
+
+    async def render_iter_async(
+        self, *, cancellation_token: Optional[CancellationToken] = None,
+        **render_options: Any
+    ) -> AsyncIterator[Event]:
+        """
+        Renders the comics into PDF file yielding progress events.
+        Last event is either finished event or error event, after which
+        error is raised. Stopping iteration early cancels rendering.
+
+        :param cancellation_token: token that can stop rendering.
+        :param render_options: keyword arguments of render_async, except
+        on_event.
+        :return: async iterator over rendering events.
+        :raises OperationCancelled: if rendering was cancelled with token.
+        """
+        if cancellation_token is None:
+            cancellation_token = CancellationToken()
+
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+
+        def on_event(event: Event) -> None:
+            loop.call_soon_threadsafe(queue.put_nowait, event)
+
+        rendering = asyncio.ensure_future(self.render_async(
+            on_event=on_event, cancellation_token=cancellation_token,
+            **render_options
+        ))
+        try:
+            while True:
+                getting_event = asyncio.ensure_future(queue.get())
+                await asyncio.wait(
+                    (getting_event, rendering),
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                if not getting_event.done():
+                    # Rendering failed before it could send any events
+                    getting_event.cancel()
+                    await rendering
+
+                event: Event = getting_event.result()
+                yield event
+
+                if event.kind in (events.FINISHED, events.ERROR):
+                    break
+
+            await rendering
+
+        finally:
+            if not rendering.done():
+                cancellation_token.cancel()
+                await asyncio.wait((rendering,))
+                if not rendering.cancelled():
+                    rendering.exception()
 
     @classmethod
-    def load_from_folder(cls, folder: Path) -> 'Comics':
+    async def load_from_folder_async(
+        cls, folder: Path, verify: bool = False, workers: int = 1,
+        probe_cache: Optional['ProbeCache'] = None,
+        on_event: Optional[EventCallback] = None,
+        cancellation_token: Optional[CancellationToken] = None,
+        executor: Optional[Executor] = None,
+        semaphore: Optional[asyncio.Semaphore] = None
+    ) -> 'Comics':
+        """
+        Creates comics from provided folder without blocking event loop.
+
+        Parameters are same as in load_from_folder and render_async.
+
+        :return: Instance of Comics.
+        """
+        if cancellation_token is None:
+            cancellation_token = CancellationToken()
+
+        load = partial(
+            cls.load_from_folder, folder, verify, workers, probe_cache,
+            on_event, cancellation_token
+        )
+
+        return await _run_in_executor(
+            load, cancellation_token, executor, semaphore
+        )
+
+    async def append_from_folder_async(
+        self, folder: Path, verify: bool = False, workers: int = 1,
+        probe_cache: Optional['ProbeCache'] = None,
+        on_event: Optional[EventCallback] = None,
+        cancellation_token: Optional[CancellationToken] = None,
+        executor: Optional[Executor] = None,
+        semaphore: Optional[asyncio.Semaphore] = None
+    ) -> None:
+        """
+        Adds all images from folder to the end of comics without blocking
+        event loop. Comics must not be changed until images are added.
+
+        Parameters are same as in append_from_folder and render_async.
+
+        :return: nothing.
+        """
+        if cancellation_token is None:
+            cancellation_token = CancellationToken()
+
+        append = partial(
+            self.append_from_folder, folder, verify, workers, probe_cache,
+            on_event, cancellation_token
+        )
+
+        await _run_in_executor(
+            append, cancellation_token, executor, semaphore
+        )
+
+    @classmethod
+    def load_from_folder(
+        cls, folder: Path, verify: bool = False, workers: int = 1,
+        probe_cache: Optional['ProbeCache'] = None,
+        on_event: Optional[EventCallback] = None,
+        cancellation_token: Optional[CancellationToken] = None
+    ) -> 'Comics':
         """
         Creates comics from provided folder.
 
         :param folder: folder which will be used to output pdf,
         and to collect images from it. Also uses folder name as default output
         file name.
+        :param verify: if set, fully checks images and skips broken ones.
+        :param workers: how many threads are used to read images headers.
+        :param probe_cache: if set, files that weren't changed since previous
+        scan aren't opened.
+        :param on_event: called after every file is scanned and when
+        scanning is finished or failed.
+        :param cancellation_token: token that can stop scanning.
         :return: Instance of Comics.
         """
         output_file_name: str = textwrap.shorten(
@@ -172,49 +1260,275 @@ class Comics(list, List[ComicsImage]):
         output_file_name = f"{output_file_name}.pdf"
 
         comics = cls(folder, output_file_name)
-        comics.append_from_folder(folder)
+        comics.append_from_folder(
+            folder, verify, workers, probe_cache, on_event, cancellation_token
+        )
 
         return comics
 
-    def append_from_folder(self, folder: Path) -> None:
+    def append_from_folder(
+        self, folder: Path, verify: bool = False, workers: int = 1,
+        probe_cache: Optional['ProbeCache'] = None,
+        on_event: Optional[EventCallback] = None,
+        cancellation_token: Optional[CancellationToken] = None
+    ) -> None:
+        """
+        Adds all images from folder to the end of comics.
+        Only headers of images are read unless verification is requested.
+
+        :param folder: folder with images.
+        :param verify: if set, fully checks images and skips broken ones.
+        :param workers: how many threads are used to read images headers.
+        Order of images doesn't depend on amount of workers.
+        :param probe_cache: if set, files that weren't changed since previous
+        scan aren't opened.
+        :param on_event: called after every file is scanned, possibly from
+        worker threads, and when scanning is finished or failed.
+        :param cancellation_token: token that can stop scanning. Nothing is
+        added to comics if scanning was cancelled.
+        :return: nothing.
+        :raises InputPathIsNotAFolder: if folder isn't a directory.
+        :raises DirectoryHasNoImages: if folder has no images.
+        :raises OperationCancelled: if scanning was cancelled.
+        """
         if not folder.is_dir():
             raise exceptions.InputPathIsNotAFolder(
                 f"{folder} isn't a folder"
             )
 
-        found_images: int = 0
-        for filepath in filter(lambda f: f.is_file(), folder.iterdir()):
-            try:
-                image: ComicsImage = ComicsImage(filepath)
+        try:
+            with profiling.stage("scan"):
+                found_images: List[ComicsImage] = folder_scanning.scan_folder(
+                    folder, workers, verify, probe_cache,
+                    on_event, cancellation_token
+                )
 
-            except UnidentifiedImageError:
-                # We delete object if file isn't image
-                continue
+        except BaseException as error:
+            if on_event is not None:
+                on_event(Event(events.ERROR, error=error))
 
-            self.append(image)
-            found_images += 1
+            raise
+
+        self.extend(found_images)
 
         if not found_images:
             raise exceptions.DirectoryHasNoImages(f"{folder} has no images")
 
+        if on_event is not None:
+            on_event(Event(events.FINISHED, total=len(found_images)))
+
+    def watch_folder(
+        self, folder: Path, settings: RenderSettings = RenderSettings(),
+        workers: int = 1, page_cache: Optional['PageCache'] = None,
+        memory_limit: Optional[int] = None,
+        on_event: Optional[EventCallback] = None,
+        on_update: Optional[Callable[[RenderReport], None]] = None,
+        cancellation_token: Optional[CancellationToken] = None,
+        settle_time: float = 2.0, poll_interval: float = 1.0,
+        on_error: Optional[Callable[[Exception], None]] = None
+    ) -> None:
+        """
+        Keeps PDF file up to date while new images arrive into folder, until
+        watching is cancelled. New images are added to the end of comics
+        and only their pages are appended to PDF by incremental update, so
+        pages that PDF already has are never encoded again. Files are picked
+        up only after they stay unchanged for settle_time seconds, so
+        partially written files are skipped. If update fails, PDF is left as
+        it was before update, images of that update are dropped and watching
+        goes on. Dropped files are tried again when they change.
+
+        :param folder: folder where images arrive. Images of comics are
+        expected to be taken from it.
+        :param settings: settings of rendering.
+        :param workers: how many processes are used to encode pages.
+        :param page_cache: cache of encoded pages.
+        :param memory_limit: memory budget of pages given to workers.
+        :param on_event: callback for progress events of every update.
+        :param on_update: called with report about appended pages after
+        every update of PDF.
+        :param cancellation_token: token that stops watching.
+        :param settle_time: how many seconds file must stay unchanged to be
+        added.
+        :param poll_interval: how often cancellation is checked and folder is
+        polled when inotify isn't available, in seconds.
+        :param on_error: called with error of every failed update.
+        :return: nothing, returns only by raising OperationCancelled.
+        :raises InputPathIsNotAFolder: if folder isn't a directory.
+        :raises OperationCancelled: when watching is cancelled.
+        """
+        if not folder.is_dir():
+            raise exceptions.InputPathIsNotAFolder(
+                f"{folder} isn't a folder"
+            )
+
+        known_paths: Set[str] = {
+            os.path.abspath(image.path) for image in self
+        }
+        known_paths.update(
+            os.path.abspath(excluded_image.image.path)
+            for excluded_image in self.excluded_images
+        )
+        known_paths.add(os.path.abspath(self.output_file_path))
+
+        def update(new_images: List[ComicsImage]) -> None:
+            try:
+                report: RenderReport = self._render_streaming(
+                    settings, workers, page_cache, on_event,
+                    cancellation_token, memory_limit=memory_limit,
+                    append=True
+                )
+
+            except exceptions.OperationCancelled:
+                raise
+
+            except Exception as error:
+                # New images are always at the end of comics
+                del self[len(self) - len(new_images):]
+                known_paths.difference_update(
+                    os.path.abspath(image.path) for image in new_images
+                )
+                if on_error is not None:
+                    on_error(error)
+
+                return
+
+            if on_update is not None:
+                on_update(report)
+
+        with folder_watching.FolderWatcher(
+            folder, settle_time, poll_interval, report_existing=True
+        ) as watcher:
+            if self:
+                update([])
+
+            while True:
+                if cancellation_token is not None:
+                    cancellation_token.raise_if_cancelled()
+
+                new_paths: List[Path] = [
+                    path for path in watcher.wait_for_files(poll_interval)
+                    if os.path.abspath(path) not in known_paths
+                ]
+                if not new_paths:
+                    continue
+
+                # Files that aren't images are checked again only if they
+                # change, because watcher reports only changed files
+                new_images: List[ComicsImage] = folder_scanning.probe_images(
+                    new_paths
+                )
+                if new_images:
+                    known_paths.update(
+                        os.path.abspath(image.path) for image in new_images
+                    )
+                    self.extend(new_images)
+                    update(new_images)
+
+    @classmethod
+    def load_from_archive(
+        cls, archive: Path, natural_order: bool = False,
+        verify: bool = False,
+        on_event: Optional[EventCallback] = None,
+        cancellation_token: Optional[CancellationToken] = None
+    ) -> 'Comics':
+        """
+        Creates comics from provided ZIP or TAR archive.
+
+        :param archive: archive with images. Folder of archive is used to
+        output pdf and archive name without extension is used as default
+        output file name.
+        :param natural_order: if set, images are sorted by names with numbers
+        compared by their value, otherwise order of archive is kept.
+        :param verify: if set, fully checks images and skips broken ones.
+        :param on_event: called after every member is scanned and when
+        scanning is finished or failed.
+        :param cancellation_token: token that can stop scanning.
+        :return: Instance of Comics.
+        """
+        comics = cls(archive.parent, archive.stem)
+        comics.append_from_archive(
+            archive, natural_order, verify, on_event, cancellation_token
+        )
+
+        return comics
+
+    def append_from_archive(
+        self, archive: Path, natural_order: bool = False,
+        verify: bool = False,
+        on_event: Optional[EventCallback] = None,
+        cancellation_token: Optional[CancellationToken] = None
+    ) -> None:
+        """
+        Adds all images from ZIP or TAR archive (like .cbz or .cbt comics)
+        to the end of comics. Nothing is extracted to disk, images are read
+        from archive only when they are rendered.
+
+        :param archive: archive with images.
+        :param natural_order: if set, images are sorted by names with numbers
+        compared by their value, otherwise order of archive is kept.
+        :param verify: if set, fully checks images and skips broken ones.
+        :param on_event: called after every member is scanned and when
+        scanning is finished or failed.
+        :param cancellation_token: token that can stop scanning. Nothing is
+        added to comics if scanning was cancelled.
+        :return: nothing.
+        :raises NotAnArchive: if file isn't ZIP or TAR archive.
+        :raises ArchiveHasNoImages: if archive has no images.
+        :raises OperationCancelled: if scanning was cancelled.
+        """
+        if not archive_scanning.is_archive(archive):
+            raise exceptions.NotAnArchive(f"{archive} isn't an archive")
+
+        try:
+            with profiling.stage("scan"):
+                found_images: List[ArchiveImage] = (
+                    archive_scanning.scan_archive(
+                        archive, natural_order, verify,
+                        on_event, cancellation_token
+                    )
+                )
+
+        except BaseException as error:
+            if on_event is not None:
+                on_event(Event(events.ERROR, error=error))
+
+            raise
+
+        self.extend(found_images)
+
+        if not found_images:
+            raise exceptions.ArchiveHasNoImages(f"{archive} has no images")
+
+        if on_event is not None:
+            on_event(Event(events.FINISHED, total=len(found_images)))
+
     @property
     def output_file_name(self) -> str:
         return self._output_file_name
 
     @output_file_name.setter
     def output_file_name(self, value: str) -> None:
+        self._output_file_name = self.sanitize_output_file_name(value)
+
+    @staticmethod
+    def sanitize_output_file_name(value: str) -> str:
+        """
+        Makes valid pdf file name out of any string.
+
+        :param value: wanted file name.
+        :return: sanitized file name with .pdf extension.
+        """
         value = sanitize_filename(value)
         if value == "":
             value = "Untitled"
 
         output_file_name: str = textwrap.shorten(
-            value, width=251, placeholder=""
+            value, width=MAX_FILE_STEM_LENGTH, placeholder=""
         )
         if not output_file_name.endswith(".pdf"):
-            self._output_file_name = f"{output_file_name}.pdf"
+            return f"{output_file_name}.pdf"
 
-        else:
-            self._output_file_name = output_file_name
+        return output_file_name
 
     @property
     def output_folder(self) -> Path:
@@ -232,3 +1546,115 @@ class Comics(list, List[ComicsImage]):
     @property
     def output_file_path(self) -> Path:
         return self.output_folder / self.output_file_name
+
+    @property
+    def output_cbz_file_path(self) -> Path:
+        return self.output_file_path.with_suffix(".cbz")
+
+    def volume_file_name(self, volume_number: int, volumes_total: int) -> str:
+        """
+        Makes name of pdf file of one volume, like "Title - Vol 01.pdf".
+        Long titles are shortened before number of volume is added, so
+        every volume gets its own name.
+
+        :param volume_number: number of volume starting from 1.
+        :param volumes_total: how many volumes there are.
+        :return: sanitized file name with .pdf extension.
+        """
+        digits: int = max(2, len(str(volumes_total)))
+        suffix: str = f" - Vol {volume_number:0{digits}d}"
+        stem: str = self.output_file_path.stem[
+            :MAX_FILE_STEM_LENGTH - len(suffix)
+        ]
+        return self.sanitize_output_file_name(f"{stem}{suffix}")
+
+
+# Token of process that renders volumes, shared by all such processes
+_volume_cancellation_token: Optional[CancellationToken] = None
+
+
+def _start_volume_process(cancelled: Any) -> None:
+    # Runs once in every process that renders volumes
+    global _volume_cancellation_token
+    _volume_cancellation_token = CancellationToken(cancelled)
+
+
+def _render_volume(
+    volume: Comics, render_options: Dict[str, Any]
+) -> Tuple[RenderReport, int, int]:
+    # Runs in process of volume with its own copy of page cache, returns
+    # report with hits and misses of that copy
+    page_cache: Optional['PageCache'] = render_options["page_cache"]
+    hits: int = 0
+    misses: int = 0
+    if page_cache is not None:
+        # Pages stored by volumes rendered before are seen by copy too
+        page_cache.reload()
+        hits, misses = page_cache.hits, page_cache.misses
+
+    report: RenderReport = volume.render(
+        **render_options, cancellation_token=_volume_cancellation_token
+    )
+    if page_cache is not None:
+        hits, misses = page_cache.hits - hits, page_cache.misses - misses
+
+    return report, hits, misses
+
+
+def _wait_for_volume(
+    future: Future, cancellation_token: Optional[CancellationToken] = None
+) -> Tuple[RenderReport, int, int]:
+    if cancellation_token is None:
+        return future.result()
+
+    while True:
+        cancellation_token.raise_if_cancelled()
+        try:
+            return future.result(timeout=CANCELLATION_POLL_INTERVAL)
+
+        except FutureTimeoutError:
+            continue
+
+
+async def _run_in_executor(
+    function, cancellation_token: CancellationToken,
+    executor: Optional[Executor] = None,
+    semaphore: Optional[asyncio.Semaphore] = None
+):
+    """
+    Runs blocking function in executor, optionally limiting how many
+    functions run at once.
+
+    :param function: function without arguments.
+    :param cancellation_token: token used by function, that is cancelled
+        when awaiting task is cancelled.
+    :param executor: executor to run function in.
+    :param semaphore: shared concurrency limit.
+    :return: result of function.
+    """
+    if semaphore is None:
+        return await _run_cancellable(function, cancellation_token, executor)
+
+    async with semaphore:
+        return await _run_cancellable(function, cancellation_token, executor)
+
+
+async def _run_cancellable(
+    function, cancellation_token: CancellationToken,
+    executor: Optional[Executor] = None
+):
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(executor, function)
+    try:
+        # Shielded so that function stops by itself and its resources
+        # are released before task is cancelled
+        return await asyncio.shield(future)
+
+    except asyncio.CancelledError:
+        cancellation_token.cancel()
+        await asyncio.wait((future,))
+        if not future.cancelled():
+            # Failure of cancelled function is expected
+            future.exception()
+
+        raise
@@ -0,0 +1,74 @@
+"""
+Contains types for following progress of long operations on comics
+and for cancelling them.
+"""
+
+from threading import Event as ThreadingEvent
+from typing import Any, Callable, NamedTuple, Optional
+
+from comix_pdf import exceptions
+
+# Kinds of events
+PAGE_STARTED = "page started"
+PAGE_ENCODED = "page encoded"
+BYTES_WRITTEN = "bytes written"
+FILE_SCANNED = "file scanned"
+FINISHED = "finished"
+ERROR = "error"
+
+
+class Event(NamedTuple):
+    """
+    Something that happened while rendering or scanning folder.
+    """
+
+    kind: str
+    # Index of page or file that event is related to
+    index: Optional[int] = None
+    total: Optional[int] = None
+    name: Optional[str] = None
+    # How many bytes are written into output file so far
+    bytes_written: int = 0
+    error: Optional[BaseException] = None
+
+
+# Callbacks might be called from worker threads while scanning folders
+EventCallback = Callable[[Event], None]
+
+
+class CancellationToken:
+    """
+    Lets other threads stop rendering or scanning folder.
+    """
+
+    def __init__(self, event: Optional[Any] = None):
+        """
+        Creates token that isn't cancelled yet.
+
+        :param event: threading or multiprocessing event that is set when
+            token is cancelled. Token that is made from multiprocessing
+            event in every process cancels operations in all of them.
+        """
+        self._cancelled = event if event is not None else ThreadingEvent()
+
+    def cancel(self) -> None:
+        """
+        Requests operation to stop as soon as possible.
+
+        :return: nothing.
+        """
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        """
+        Stops operation if it was cancelled.
+
+        :return: nothing.
+        :raises OperationCancelled: if operation was cancelled.
+        """
+        if self.cancelled:
+            raise exceptions.OperationCancelled("Operation was cancelled")
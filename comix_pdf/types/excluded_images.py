@@ -1,4 +1,4 @@
-from typing import List, NamedTuple
+from typing import List, NamedTuple, Optional
 
 from .image import ComicsImage
 
@@ -6,6 +6,8 @@ from .image import ComicsImage
 class ExcludedImage(NamedTuple):
     image: ComicsImage
     previous_position_index: int
+    # Page that followed image when it was excluded, None if it was last
+    next_page_id: Optional[int] = None
 
 
 class ExcludedImages(list, List[ExcludedImage]):
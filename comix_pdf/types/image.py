@@ -2,60 +2,336 @@
 Contains ComicsImages class that adds more functionality to Pil.Image.Image
 class.
 """
-from copy import copy
+import os
+import time
+from itertools import count
 from pathlib import Path
+from typing import BinaryIO, NamedTuple, Optional, Tuple
 
 from PIL import Image
 
+from comix_pdf.utils import profiling
 from .fill_color import FillColor
+from .sort_keys import SortKeys
+
+
+# Modes that store alpha channel
+ALPHA_MODES = {"RGBA", "RGBa", "LA", "La", "PA"}
+# Formats that might store EXIF metadata
+EXIF_FORMATS = {"JPEG", "MPO", "TIFF", "WEBP"}
+EXIF_IFD = 0x8769
+EXIF_DATE_TIME_ORIGINAL = 36867
+EXIF_DATE_TIME = 306
+EXIF_DATE_FORMAT = "%Y:%m:%d %H:%M:%S"
+# Source of identifiers that stay with images while pages are rearranged
+PAGE_IDS = count()
+
+
+def has_transparency(img: Image.Image) -> bool:
+    """
+    Checks if image has alpha channel or transparent color.
+
+    :param img: image to check.
+    :return: True if image has transparent pixels.
+    """
+    return img.mode in ALPHA_MODES or "transparency" in img.info
+
+
+def flatten_transparency(
+    img: Image.Image, fill_color: FillColor
+) -> Image.Image:
+    """
+    Composites image onto background of fill_color in one pass.
+
+    :param img: image of any mode.
+    :param fill_color: color of background.
+    :return: Image instance with RGB type.
+    """
+    if not has_transparency(img):
+        return img.convert("RGB")
+
+    if img.mode != "RGBA":
+        # Palette, grayscale and premultiplied images are composited
+        # through one RGBA copy
+        img = img.convert("RGBA")
+
+    flattened: Image.Image = Image.new(
+        "RGB", img.size, (fill_color.Red, fill_color.Green, fill_color.Blue)
+    )
+    # Alpha channel of RGBA image is used as mask directly
+    flattened.paste(img, mask=img)
+
+    return flattened
+
+
+def read_capture_timestamp(img: Image.Image) -> Optional[float]:
+    """
+    Reads when photo was taken from EXIF metadata of image.
+    Only header is read, pixels aren't decoded.
+
+    :param img: opened image.
+    :return: capture time in unix time format or None if it isn't known.
+    """
+    if img.format not in EXIF_FORMATS:
+        return None
+
+    try:
+        exif = img.getexif()
+        value = exif.get_ifd(EXIF_IFD).get(EXIF_DATE_TIME_ORIGINAL)
+        if value is None:
+            value = exif.get(EXIF_DATE_TIME)
+
+        if not isinstance(value, str):
+            return None
+
+        # EXIF stores local time without time zone
+        return time.mktime(
+            time.strptime(value.strip("\x00 "), EXIF_DATE_FORMAT)
+        )
+
+    except (ValueError, OverflowError, OSError, SyntaxError):
+        return None
+
+
+class ImageHeader(NamedTuple):
+    """
+    Information about image that is read from file header without decoding.
+    """
+
+    format: Optional[str]
+    size: Tuple[int, int]
+    mode: str
+    # When photo was taken according to EXIF
+    capture_timestamp: Optional[float] = None
 
 
 class ComicsImage:
     """
     Type for image for comics' collection.
+    Doesn't keep file opened, it is opened again only when pixels are needed.
     """
 
-    def __init__(self, path: Path):
+    # Whether source is read while image is decoded. If not, source is read
+    # by open and its bytes are already counted by profiling
+    reads_source_on_decode: bool = True
+
+    def __init__(
+        self, path: Path, header: Optional[ImageHeader] = None,
+        stat: Optional[os.stat_result] = None
+    ):
         """
-        Initializes custom Image object. To use object you first need to
-        execute method load_image.
+        Initializes custom Image object reading only header of image file.
 
         :param path: where image is stored on disk.
+        :param header: already known header of image. If set, file isn't
+            opened at all.
+        :param stat: already known stat of file, like one that os.scandir
+            returns. If set, file isn't stat'ed again for sort keys.
         :raises PIL.UnidentifiedImageError: file is not an image.
         """
         self.path: Path = path
+        self.page_id: int = next(PAGE_IDS)
+
+        if header is None:
+            header = self.probe_header(path)
+
+        self.header: ImageHeader = header
+        self.sort_keys: SortKeys = self._make_sort_keys(stat)
+
+    def _make_sort_keys(
+        self, stat: Optional[os.stat_result] = None
+    ) -> SortKeys:
+        if stat is None:
+            stat = self.path.stat()
+
+        return SortKeys.from_stat(
+            self.path.name, stat, self.header.capture_timestamp
+        )
+
+    @staticmethod
+    def probe_header(path: Path) -> ImageHeader:
+        """
+        Reads format, size and mode of image and closes file right after.
+
+        :param path: where image is stored on disk.
+        :return: header of image.
+        :raises PIL.UnidentifiedImageError: file is not an image.
+        """
+        with profiling.stage("probe", str(path)):
+            with Image.open(path) as img:
+                return ImageHeader(
+                    img.format, img.size, img.mode,
+                    read_capture_timestamp(img)
+                )
+
+    def refresh_sort_keys(self) -> bool:
+        """
+        Updates sort keys if file was changed since they were made.
+        Header is read again only for changed files.
+
+        :return: True if file was changed.
+        :raises PIL.UnidentifiedImageError: file is no longer an image.
+        """
+        stat: os.stat_result = self.path.stat()
+        if self.sort_keys.matches(stat):
+            return False
+
+        self.header = self.probe_header(self.path)
+        self.sort_keys = self._make_sort_keys(stat)
+        return True
+
+    def open(self) -> Image.Image:
+        """
+        Opens image file. Returned image must be closed by caller.
+
+        :return: lazily loaded Image instance.
+        """
+        return Image.open(self.path)
+
+    def verify(self) -> None:
+        """
+        Fully checks that image file isn't broken.
 
-        # Validating that file is actually an image
-        self._img: Image.Image = Image.open(path)
-        copy(self._img).verify()
+        :return: nothing.
+        :raises PIL.UnidentifiedImageError: file is not an image.
+        :raises SyntaxError: image is broken.
+        :raises OSError: image is broken.
+        """
+        with self.open() as img:
+            img.verify()
+
+    def show(self) -> None:
+        """
+        Displays image using default image viewer.
 
-    def convert_to_rgb(self) -> Image:
+        :return: nothing.
+        """
+        with self.open() as img:
+            img.show()
+
+    def convert_to_rgb(self, size: Optional[Tuple[int, int]] = None) -> Image:
         """
         Returns copy of image in RGBA format.
 
+        :param size: if set, image is downscaled to that size. JPEG images
+            are decoded at reduced scale, so they are never fully decoded.
         :return: Image instance with RGBA type.
         """
-        return self._img.convert("RGB")
+        with self.open() as img:
+            self._decode(img, size)
+
+            with profiling.stage("convert", str(self.path)):
+                return self._resize(img.convert("RGB"), size)
 
     def convert_to_rgb_with_fill_color(
-        self, fill_color: FillColor = FillColor(255, 255, 255)
+        self, fill_color: FillColor = FillColor(255, 255, 255),
+        size: Optional[Tuple[int, int]] = None
     ) -> Image:
         """
         Returns copy of image in RGB format with background color
             set to fill_color.
+        Every mode that has transparency is flattened in one pass of
+        compositing, without splitting image into separate channels.
 
         :param fill_color: sets a color for transparent background.
-        :return: Image instance with RGBA type.
+        :param size: if set, image is downscaled to that size.
+        :return: Image instance with RGB type.
+        """
+
+        with self.open() as img:
+            self._decode(img, size)
+
+            with profiling.stage("flatten", str(self.path)):
+                return self._resize(
+                    flatten_transparency(img, fill_color), size
+                )
+
+    def _decode(
+        self, img: Image.Image, size: Optional[Tuple[int, int]]
+    ) -> None:
+        with profiling.stage("decode", str(self.path)) as stage:
+            if size is not None:
+                img.draft(img.mode, size)
+
+            img.load()
+            if stage.enabled and self.reads_source_on_decode:
+                stage.add_read(self.stored_size)
+
+    @staticmethod
+    def _resize(
+        img: Image.Image, size: Optional[Tuple[int, int]]
+    ) -> Image.Image:
+        if size is None or img.size == size:
+            return img
+
+        return img.resize(size, Image.LANCZOS, reducing_gap=3.0)
+
+    def open_source(self) -> BinaryIO:
         """
+        Opens source file of image for reading. Returned file must be
+        closed by caller.
 
-        if self._img.mode == "RGBA":
-            transparency = self._img.split()[3]
-            new_img = Image.new('RGB', self._img.image.size, fill_color)
-            new_img.paste(self, mask=transparency)
-            return new_img
+        :return: binary file.
+        """
+        return open(self.path, "rb")
 
-        else:
-            return self.convert_to_rgb()
+    def read_bytes(self) -> bytes:
+        """
+        Reads source file of image as is.
+
+        :return: content of image file.
+        """
+        with profiling.stage("read", str(self.path)) as stage:
+            data: bytes = self.path.read_bytes()
+            stage.add_read(len(data))
+
+        return data
+
+    @property
+    def stored_size(self) -> int:
+        """
+        Size of source file of image.
+
+        :return: size in bytes.
+        """
+        return self.path.stat().st_size
+
+    @property
+    def source_identity(self) -> Tuple[str, int, int]:
+        """
+        Identifies current content of source file without reading it.
+
+        :return: absolute path, size and modification time in nanoseconds.
+        """
+        stat = self.path.stat()
+        return os.path.abspath(self.path), stat.st_size, stat.st_mtime_ns
+
+    @property
+    def format(self) -> Optional[str]:
+        """
+        Format of source file, like "JPEG" or "PNG".
+
+        :return: format name known to Pillow.
+        """
+        return self.header.format
+
+    @property
+    def mode(self) -> str:
+        """
+        Pillow mode of source image, like "RGB" or "RGBA".
+
+        :return: mode of image.
+        """
+        return self.header.mode
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        """
+        Size of source image in pixels.
+
+        :return: width and height of image.
+        """
+        return self.header.size
 
     @property
     def modification_timestamp(self) -> float:
@@ -64,7 +340,16 @@ class ComicsImage:
 
         :return: when image was modified last time in unix time format.
         """
-        return self.path.lstat().st_mtime
+        return self.sort_keys.modification_timestamp
+
+    @property
+    def capture_timestamp(self) -> Optional[float]:
+        """
+        When photo was taken according to EXIF metadata of image.
+
+        :return: capture time in unix time format or None if it isn't known.
+        """
+        return self.header.capture_timestamp
 
     @property
     def name(self) -> str:
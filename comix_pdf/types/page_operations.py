@@ -0,0 +1,51 @@
+"""
+Contains operations that are applied to pages of comics at once by
+Comics.apply_operations.
+Indices of pages in operations always refer to order of pages before batch,
+so operations don't affect positions of each other.
+"""
+from typing import NamedTuple, Optional, Sequence, Union
+
+from .image import ComicsImage
+
+
+class MovePages(NamedTuple):
+    """
+    Moves pages in given order before page that was at to_index.
+    Index equal to amount of pages moves them to the end.
+    """
+
+    indices: Sequence[int]
+    to_index: int
+
+
+class ExcludePages(NamedTuple):
+    """
+    Excludes pages from rendering.
+    """
+
+    indices: Sequence[int]
+
+
+class RestorePages(NamedTuple):
+    """
+    Brings back excluded images by their indices inside of
+    Comics.excluded_images. By default images are put before page that
+    followed them when they were excluded.
+    """
+
+    excluded_indices: Sequence[int]
+    to_index: Optional[int] = None
+
+
+class InsertPages(NamedTuple):
+    """
+    Inserts new images before page that was at to_index, by default at
+    the end.
+    """
+
+    images: Sequence[ComicsImage]
+    to_index: Optional[int] = None
+
+
+PageOperation = Union[MovePages, ExcludePages, RestorePages, InsertPages]
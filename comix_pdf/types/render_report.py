@@ -0,0 +1,77 @@
+"""
+Contains types that describe how pages were encoded during rendering.
+"""
+
+from pathlib import Path
+from typing import List, NamedTuple, Optional
+
+
+class PageReport(NamedTuple):
+    """
+    Information about how one page was written into pdf.
+    """
+
+    page_index: int
+    name: str
+    passed_through: bool
+    # Unknown when pages are encoded by Pillow pdf plugin
+    encoded_size: Optional[int] = None
+    converted_to_grayscale: bool = False
+    # Estimated size that grayscale encoding saved
+    saved_size: int = 0
+    # Index of page that has same image, which is written only once
+    duplicate_of: Optional[int] = None
+
+
+class RenderReport(list, List[PageReport]):
+    # Peak resident memory of rendering process and of its largest worker,
+    # if it was measured
+    peak_rss: Optional[int] = None
+    workers_peak_rss: Optional[int] = None
+    # Files of volumes if comics was split into volumes
+    volumes: Optional[List[Path]] = None
+
+    @property
+    def passed_through(self) -> List[PageReport]:
+        """
+        Pages that were embedded into pdf without re-encoding.
+
+        :return: list of pages reports.
+        """
+        return [page for page in self if page.passed_through]
+
+    @property
+    def re_encoded(self) -> List[PageReport]:
+        """
+        Pages that were decoded and compressed again.
+
+        :return: list of pages reports.
+        """
+        return [page for page in self if not page.passed_through]
+
+    @property
+    def converted_to_grayscale(self) -> List[PageReport]:
+        """
+        Color pages that were encoded as grayscale.
+
+        :return: list of pages reports.
+        """
+        return [page for page in self if page.converted_to_grayscale]
+
+    @property
+    def duplicates(self) -> List[PageReport]:
+        """
+        Pages that show image of one of previous pages.
+
+        :return: list of pages reports.
+        """
+        return [page for page in self if page.duplicate_of is not None]
+
+    @property
+    def saved_size(self) -> int:
+        """
+        Estimated amount of bytes saved by grayscale encoding.
+
+        :return: size in bytes.
+        """
+        return sum(page.saved_size for page in self)
@@ -0,0 +1,26 @@
+"""
+Contains named tuple for storing settings used when rendering pages.
+"""
+
+from typing import NamedTuple, Optional
+
+from .fill_color import FillColor
+
+
+class RenderSettings(NamedTuple):
+    """
+    Settings that define how each page of comics is encoded into pdf.
+    """
+
+    quality: int = 90
+    resolution: int = 300
+    fill_color: Optional[FillColor] = None
+    jpeg_passthrough: bool = False
+    # Pages with higher DPI at printing resolution are downscaled
+    max_dpi: Optional[int] = None
+    # Color pages without visible color are encoded with one channel
+    detect_grayscale: bool = False
+    # Largest difference between channels of pixel that is still gray
+    grayscale_tolerance: int = 8
+    # One of "jpeg", "flate", "auto" and "smallest"
+    compression: str = "jpeg"
@@ -0,0 +1,79 @@
+"""
+Contains SortKeys type that keeps precomputed keys for sorting images,
+so sorting pages never touches file system.
+"""
+import os
+import re
+from typing import NamedTuple, Optional, Tuple, Union
+
+NUMBERS_PATTERN = re.compile(r"(\d+)")
+
+
+def natural_sort_key(name: str) -> Tuple[Union[str, int], ...]:
+    """
+    Makes key that sorts numbers inside of names by their value,
+    so "page 2" goes before "page 10".
+
+    :param name: name of file.
+    :return: key for sorting.
+    """
+    # Split alternates text and numbers, so parts of same kind are compared
+    return tuple(
+        int(part) if index % 2 else part.casefold()
+        for index, part in enumerate(NUMBERS_PATTERN.split(name))
+    )
+
+
+class SortKeys(NamedTuple):
+    """
+    Keys of image for every supported sorting order, filled in once while
+    image is loaded and refreshed only when its file changes.
+    """
+
+    natural_name: Tuple[Union[str, int], ...]
+    modification_timestamp: float
+    size: int
+    # When photo was taken according to EXIF, None if it isn't known
+    capture_timestamp: Optional[float]
+    # Identifies version of file that keys were made from
+    mtime_ns: int
+
+    @classmethod
+    def from_stat(
+        cls, name: str, stat: os.stat_result,
+        capture_timestamp: Optional[float] = None
+    ) -> "SortKeys":
+        """
+        Makes keys from stat of file.
+
+        :param name: name of file.
+        :param stat: stat of file, like one that os.scandir returns.
+        :param capture_timestamp: EXIF capture time of image.
+        :return: SortKeys instance.
+        """
+        return cls(
+            natural_sort_key(name), stat.st_mtime, stat.st_size,
+            capture_timestamp, stat.st_mtime_ns
+        )
+
+    def matches(self, stat: os.stat_result) -> bool:
+        """
+        Checks that file wasn't changed since keys were made.
+
+        :param stat: current stat of file.
+        :return: True if keys are still valid.
+        """
+        return self.size == stat.st_size and self.mtime_ns == stat.st_mtime_ns
+
+    @property
+    def capture_order(self) -> Tuple[bool, float]:
+        """
+        Key that orders images by capture time and puts images without it
+        after others, ordered by modification time.
+
+        :return: key for sorting.
+        """
+        if self.capture_timestamp is None:
+            return True, self.modification_timestamp
+
+        return False, self.capture_timestamp
@@ -0,0 +1,208 @@
+"""
+Functions for finding images inside of ZIP and TAR archives.
+"""
+
+import atexit
+import os
+import shutil
+import tarfile
+import tempfile
+import time
+import zipfile
+from contextlib import contextmanager
+from itertools import count
+from pathlib import Path, PurePosixPath
+from typing import IO, List, Optional, Tuple
+
+from PIL import Image, UnidentifiedImageError
+
+from comix_pdf.types.archive_image import (
+    ArchiveImage, ArchiveMember, tar_info_for
+)
+from comix_pdf.types.events import (
+    CancellationToken, Event, EventCallback, FILE_SCANNED
+)
+from comix_pdf.types.image import ImageHeader
+from comix_pdf.types.sort_keys import natural_sort_key
+
+# Folders with metadata that archivers add next to real files
+IGNORED_FOLDERS = {"__MACOSX"}
+
+# Decompressed copies of compressed tar archives, removed on exit
+_spooled_archives: List[Path] = []
+
+
+def is_archive(path: Path) -> bool:
+    """
+    Checks if file is ZIP or TAR archive by its content.
+
+    :param path: path to file.
+    :return: True if file can be read as archive.
+    """
+    if not path.is_file():
+        return False
+
+    return zipfile.is_zipfile(path) or tarfile.is_tarfile(path)
+
+
+def is_ignored_member(name: str) -> bool:
+    """
+    Checks if archive member is metadata of archiver or hidden file.
+
+    :param name: name of member inside of archive.
+    :return: True if member must not be probed.
+    """
+    parts: Tuple[str, ...] = PurePosixPath(name).parts
+    return (
+        any(part in IGNORED_FOLDERS for part in parts)
+        or parts[-1].startswith(".")
+    )
+
+
+def scan_archive(
+    archive_path: Path, natural_order: bool = False, verify: bool = False,
+    on_event: Optional[EventCallback] = None,
+    cancellation_token: Optional[CancellationToken] = None
+) -> List[ArchiveImage]:
+    """
+    Finds all images inside of archive. Archive is opened only once and
+    only headers of images are read unless verification is requested.
+    Compressed tar archives are decompressed into temporary file once,
+    so pages are read from it without decompressing archive from start
+    for every page.
+
+    :param archive_path: path to archive.
+    :param natural_order: if set, images are sorted by names with numbers
+        compared by their value, otherwise order of archive is kept.
+    :param verify: if set, fully checks images and skips broken ones.
+    :param on_event: called after every member is scanned.
+    :param cancellation_token: token that can stop scanning.
+    :return: list of images.
+    :raises OperationCancelled: if scanning was cancelled.
+    """
+    images: List[ArchiveImage] = []
+    with _open_archive(archive_path) as (archive, open_stream, spool_path):
+        members: List[ArchiveMember] = _list_members(archive)
+        scanned_counter = count()
+
+        for member in members:
+            if cancellation_token is not None:
+                cancellation_token.raise_if_cancelled()
+
+            label: str = f"{archive_path}!{member.name}"
+            try:
+                with open_stream(member) as stream:
+                    header: ImageHeader = ArchiveImage.probe_stream_header(
+                        stream, label
+                    )
+                    if verify:
+                        stream.seek(0)
+                        with Image.open(stream) as img:
+                            img.verify()
+
+                images.append(
+                    ArchiveImage(archive_path, member, header, spool_path)
+                )
+
+            except (UnidentifiedImageError, OSError, SyntaxError):
+                pass
+
+            if on_event is not None:
+                on_event(Event(
+                    FILE_SCANNED, next(scanned_counter), len(members),
+                    member.name
+                ))
+
+    if natural_order:
+        images.sort(key=lambda image: natural_sort_key(image.member.name))
+
+    return images
+
+
+@contextmanager
+def _open_archive(archive_path: Path):
+    """
+    Opens archive and makes function that opens its members.
+
+    :param archive_path: path to archive.
+    :return: context manager with archive, function that opens
+        streams of members and path of decompressed copy of compressed tar
+        archive.
+    """
+    if zipfile.is_zipfile(archive_path):
+        with zipfile.ZipFile(archive_path) as zip_archive:
+            def open_zip_member(member: ArchiveMember) -> IO[bytes]:
+                return zip_archive.open(member.name)
+
+            yield zip_archive, open_zip_member, None
+
+        return
+
+    spool_path: Optional[Path] = spool_compressed_tar(archive_path)
+    with tarfile.open(spool_path or archive_path) as tar_archive:
+        def open_tar_member(member: ArchiveMember) -> IO[bytes]:
+            return tar_archive.extractfile(tar_info_for(member))
+
+        yield tar_archive, open_tar_member, spool_path
+
+
+def spool_compressed_tar(archive_path: Path) -> Optional[Path]:
+    """
+    Decompresses compressed tar archive into temporary file in one pass.
+    Members keep same offsets in decompressed copy. Copies are removed
+    when program exits.
+
+    :param archive_path: path to tar archive.
+    :return: path of decompressed copy or None if archive isn't compressed.
+    """
+    try:
+        with tarfile.open(archive_path, "r:"):
+            return None
+
+    except tarfile.ReadError:
+        pass
+
+    spool_file = tempfile.NamedTemporaryFile(
+        prefix="comix_pdf-", suffix=".tar", delete=False
+    )
+    spool_path = Path(spool_file.name)
+    try:
+        with spool_file, tarfile.open(archive_path) as archive:
+            # Stream of archive is decompressed from its start
+            archive.fileobj.seek(0)
+            shutil.copyfileobj(archive.fileobj, spool_file)
+
+    except BaseException:
+        os.remove(spool_path)
+        raise
+
+    _spooled_archives.append(spool_path)
+    return spool_path
+
+
+@atexit.register
+def _remove_spooled_archives() -> None:
+    for spool_path in _spooled_archives:
+        try:
+            os.remove(spool_path)
+
+        except OSError:
+            pass
+
+
+def _list_members(archive) -> List[ArchiveMember]:
+    if isinstance(archive, zipfile.ZipFile):
+        return [
+            ArchiveMember(
+                info.filename, info.file_size,
+                time.mktime(info.date_time + (0, 0, -1))
+            )
+            for info in archive.infolist()
+            if not info.is_dir() and not is_ignored_member(info.filename)
+        ]
+
+    return [
+        ArchiveMember(info.name, info.size, info.mtime, info.offset_data)
+        for info in archive.getmembers()
+        if info.isfile() and not is_ignored_member(info.name)
+    ]
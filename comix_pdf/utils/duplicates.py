@@ -0,0 +1,184 @@
+"""
+Functions for finding pages that repeat inside of comics.
+"""
+
+import hashlib
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+from PIL import Image
+
+from comix_pdf.types.image import ComicsImage
+from . import profiling
+
+# Size of chunks used to hash files
+HASH_BUFFER_SIZE = 1024 * 1024
+# Width of gradient grid, hash has HASH_SIZE ** 2 bits
+HASH_SIZE = 8
+
+
+class DuplicateGroup(NamedTuple):
+    """
+    Indices of pages that look same. First index is first occurrence
+    of page, rest of them are duplicates.
+    """
+
+    indices: List[int]
+    # If set, all pages have same source data, otherwise they only
+    # look alike
+    exact: bool
+
+    @property
+    def duplicates(self) -> List[int]:
+        return self.indices[1:]
+
+
+def content_hash(image: ComicsImage) -> str:
+    """
+    Hashes source data of image.
+
+    :param image: image to hash.
+    :return: hex digest of SHA-256 hash.
+    """
+    digest = hashlib.sha256()
+    with profiling.stage("hash", str(image.path)) as stage:
+        with image.open_source() as source:
+            for chunk in iter(lambda: source.read(HASH_BUFFER_SIZE), b""):
+                digest.update(chunk)
+
+        if stage.enabled:
+            stage.add_read(image.stored_size)
+
+    return digest.hexdigest()
+
+
+def difference_hash(image: ComicsImage) -> int:
+    """
+    Makes perceptual hash of image, that stays nearly same when image is
+    re-compressed, resized or slightly changed. Each bit tells if pixel of
+    tiny grayscale copy is brighter than its right neighbour.
+
+    :param image: image to hash.
+    :return: hash with HASH_SIZE ** 2 bits.
+    """
+    with profiling.stage("hash", str(image.path)):
+        with image.open() as img:
+            img.draft("L", (HASH_SIZE + 1, HASH_SIZE))
+            small: Image.Image = img.convert("L").resize(
+                (HASH_SIZE + 1, HASH_SIZE), Image.BOX
+            )
+
+    pixels: Sequence[int] = list(small.getdata())
+    value: int = 0
+    for row in range(HASH_SIZE):
+        for column in range(HASH_SIZE):
+            left: int = pixels[row * (HASH_SIZE + 1) + column]
+            value = (value << 1) | (left > pixels[
+                row * (HASH_SIZE + 1) + column + 1
+            ])
+
+    return value
+
+
+def hamming_distance(first: int, second: int) -> int:
+    """
+    Counts bits that differ in two hashes.
+
+    :param first: first hash.
+    :param second: second hash.
+    :return: amount of different bits.
+    """
+    return bin(first ^ second).count("1")
+
+
+def first_occurrences(images: Sequence[ComicsImage]) -> List[int]:
+    """
+    Finds for each image index of first image with same source data.
+
+    :param images: images to check.
+    :return: list where every image index is mapped to index of its
+        first occurrence, which is index itself for unique images.
+    """
+    first_index_of_hash: Dict[str, int] = {}
+    first_indices: List[int] = []
+    for index, image in enumerate(images):
+        first_indices.append(
+            first_index_of_hash.setdefault(content_hash(image), index)
+        )
+
+    return first_indices
+
+
+def find_duplicates(
+    images: Sequence[ComicsImage], near_duplicates: bool = False,
+    max_distance: int = 4
+) -> List[DuplicateGroup]:
+    """
+    Groups images with same source data and, if requested, images that
+    look nearly same.
+
+    :param images: images to check.
+    :param near_duplicates: if set, perceptual hashes of images are compared
+        to find re-compressed or resized copies of pages.
+    :param max_distance: how many bits of perceptual hashes may differ for
+        images to be considered near duplicates.
+    :return: groups of duplicated images in order of their first
+        occurrences.
+    """
+    groups: Dict[int, List[int]] = {}
+    for index, first_index in enumerate(first_occurrences(images)):
+        groups.setdefault(first_index, []).append(index)
+
+    duplicate_groups: List[DuplicateGroup] = [
+        DuplicateGroup(indices, True)
+        for indices in groups.values() if len(indices) > 1
+    ]
+    if not near_duplicates:
+        return duplicate_groups
+
+    # Only one image of every exact group is compared
+    hashes: List[Optional[int]] = [None] * len(images)
+    for first_index in groups:
+        try:
+            hashes[first_index] = difference_hash(images[first_index])
+
+        except OSError:
+            continue
+
+    similar: Dict[int, List[int]] = {}
+    grouped: set = set()
+    first_indices: List[int] = sorted(groups)
+    for position, first_index in enumerate(first_indices):
+        if first_index in grouped or hashes[first_index] is None:
+            continue
+
+        for other_index in first_indices[position + 1:]:
+            if (
+                other_index not in grouped
+                and hashes[other_index] is not None
+                and hamming_distance(
+                    hashes[first_index], hashes[other_index]
+                ) <= max_distance
+            ):
+                similar.setdefault(first_index, [first_index]).append(
+                    other_index
+                )
+                grouped.add(other_index)
+
+    near_groups: List[DuplicateGroup] = [
+        DuplicateGroup(
+            sorted(
+                index for first_index in indices
+                for index in groups[first_index]
+            ),
+            False
+        )
+        for indices in similar.values()
+    ]
+    exact_groups: List[DuplicateGroup] = [
+        group for group in duplicate_groups
+        if group.indices[0] not in similar and group.indices[0] not in grouped
+    ]
+
+    return sorted(
+        exact_groups + near_groups, key=lambda group: group.indices[0]
+    )
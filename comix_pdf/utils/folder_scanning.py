@@ -0,0 +1,247 @@
+"""
+Functions for finding images inside of folders.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import count
+from pathlib import Path
+from typing import (
+    Callable, Iterable, List, Optional, Tuple, TypeVar, TYPE_CHECKING
+)
+
+from PIL import UnidentifiedImageError
+
+from comix_pdf.types.events import (
+    CancellationToken, Event, EventCallback, FILE_SCANNED
+)
+from comix_pdf.types.image import ComicsImage
+
+if TYPE_CHECKING:
+    from comix_pdf.cache.probe_cache import ProbeCache
+
+T = TypeVar("T")
+
+
+def list_files(folder: Path) -> List[Path]:
+    """
+    Lists files inside of folder in order they are stored in directory.
+    Uses file types cached by os.scandir instead of requesting them
+    for every file.
+
+    :param folder: folder to list.
+    :return: list of files paths.
+    """
+    with os.scandir(folder) as entries:
+        return [Path(entry.path) for entry in entries if entry.is_file()]
+
+
+def list_files_with_stats(folder: Path) -> List[Tuple[Path, os.stat_result]]:
+    """
+    Lists files inside of folder together with their stats. Files are
+    stat'ed one by one, so scanning of images stats files in its threads
+    instead.
+
+    :param folder: folder to list.
+    :return: list of files paths and stats, without files that were
+        removed while folder was listed.
+    """
+    files: List[Tuple[Path, os.stat_result]] = []
+    for path in list_files(folder):
+        try:
+            files.append((path, path.stat()))
+
+        except FileNotFoundError:
+            continue
+
+    return files
+
+
+def probe_image(
+    path: Path, verify: bool = False, stat: Optional[os.stat_result] = None,
+    raise_io_errors: bool = False
+) -> Optional[ComicsImage]:
+    """
+    Reads image header.
+
+    :param path: path to file.
+    :param verify: if set, fully checks image.
+    :param stat: already known stat of file used for sort keys.
+    :param raise_io_errors: if set, errors of file system, like EIO or
+        ESTALE on network file systems, are raised instead of treating file
+        as broken.
+    :return: ComicsImage or None if file isn't image or is broken.
+    :raises OSError: if reading file failed and raise_io_errors is set.
+    """
+    try:
+        image: ComicsImage = ComicsImage(path, stat=stat)
+
+        if verify:
+            image.verify()
+
+    except (UnidentifiedImageError, OSError, SyntaxError) as error:
+        # Errors of Pillow about contents of file have no errno
+        if (
+            raise_io_errors and isinstance(error, OSError)
+            and error.errno is not None
+        ):
+            raise
+
+        return None
+
+    return image
+
+
+def probe_images(
+    paths: Iterable[Path], workers: int = 1, verify: bool = False,
+    on_probed: Optional[Callable[[Path], None]] = None,
+    cancellation_token: Optional[CancellationToken] = None
+) -> List[ComicsImage]:
+    """
+    Reads headers of files, possibly in multiple threads, which helps
+    a lot when files are stored on high latency file systems.
+
+    :param paths: paths of files.
+    :param workers: how many threads are used to read headers.
+    :param verify: if set, fully checks images.
+    :param on_probed: called with path of every probed file.
+    :param cancellation_token: token that can stop probing.
+    :return: list of images in same order as paths, without files that
+        aren't images.
+    :raises OperationCancelled: if probing was cancelled.
+    """
+    return [
+        image for image in _map_files(
+            partial(probe_image, verify=verify), list(paths), workers,
+            on_probed, cancellation_token
+        )
+        if image is not None
+    ]
+
+
+def _map_files(
+    function: Callable[[Path], T], paths: List[Path], workers: int = 1,
+    on_probed: Optional[Callable[[Path], None]] = None,
+    cancellation_token: Optional[CancellationToken] = None
+) -> List[T]:
+    def run(path: Path) -> T:
+        if cancellation_token is not None:
+            cancellation_token.raise_if_cancelled()
+
+        result: T = function(path)
+        if on_probed is not None:
+            on_probed(path)
+
+        return result
+
+    if workers <= 1:
+        return [run(path) for path in paths]
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(run, paths))
+
+
+def scan_folder(
+    folder: Path, workers: int = 1, verify: bool = False,
+    probe_cache: Optional["ProbeCache"] = None,
+    on_event: Optional[EventCallback] = None,
+    cancellation_token: Optional[CancellationToken] = None
+) -> List[ComicsImage]:
+    """
+    Finds all images inside of folder.
+    Stat of every file is requested by worker thread that reads its header,
+    so on network file systems requests of many files are waited for at
+    once. Stats are reused for sort keys of images.
+
+    :param folder: folder with images.
+    :param workers: how many threads are used to read headers.
+    :param verify: if set, fully checks images and skips broken ones.
+    :param probe_cache: if set, files that weren't changed since previous
+        scan aren't opened.
+    :param on_event: called after every file is scanned, possibly from
+        worker threads.
+    :param cancellation_token: token that can stop scanning.
+    :return: list of images in order they are stored in directory.
+    :raises OperationCancelled: if scanning was cancelled.
+    """
+    paths: List[Path] = list_files(folder)
+    scanned_counter = count()
+
+    def on_probed(path: Path) -> None:
+        if on_event is not None:
+            on_event(Event(
+                FILE_SCANNED, next(scanned_counter), len(paths), path.name
+            ))
+
+    if probe_cache is None:
+        return [
+            image for image in _map_files(
+                partial(probe_image, verify=verify), paths, workers,
+                on_probed, cancellation_token
+            )
+            if image is not None
+        ]
+
+    cached = probe_cache.load_folder(folder)
+
+    def scan(path: Path) -> Tuple[
+        Optional[os.stat_result], Optional[ComicsImage], bool
+    ]:
+        # Returns stat, image and whether cached header was used. Stat is
+        # None if file couldn't be read and nothing is cached about it
+        try:
+            stat: os.stat_result = path.stat()
+
+        except OSError:
+            # File was removed after folder was listed
+            return None, None, False
+
+        result = cached.get(path.name)
+        if (
+            result is not None and result.matches(stat)
+            and (result.header is None or result.verified or not verify)
+        ):
+            if result.header is None:
+                return stat, None, True
+
+            return stat, ComicsImage(path, result.header, stat), True
+
+        try:
+            image: Optional[ComicsImage] = probe_image(
+                path, verify, stat, raise_io_errors=True
+            )
+
+        except OSError:
+            # Failure might be temporary, so it isn't cached and file is
+            # probed again on next scan
+            return None, None, False
+
+        return stat, image, False
+
+    scanned = _map_files(
+        scan, paths, workers, on_probed, cancellation_token
+    )
+    images: List[ComicsImage] = []
+    for path, (stat, image, from_cache) in zip(paths, scanned):
+        if stat is None:
+            probe_cache.misses += 1
+            continue
+
+        if from_cache:
+            probe_cache.hits += 1
+
+        else:
+            probe_cache.misses += 1
+            probe_cache.store(
+                path, stat, image.header if image is not None else None,
+                verify
+            )
+
+        if image is not None:
+            images.append(image)
+
+    probe_cache.evict_missing(folder, [path.name for path in paths])
+    probe_cache.commit()
+
+    return images
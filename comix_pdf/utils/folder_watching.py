@@ -0,0 +1,276 @@
+"""
+Contains FolderWatcher class that reports files which appear in folder.
+On Linux folder is watched with inotify, on other systems and when inotify
+isn't available folder is polled.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from stat import S_ISREG
+from typing import Dict, List, Optional, Set, Tuple
+
+from comix_pdf.types.sort_keys import natural_sort_key
+# Imported as module, because folder_scanning imports comix_pdf.types that
+# imports this module
+from . import folder_scanning
+
+# Flags of inotify from <sys/inotify.h>
+IN_MODIFY = 0x2
+IN_CLOSE_WRITE = 0x8
+IN_MOVED_FROM = 0x40
+IN_MOVED_TO = 0x80
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_Q_OVERFLOW = 0x4000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = (
+    IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE
+    | IN_DELETE
+)
+# wd, mask, cookie and length of name of struct inotify_event
+INOTIFY_EVENT = struct.Struct("iIII")
+
+# Size and modification time in nanoseconds identify version of file
+FileSignature = Tuple[int, int]
+
+
+def signature_of(stat: os.stat_result) -> FileSignature:
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _start_inotify(folder: Path) -> Optional[int]:
+    """
+    Starts watching folder with inotify.
+
+    :param folder: folder to watch.
+    :return: file descriptor of inotify instance or None if inotify isn't
+        available.
+    """
+    if not sys.platform.startswith("linux"):
+        return None
+
+    try:
+        libc = ctypes.CDLL(
+            ctypes.util.find_library("c") or "libc.so.6", use_errno=True
+        )
+        inotify_init1 = libc.inotify_init1
+        inotify_add_watch = libc.inotify_add_watch
+
+    except (OSError, AttributeError):
+        return None
+
+    inotify_add_watch.argtypes = (
+        ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32
+    )
+    fd: int = inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+    if fd < 0:
+        return None
+
+    if inotify_add_watch(fd, os.fsencode(folder), WATCH_MASK) < 0:
+        os.close(fd)
+        return None
+
+    return fd
+
+
+class FolderWatcher:
+    """
+    Watches folder for files that were added or changed. File is reported
+    only after its size and modification time stay same for settle_time
+    seconds, so files that are still being written aren't picked up.
+    """
+
+    def __init__(
+        self, folder: Path, settle_time: float = 2.0,
+        poll_interval: float = 1.0, use_inotify: bool = True,
+        report_existing: bool = False
+    ):
+        """
+        Starts watching folder.
+
+        :param folder: folder to watch.
+        :param settle_time: how many seconds file must stay unchanged to be
+            reported.
+        :param poll_interval: how often folder is checked when inotify
+            isn't available, in seconds.
+        :param use_inotify: if not set, folder is always polled.
+        :param report_existing: if set, files that are in folder when
+            watching starts are reported too, otherwise they are reported
+            only after they change.
+        """
+        self.folder: Path = folder
+        self.settle_time: float = settle_time
+        self.poll_interval: float = poll_interval
+
+        # Versions of files that were reported
+        self._reported: Dict[str, FileSignature] = {}
+        # Files waiting to settle and when they were seen changing last time
+        self._pending: Dict[str, Tuple[FileSignature, float]] = {}
+
+        # Watching starts before folder is listed, so no file is missed
+        self._inotify_fd: Optional[int] = None
+        if use_inotify:
+            self._inotify_fd = _start_inotify(folder)
+
+        now: float = time.monotonic()
+        for path, stat in folder_scanning.list_files_with_stats(folder):
+            if not report_existing:
+                self._reported[path.name] = signature_of(stat)
+                continue
+
+            # Files that weren't modified for a while are settled already
+            unchanged_for: float = max(0.0, time.time() - stat.st_mtime)
+            self._pending[path.name] = (
+                signature_of(stat), now - min(unchanged_for, settle_time)
+            )
+
+    @property
+    def uses_inotify(self) -> bool:
+        return self._inotify_fd is not None
+
+    def wait_for_files(self, timeout: Optional[float] = None) -> List[Path]:
+        """
+        Waits until some added or changed files settle.
+
+        :param timeout: how many seconds to wait at most. By default waits
+            until any file settles.
+        :return: paths of settled files ordered by names with numbers
+            compared by value, empty list if timeout has passed.
+        """
+        deadline: Optional[float] = None
+        if timeout is not None:
+            deadline = time.monotonic() + timeout
+
+        while True:
+            now: float = time.monotonic()
+            settled: List[Path] = self._take_settled(now)
+            if settled:
+                return settled
+
+            wait: float = self.poll_interval
+            if self._pending:
+                first_change: float = min(
+                    changed_at for _, changed_at in self._pending.values()
+                )
+                wait = min(
+                    wait, max(0.0, first_change + self.settle_time - now)
+                )
+
+            if deadline is not None:
+                if now >= deadline:
+                    return []
+
+                wait = min(wait, deadline - now)
+
+            self._collect_changes(wait)
+
+    def _collect_changes(self, wait: float) -> None:
+        if self._inotify_fd is None:
+            time.sleep(wait)
+            changed: Optional[Set[str]] = None
+
+        else:
+            changed = self._read_inotify(wait)
+
+        if changed is None:
+            # Whole folder is compared when polling or when events were lost
+            stats: Dict[str, os.stat_result] = {
+                path.name: stat
+                for path, stat in folder_scanning.list_files_with_stats(
+                    self.folder
+                )
+            }
+            for name in set(self._reported) - set(stats):
+                del self._reported[name]
+
+        else:
+            stats = {}
+            for name in changed | set(self._pending):
+                try:
+                    stat = os.stat(self.folder / name)
+
+                except OSError:
+                    self._reported.pop(name, None)
+                    continue
+
+                if S_ISREG(stat.st_mode):
+                    stats[name] = stat
+
+        now: float = time.monotonic()
+        for name in set(self._pending) - set(stats):
+            del self._pending[name]
+
+        for name, stat in stats.items():
+            signature: FileSignature = signature_of(stat)
+            if self._reported.get(name) == signature:
+                self._pending.pop(name, None)
+
+            elif (
+                name not in self._pending
+                or self._pending[name][0] != signature
+            ):
+                self._pending[name] = (signature, now)
+
+    def _read_inotify(self, wait: float) -> Optional[Set[str]]:
+        # Returns names of changed files or None if events were lost
+        readable, _, _ = select.select([self._inotify_fd], [], [], wait)
+        changed: Set[str] = set()
+        if not readable:
+            return changed
+
+        try:
+            data: bytes = os.read(self._inotify_fd, 64 * 1024)
+
+        except BlockingIOError:
+            return changed
+
+        offset: int = 0
+        while offset < len(data):
+            _, mask, _, length = INOTIFY_EVENT.unpack_from(data, offset)
+            offset += INOTIFY_EVENT.size
+            if mask & IN_Q_OVERFLOW:
+                return None
+
+            name: bytes = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            if name:
+                changed.add(os.fsdecode(name))
+
+        return changed
+
+    def _take_settled(self, now: float) -> List[Path]:
+        settled: List[str] = [
+            name for name, (_, changed_at) in self._pending.items()
+            if now - changed_at >= self.settle_time
+        ]
+        for name in settled:
+            signature, _ = self._pending.pop(name)
+            self._reported[name] = signature
+
+        return [
+            self.folder / name
+            for name in sorted(settled, key=natural_sort_key)
+        ]
+
+    def close(self) -> None:
+        """
+        Stops watching folder.
+
+        :return: nothing.
+        """
+        if self._inotify_fd is not None:
+            os.close(self._inotify_fd)
+            self._inotify_fd = None
+
+    def __enter__(self) -> "FolderWatcher":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
@@ -1,13 +1,39 @@
 """
 Some functions for sorting images inside of Comics list.
+Keys are taken from index that is filled in while images are loaded,
+so sorting doesn't access files.
 """
 
+from typing import Any, Callable, Dict, Tuple
+
 from comix_pdf.types.image import ComicsImage
 
 
 def order_image_by_modification_timestamp(image: ComicsImage) -> float:
-    return image.modification_timestamp
+    return image.sort_keys.modification_timestamp
 
 
 def order_image_by_filename(image: ComicsImage) -> str:
     return image.path.name
+
+
+def order_image_by_natural_filename(image: ComicsImage) -> Tuple:
+    return image.sort_keys.natural_name
+
+
+def order_image_by_size(image: ComicsImage) -> int:
+    return image.sort_keys.size
+
+
+def order_image_by_capture_timestamp(image: ComicsImage) -> Tuple:
+    return image.sort_keys.capture_order
+
+
+# Names of sorting orders and functions that make keys for them
+SORTING_ORDERS: Dict[str, Callable[[ComicsImage], Any]] = {
+    "name": order_image_by_filename,
+    "natural_name": order_image_by_natural_filename,
+    "modification_timestamp": order_image_by_modification_timestamp,
+    "size": order_image_by_size,
+    "capture_timestamp": order_image_by_capture_timestamp,
+}
@@ -0,0 +1,33 @@
+"""
+Functions for measuring memory used while rendering.
+"""
+
+import sys
+from typing import Optional
+
+try:
+    import resource
+
+except ImportError:
+    # Not available on Windows
+    resource = None
+
+
+def peak_rss(children: bool = False) -> Optional[int]:
+    """
+    Peak resident memory of current process or of its largest child.
+
+    :param children: if set, measures largest of finished child processes,
+        like workers of process pools, instead of current process.
+    :return: amount of bytes or None if it can't be measured.
+    """
+    if resource is None:
+        return None
+
+    who: int = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    max_rss: int = resource.getrusage(who).ru_maxrss
+    # macOS reports bytes, other systems report kilobytes
+    if sys.platform == "darwin":
+        return max_rss
+
+    return max_rss * 1024
@@ -0,0 +1,226 @@
+"""
+Lightweight instrumentation of rendering pipeline.
+Stages are measured only while profiler is enabled, otherwise measuring
+returns shared object that does nothing.
+"""
+
+import json
+import time
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+
+class StageRecord(NamedTuple):
+    """
+    Measurement of one stage of pipeline.
+    """
+
+    stage: str
+    page: Optional[str]
+    wall_time: float
+    cpu_time: float
+    bytes_read: int
+    bytes_written: int
+
+
+class Profiler:
+    """
+    Collects measurements of stages from any thread.
+    """
+
+    def __init__(self):
+        self.records: List[StageRecord] = []
+        self._lock = Lock()
+
+    def record(self, record: StageRecord) -> None:
+        with self._lock:
+            self.records.append(record)
+
+    def merge(self, records: Iterable[StageRecord]) -> None:
+        """
+        Adds measurements made in other process.
+
+        :param records: measurements.
+        :return: nothing.
+        """
+        with self._lock:
+            self.records.extend(records)
+
+    def stages_totals(self) -> Dict[str, dict]:
+        """
+        Sums measurements of every stage.
+
+        :return: dictionary of stages names and their totals.
+        """
+        return _sum_records(self.records, key=lambda record: record.stage)
+
+    def pages_totals(self) -> Dict[str, Dict[str, dict]]:
+        """
+        Sums measurements of every stage of every page.
+
+        :return: dictionary of pages and totals of their stages.
+        """
+        pages: Dict[str, List[StageRecord]] = {}
+        for record in self.records:
+            if record.page is not None:
+                pages.setdefault(record.page, []).append(record)
+
+        return {
+            page: _sum_records(records, key=lambda record: record.stage)
+            for page, records in pages.items()
+        }
+
+    def slowest_pages(self, count: int = 5) -> List[Tuple[str, float]]:
+        """
+        Finds pages that took most of wall time.
+
+        :param count: how many pages to return.
+        :return: list of pages and their total wall time.
+        """
+        wall_times: Dict[str, float] = {}
+        for record in self.records:
+            if record.page is not None:
+                wall_times[record.page] = (
+                    wall_times.get(record.page, 0) + record.wall_time
+                )
+
+        return sorted(
+            wall_times.items(), key=lambda item: item[1], reverse=True
+        )[:count]
+
+    def report(self) -> dict:
+        return {
+            "stages": self.stages_totals(),
+            "pages": self.pages_totals(),
+            "slowest_pages": [
+                {"page": page, "wall_time": wall_time}
+                for page, wall_time in self.slowest_pages()
+            ],
+        }
+
+    def save(self, path: Path) -> None:
+        """
+        Writes report in JSON format.
+
+        :param path: where to save report.
+        :return: nothing.
+        """
+        with path.open("w") as report_file:
+            json.dump(self.report(), report_file, indent=2)
+
+
+def _sum_records(records: Iterable[StageRecord], key) -> Dict[str, dict]:
+    totals: Dict[str, dict] = {}
+    for record in records:
+        total = totals.setdefault(key(record), {
+            "count": 0, "wall_time": 0.0, "cpu_time": 0.0,
+            "bytes_read": 0, "bytes_written": 0,
+        })
+        total["count"] += 1
+        total["wall_time"] += record.wall_time
+        total["cpu_time"] += record.cpu_time
+        total["bytes_read"] += record.bytes_read
+        total["bytes_written"] += record.bytes_written
+
+    return totals
+
+
+class Stage:
+    """
+    Context manager that measures wall and CPU time of one stage.
+    """
+
+    enabled = True
+
+    def __init__(self, profiler: Profiler, name: str, page: Optional[str]):
+        self.profiler: Profiler = profiler
+        self.name: str = name
+        self.page: Optional[str] = page
+        self.bytes_read: int = 0
+        self.bytes_written: int = 0
+
+    def add_read(self, amount: int) -> None:
+        self.bytes_read += amount
+
+    def add_written(self, amount: int) -> None:
+        self.bytes_written += amount
+
+    def __enter__(self) -> "Stage":
+        self._started_wall: float = time.perf_counter()
+        # Time of current thread, so stages in thread pools don't overlap
+        self._started_cpu: float = time.thread_time()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.profiler.record(StageRecord(
+            self.name, self.page,
+            time.perf_counter() - self._started_wall,
+            time.thread_time() - self._started_cpu,
+            self.bytes_read, self.bytes_written
+        ))
+
+
+class NullStage:
+    """
+    Stage that measures nothing, used while profiling is disabled.
+    """
+
+    enabled = False
+
+    def add_read(self, amount: int) -> None:
+        pass
+
+    def add_written(self, amount: int) -> None:
+        pass
+
+    def __enter__(self) -> "NullStage":
+        return self
+
+    def __exit__(self, *args) -> None:
+        pass
+
+
+_NULL_STAGE = NullStage()
+_active_profiler: Optional[Profiler] = None
+
+
+def enable(profiler: Optional[Profiler] = None) -> Profiler:
+    """
+    Starts collecting measurements.
+
+    :param profiler: profiler that collects measurements. By default new
+        one is created.
+    :return: active profiler.
+    """
+    global _active_profiler
+    _active_profiler = profiler or Profiler()
+    return _active_profiler
+
+
+def disable() -> None:
+    """
+    Stops collecting measurements.
+
+    :return: nothing.
+    """
+    global _active_profiler
+    _active_profiler = None
+
+
+def active_profiler() -> Optional[Profiler]:
+    return _active_profiler
+
+
+def stage(name: str, page: Optional[str] = None):
+    """
+    Measures stage of pipeline if profiling is enabled.
+
+    :param name: name of stage, like "decode" or "encode".
+    :param page: page that is processed, if stage is related to one page.
+    :return: context manager of stage.
+    """
+    if _active_profiler is None:
+        return _NULL_STAGE
+
+    return Stage(_active_profiler, name, page)
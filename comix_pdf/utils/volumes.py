@@ -0,0 +1,96 @@
+"""
+Functions for splitting pages of comics into volumes that are rendered
+into separate files.
+"""
+
+from itertools import groupby
+from typing import List, Optional, Sequence
+
+from comix_pdf.types.image import ComicsImage
+
+
+def split_by_folder(
+    images: Sequence[ComicsImage]
+) -> List[List[ComicsImage]]:
+    """
+    Splits pages where folder of images changes, so every chapter stored in
+    its own folder or archive becomes a volume.
+
+    :param images: images of pages in order of rendering.
+    :return: lists of images of every volume.
+    """
+    return [
+        list(volume)
+        for _, volume in groupby(images, key=lambda image: image.path.parent)
+    ]
+
+
+def split_by_limits(
+    images: Sequence[ComicsImage], max_pages: Optional[int] = None,
+    max_size: Optional[int] = None
+) -> List[List[ComicsImage]]:
+    """
+    Splits pages into volumes that have at most max_pages pages and
+    estimated size of at most max_size bytes. Size of page is estimated
+    by size of its source file. Page bigger than max_size gets its own
+    volume.
+
+    :param images: images of pages in order of rendering.
+    :param max_pages: maximum amount of pages in volume.
+    :param max_size: maximum estimated size of volume in bytes.
+    :return: lists of images of every volume.
+    """
+    volumes: List[List[ComicsImage]] = []
+    volume: List[ComicsImage] = []
+    volume_size: int = 0
+
+    for image in images:
+        page_size: int = image.stored_size if max_size is not None else 0
+        if volume and (
+            (max_pages is not None and len(volume) >= max_pages)
+            or (max_size is not None and volume_size + page_size > max_size)
+        ):
+            volumes.append(volume)
+            volume = []
+            volume_size = 0
+
+        volume.append(image)
+        volume_size += page_size
+
+    if volume:
+        volumes.append(volume)
+
+    return volumes
+
+
+def split_volumes(
+    images: Sequence[ComicsImage], max_pages: Optional[int] = None,
+    max_size: Optional[int] = None, by_folder: bool = False
+) -> List[List[ComicsImage]]:
+    """
+    Splits pages into volumes. Folders are split first, then volumes that
+    are over limits are split again.
+
+    :param images: images of pages in order of rendering.
+    :param max_pages: maximum amount of pages in volume.
+    :param max_size: maximum estimated size of volume in bytes.
+    :param by_folder: if set, pages from different folders never share
+        a volume.
+    :return: lists of images of every volume.
+    :raises ValueError: if limits aren't positive.
+    """
+    if max_pages is not None and max_pages < 1:
+        raise ValueError("Volume must have at least one page")
+
+    if max_size is not None and max_size < 1:
+        raise ValueError("Volume size must be positive")
+
+    chapters: List[List[ComicsImage]] = (
+        split_by_folder(images) if by_folder else [list(images)]
+    )
+
+    return [
+        volume
+        for chapter in chapters
+        for volume in split_by_limits(chapter, max_pages, max_size)
+    ]
@@ -0,0 +1,237 @@
+"""
+Helpers that make images for tests and read pages of rendered pdf files.
+"""
+
+import struct
+import zlib
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from PIL import Image, PdfParser
+
+# Modes of Pillow that unpack samples of pdf images by their bits per
+# component, with values of smaller samples scaled to 0-255
+GRAY_RAW_MODES = {1: "1", 2: "L;2", 4: "L;4", 8: "L"}
+# Columns and rows that every pass of Adam7 interlacing starts at and steps
+ADAM7_PASSES = (
+    (0, 0, 8, 8), (4, 0, 8, 8), (0, 4, 4, 8), (2, 0, 4, 4),
+    (0, 2, 2, 4), (1, 0, 2, 2), (0, 1, 1, 2),
+)
+
+
+class PdfPage(NamedTuple):
+    """
+    Page of pdf file with its only image.
+    """
+
+    media_box: List[float]
+    image_size: Tuple[int, int]
+    color_space: str
+    image_data: bytes
+    filter: str = "DCTDecode"
+    decode_parms: Optional[Dict[str, int]] = None
+    bits_per_component: int = 8
+
+
+def make_image(
+    folder: Path, name: str, size: Tuple[int, int] = (60, 80),
+    mode: str = "RGB", color: Any = 120
+) -> Path:
+    """
+    Saves image filled with one color.
+
+    :param folder: where image is saved.
+    :param name: name of file, its extension sets format of image.
+    :param size: size of image in pixels.
+    :param mode: Pillow mode of image.
+    :param color: color of image pixels.
+    :return: path to image.
+    """
+    path: Path = folder / name
+    Image.new(mode, size, color).save(path)
+    return path
+
+
+def read_pdf_pages(path: Path) -> List[PdfPage]:
+    """
+    Reads pages of pdf file in order of its pages tree.
+
+    :param path: path to pdf file.
+    :return: list of pages.
+    """
+    parser = PdfParser.PdfParser(str(path))
+    try:
+        pages: List[PdfPage] = []
+        for page_ref in parser.pages:
+            page = parser.read_indirect(page_ref)
+            resources = _resolve(parser, page[b"Resources"])
+            x_objects = _resolve(parser, resources[b"XObject"])
+            image_ref, = x_objects.values()
+            image = parser.read_indirect(image_ref)
+            decode_parms = image.dictionary.get(b"DecodeParms")
+            pages.append(PdfPage(
+                list(page[b"MediaBox"]),
+                (image.dictionary[b"Width"], image.dictionary[b"Height"]),
+                _name(image.dictionary[b"ColorSpace"]), bytes(image.buf),
+                _name(image.dictionary[b"Filter"]),
+                {
+                    _name(PdfParser.PdfName(key)): value
+                    for key, value in decode_parms.items()
+                } if decode_parms is not None else None,
+                image.dictionary[b"BitsPerComponent"]
+            ))
+
+        return pages
+
+    finally:
+        parser.close()
+
+
+def decode_pdf_image(page: PdfPage) -> Image.Image:
+    """
+    Decodes image of pdf page like pdf reader does, undoing PNG predictors
+    of Flate compressed images without help of PNG decoder.
+
+    :param page: page of pdf file.
+    :return: RGB or grayscale image.
+    """
+    if page.filter == "DCTDecode":
+        return Image.open(BytesIO(page.image_data))
+
+    assert page.filter == "FlateDecode"
+    colors: int = 1 if page.color_space == "DeviceGray" else 3
+    width, height = page.image_size
+    row_size: int = (width * colors * page.bits_per_component + 7) // 8
+    samples: bytes = zlib.decompress(page.image_data)
+
+    if page.decode_parms is not None:
+        assert page.decode_parms == {
+            "Predictor": 15, "Colors": colors,
+            "BitsPerComponent": page.bits_per_component, "Columns": width,
+        }
+        pixel_size: int = max(1, colors * page.bits_per_component // 8)
+        samples = _undo_png_filters(samples, row_size, height, pixel_size)
+
+    assert len(samples) == row_size * height
+    if colors == 3:
+        assert page.bits_per_component == 8
+        return Image.frombytes("RGB", page.image_size, samples)
+
+    raw_mode: str = GRAY_RAW_MODES[page.bits_per_component]
+    image = Image.frombytes(
+        "1" if raw_mode == "1" else "L", page.image_size, samples, "raw",
+        raw_mode
+    )
+    return image.convert("L")
+
+
+def write_png(
+    path: Path, rows: List[List[Tuple[int, ...]]], bit_depth: int = 8,
+    color_type: int = 2, interlaced: bool = False
+) -> Path:
+    """
+    Writes PNG file without Pillow, so bit depths and interlacing that
+    Pillow can't save are tested too. Rows aren't filtered.
+
+    :param path: where file is saved.
+    :param rows: rows of pixels, every pixel is tuple of samples.
+    :param bit_depth: bits of every sample, 8 or 16.
+    :param color_type: 0 for grayscale, 2 for RGB.
+    :param interlaced: if set, pixels are stored in Adam7 passes.
+    :return: path to file.
+    """
+    height: int = len(rows)
+    width: int = len(rows[0])
+    sample_format: str = ">B" if bit_depth == 8 else ">H"
+
+    def pack_rows(pass_rows: List[List[Tuple[int, ...]]]) -> bytes:
+        return b"".join(
+            b"\0" + b"".join(
+                struct.pack(sample_format, sample)
+                for pixel in row for sample in pixel
+            )
+            for row in pass_rows if row
+        )
+
+    if interlaced:
+        samples: bytes = b"".join(
+            pack_rows([
+                rows[y][first_column::column_step]
+                for y in range(first_row, height, row_step)
+            ])
+            for first_column, first_row, column_step, row_step
+            in ADAM7_PASSES
+        )
+
+    else:
+        samples = pack_rows(rows)
+
+    def chunk(chunk_type: bytes, data: bytes) -> bytes:
+        return (
+            struct.pack(">I", len(data)) + chunk_type + data
+            + struct.pack(">I", zlib.crc32(chunk_type + data))
+        )
+
+    path.write_bytes(
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(
+            ">IIBBBBB", width, height, bit_depth, color_type, 0, 0,
+            int(interlaced)
+        ))
+        + chunk(b"IDAT", zlib.compress(samples))
+        + chunk(b"IEND", b"")
+    )
+    return path
+
+
+def _undo_png_filters(
+    data: bytes, row_size: int, height: int, pixel_size: int
+) -> bytes:
+    previous_row = bytearray(row_size)
+    rows: List[bytes] = []
+    for y in range(height):
+        start: int = y * (row_size + 1)
+        filter_type: int = data[start]
+        row = bytearray(data[start + 1:start + 1 + row_size])
+        for x in range(row_size):
+            left: int = row[x - pixel_size] if x >= pixel_size else 0
+            up: int = previous_row[x]
+            up_left: int = (
+                previous_row[x - pixel_size] if x >= pixel_size else 0
+            )
+            if filter_type == 1:
+                row[x] = (row[x] + left) & 0xFF
+
+            elif filter_type == 2:
+                row[x] = (row[x] + up) & 0xFF
+
+            elif filter_type == 3:
+                row[x] = (row[x] + (left + up) // 2) & 0xFF
+
+            elif filter_type == 4:
+                estimate: int = left + up - up_left
+                distances = (
+                    abs(estimate - left), abs(estimate - up),
+                    abs(estimate - up_left)
+                )
+                nearest: int = (left, up, up_left)[
+                    distances.index(min(distances))
+                ]
+                row[x] = (row[x] + nearest) & 0xFF
+
+        rows.append(bytes(row))
+        previous_row = row
+
+    return b"".join(rows)
+
+
+def _name(value: Any) -> str:
+    return value.name.decode()
+
+
+def _resolve(parser: PdfParser.PdfParser, value: Any) -> Any:
+    if isinstance(value, PdfParser.IndirectReference):
+        return parser.read_indirect(value)
+
+    return value
@@ -0,0 +1,118 @@
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from comix_pdf import exceptions
+from comix_pdf.types import CancellationToken, Comics, ComicsImage
+from tests.helpers import PdfPage, make_image, read_pdf_pages
+
+
+@pytest.fixture
+def comics(tmp_path: Path) -> Comics:
+    make_image(tmp_path, "01.png", (20, 30))
+    make_image(tmp_path, "02.png", (21, 30))
+
+    comics = Comics.load_from_folder(tmp_path)
+    comics.sort_images("name")
+    comics.render(streaming=True)
+    return comics
+
+
+def add_pages(comics: Comics, *names: str) -> None:
+    folder: Path = comics[0].path.parent
+    for name in names:
+        comics.append(ComicsImage(
+            make_image(folder, name, (20 + len(comics), 30))
+        ))
+
+
+def image_sizes(pages: List[PdfPage]) -> List[tuple]:
+    return [page.image_size for page in pages]
+
+
+def test_only_new_pages_are_appended(comics: Comics):
+    rendered: bytes = comics.output_file_path.read_bytes()
+    add_pages(comics, "03.png", "04.png")
+
+    report = comics.render(append_to_existing=True)
+
+    assert [page.name for page in report] == ["03.png", "04.png"]
+    assert comics.output_file_path.read_bytes().startswith(rendered)
+    assert image_sizes(read_pdf_pages(comics.output_file_path)) == [
+        (20, 30), (21, 30), (22, 30), (23, 30)
+    ]
+
+
+def test_missing_file_is_rendered_fully(comics: Comics):
+    comics.output_file_path.unlink()
+
+    report = comics.render(append_to_existing=True)
+
+    assert len(report) == 2
+    assert len(read_pdf_pages(comics.output_file_path)) == 2
+
+
+def test_file_with_more_pages_than_comics_is_kept(comics: Comics):
+    rendered: bytes = comics.output_file_path.read_bytes()
+    del comics[1]
+
+    with pytest.raises(ValueError):
+        comics.render(append_to_existing=True)
+
+    assert comics.output_file_path.read_bytes() == rendered
+
+
+def test_cancelled_append_leaves_file_as_it_was(comics: Comics):
+    rendered: bytes = comics.output_file_path.read_bytes()
+    add_pages(comics, "03.png")
+    token = CancellationToken()
+    token.cancel()
+
+    with pytest.raises(exceptions.OperationCancelled):
+        comics.render(append_to_existing=True, cancellation_token=token)
+
+    assert comics.output_file_path.read_bytes() == rendered
+
+
+def test_volumes_can_not_be_appended(comics: Comics):
+    with pytest.raises(ValueError):
+        comics.render(append_to_existing=True, max_volume_pages=1)
+
+
+def test_compaction_drops_replaced_objects(comics: Comics):
+    for name in ("03.png", "04.png", "05.png"):
+        add_pages(comics, name)
+        comics.render(append_to_existing=True)
+
+    pages: List[PdfPage] = read_pdf_pages(comics.output_file_path)
+    size_before: int = comics.output_file_path.stat().st_size
+
+    saved_size: int = comics.compact_output_file()
+
+    assert saved_size > 0
+    assert comics.output_file_path.stat().st_size == size_before - saved_size
+    assert read_pdf_pages(comics.output_file_path) == pages
+    assert not comics.output_file_path.with_name(
+        f"{comics.output_file_path.name}.compacting"
+    ).exists()
+
+
+def test_compacted_file_can_be_appended_to(comics: Comics):
+    add_pages(comics, "03.png")
+    comics.render(append_to_existing=True)
+    comics.compact_output_file()
+    add_pages(comics, "04.png")
+
+    comics.render(append_to_existing=True)
+
+    assert image_sizes(read_pdf_pages(comics.output_file_path)) == [
+        (20, 30), (21, 30), (22, 30), (23, 30)
+    ]
+
+
+def test_file_without_updates_is_left_as_is(comics: Comics):
+    rendered: bytes = comics.output_file_path.read_bytes()
+
+    assert comics.compact_output_file() == 0
+    assert comics.output_file_path.read_bytes() == rendered
@@ -0,0 +1,155 @@
+import tarfile
+import zipfile
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+from comix_pdf import exceptions
+from comix_pdf.types import ArchiveImage, Comics, ComicsImage, RenderReport
+from tests.helpers import make_image, read_pdf_pages
+
+# Members of archive in order they are stored, and whether they are images
+MEMBERS = {
+    "pages/10.png": True,
+    "pages/2.jpg": True,
+    "pages/notes.txt": False,
+    "pages/.cover.png": False,
+    "__MACOSX/pages/._2.jpg": False,
+    "pages/1.png": True,
+}
+ARCHIVE_FORMATS = ["zip", "tar", "tar.gz", "tar.bz2"]
+
+
+def make_sources(folder: Path) -> Dict[str, bytes]:
+    folder.mkdir()
+    sources: Dict[str, bytes] = {}
+    for index, (name, is_image) in enumerate(MEMBERS.items()):
+        file_name: str = f"{index}{Path(name).suffix}"
+        if is_image:
+            path: Path = make_image(folder, file_name, (20 + index, 30))
+
+        else:
+            path = folder / file_name
+            path.write_bytes(b"not an image")
+
+        sources[name] = path.read_bytes()
+
+    return sources
+
+
+def make_archive(
+    path: Path, archive_format: str, sources: Dict[str, bytes]
+) -> Path:
+    source_folder: Path = path.parent / f"{path.name}.sources"
+    source_folder.mkdir()
+    if archive_format == "zip":
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+            for name, data in sources.items():
+                archive.writestr(name, data)
+
+        return path
+
+    mode: str = "w" if archive_format == "tar" else (
+        f"w:{archive_format.split('.')[1]}"
+    )
+    with tarfile.open(path, mode) as archive:
+        for name, data in sources.items():
+            member_path: Path = source_folder / name.replace("/", "_")
+            member_path.write_bytes(data)
+            archive.add(str(member_path), name)
+
+    return path
+
+
+@pytest.fixture
+def sources(tmp_path: Path) -> Dict[str, bytes]:
+    return make_sources(tmp_path / "sources")
+
+
+@pytest.fixture(params=ARCHIVE_FORMATS)
+def archive(request, tmp_path: Path, sources: Dict[str, bytes]) -> Path:
+    return make_archive(
+        tmp_path / f"comics.{request.param}", request.param, sources
+    )
+
+
+def member_names(comics: Comics) -> List[str]:
+    return [image.member.name for image in comics]
+
+
+def test_images_are_read_in_order_of_archive(
+    archive: Path, sources: Dict[str, bytes]
+):
+    comics = Comics.load_from_archive(archive)
+
+    assert member_names(comics) == [
+        "pages/10.png", "pages/2.jpg", "pages/1.png"
+    ]
+    assert all(isinstance(image, ArchiveImage) for image in comics)
+    for image in comics:
+        assert image.read_bytes() == sources[image.member.name]
+        with image.open_source() as source:
+            assert source.read() == sources[image.member.name]
+
+
+def test_natural_order_sorts_images_by_numbers(archive: Path):
+    comics = Comics.load_from_archive(archive, natural_order=True)
+
+    assert member_names(comics) == [
+        "pages/1.png", "pages/2.jpg", "pages/10.png"
+    ]
+
+
+def test_archive_renders_like_folder(tmp_path: Path, archive: Path):
+    archive_comics = Comics.load_from_archive(archive, natural_order=True)
+    source_files: List[Path] = [
+        tmp_path / "sources" / f"{index}{Path(name).suffix}"
+        for index, name in enumerate(MEMBERS)
+        if name in member_names(archive_comics)
+    ]
+    folder_comics = Comics(
+        tmp_path, "folder.pdf", map(ComicsImage, source_files)
+    )
+    folder_comics.reverse()
+    folder_comics.render(streaming=True)
+
+    archive_comics.render(workers=2)
+
+    assert read_pdf_pages(archive_comics.output_file_path) == read_pdf_pages(
+        folder_comics.output_file_path
+    )
+
+
+def test_volumes_are_split_by_archives(
+    tmp_path: Path, sources: Dict[str, bytes]
+):
+    first: Path = make_archive(tmp_path / "first.cbz", "zip", sources)
+    second: Path = make_archive(tmp_path / "second.cbt", "tar.gz", sources)
+    comics = Comics.load_from_archive(first)
+    comics.append_from_archive(second)
+
+    report: RenderReport = comics.render(split_by_folder=True)
+
+    assert [path.name for path in report.volumes] == [
+        "first - Vol 01.pdf", "first - Vol 02.pdf"
+    ]
+    assert [
+        len(read_pdf_pages(path)) for path in report.volumes
+    ] == [3, 3]
+
+
+def test_file_that_is_not_archive_is_rejected(tmp_path: Path):
+    path: Path = make_image(tmp_path, "page.png")
+
+    with pytest.raises(exceptions.NotAnArchive):
+        Comics.load_from_archive(path)
+
+
+def test_archive_without_images_is_rejected(tmp_path: Path):
+    archive: Path = make_archive(
+        tmp_path / "empty.zip", "zip", {"notes.txt": b"not an image"}
+    )
+
+    with pytest.raises(exceptions.ArchiveHasNoImages):
+        Comics.load_from_archive(archive)
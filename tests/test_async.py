@@ -0,0 +1,170 @@
+import asyncio
+import threading
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+import pytest
+
+from comix_pdf import exceptions
+from comix_pdf.types import (
+    CancellationToken, Comics, ComicsImage, Event, events
+)
+from tests.helpers import make_image, read_pdf_pages
+
+PAGES = 12
+
+
+@pytest.fixture
+def folder(tmp_path: Path) -> Path:
+    folder: Path = tmp_path / "pages"
+    folder.mkdir()
+    for number in range(PAGES):
+        make_image(
+            folder, f"{number:02d}.png", (20 + number, 30), "RGB",
+            (120, 120, 120)
+        )
+
+    return folder
+
+
+@pytest.fixture
+def comics(folder: Path) -> Comics:
+    comics = Comics.load_from_folder(folder)
+    comics.sort_images("name")
+    return comics
+
+
+@pytest.fixture
+def started(monkeypatch) -> threading.Event:
+    # Pages are encoded slowly, so rendering is still running when it's
+    # cancelled
+    started = threading.Event()
+    convert_to_rgb = ComicsImage.convert_to_rgb
+
+    def slow_convert_to_rgb(image: ComicsImage, *args, **kwargs):
+        started.set()
+        time.sleep(0.05)
+        return convert_to_rgb(image, *args, **kwargs)
+
+    monkeypatch.setattr(ComicsImage, "convert_to_rgb", slow_convert_to_rgb)
+    return started
+
+
+def test_render_async_forwards_options(comics: Comics):
+    report = asyncio.run(comics.render_async(
+        resolution=150, max_dpi=75, compression="flate",
+        detect_grayscale=True
+    ))
+
+    pages = read_pdf_pages(comics.output_file_path)
+    assert len(report) == PAGES
+    assert {page.filter for page in pages} == {"FlateDecode"}
+    assert all(page.converted_to_grayscale for page in report)
+    assert pages[0].image_size == (10, 15)
+
+
+def test_load_from_folder_async(folder: Path):
+    comics: Comics = asyncio.run(Comics.load_from_folder_async(folder))
+
+    assert sorted(image.name for image in comics) == [
+        f"{number:02d}.png" for number in range(PAGES)
+    ]
+
+
+def test_render_iter_async_yields_all_events(comics: Comics):
+    async def collect_events() -> List[Event]:
+        return [
+            event async for event in comics.render_iter_async(quality=50)
+        ]
+
+    rendering_events: List[Event] = asyncio.run(collect_events())
+
+    assert rendering_events[-1].kind == events.FINISHED
+    assert [
+        event.index for event in rendering_events
+        if event.kind == events.PAGE_STARTED
+    ] == list(range(PAGES))
+    assert len(read_pdf_pages(comics.output_file_path)) == PAGES
+
+
+def test_cancelled_task_stops_rendering_before_it_is_cancelled(
+    comics: Comics, started: threading.Event
+):
+    token = CancellationToken()
+
+    async def cancel_rendering() -> None:
+        rendering = asyncio.ensure_future(comics.render_async(
+            cancellation_token=token
+        ))
+        while not started.is_set():
+            await asyncio.sleep(0.01)
+
+        rendering.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await rendering
+
+    asyncio.run(cancel_rendering())
+
+    # Task is cancelled only after rendering removed its partial file
+    assert token.cancelled
+    assert not comics.output_file_path.exists()
+
+
+def test_cancelled_token_raises_operation_cancelled(comics: Comics):
+    token = CancellationToken()
+    token.cancel()
+
+    with pytest.raises(exceptions.OperationCancelled):
+        asyncio.run(comics.render_async(cancellation_token=token))
+
+
+def test_stopping_iteration_cancels_rendering(
+    comics: Comics, started: threading.Event
+):
+    token = CancellationToken()
+
+    async def stop_early() -> List[str]:
+        rendering_events = comics.render_iter_async(
+            cancellation_token=token, quality=50
+        )
+        kinds: List[str] = []
+        async for event in rendering_events:
+            kinds.append(event.kind)
+            break
+
+        await rendering_events.aclose()
+        return kinds
+
+    assert asyncio.run(stop_early()) == [events.PAGE_STARTED]
+    assert token.cancelled
+    assert not comics.output_file_path.exists()
+
+
+def test_semaphore_limits_concurrent_renders(folder: Path):
+    first = Comics.load_from_folder(folder)
+    first.output_file_name = "first.pdf"
+    second = Comics.load_from_folder(folder)
+    second.output_file_name = "second.pdf"
+    log: List[Tuple[str, str]] = []
+
+    def on_event(name: str):
+        return lambda event: log.append((name, event.kind))
+
+    async def render_both() -> None:
+        semaphore = asyncio.Semaphore(1)
+        await asyncio.gather(
+            first.render_async(
+                on_event=on_event("first"), semaphore=semaphore
+            ),
+            second.render_async(
+                on_event=on_event("second"), semaphore=semaphore
+            ),
+        )
+
+    asyncio.run(render_both())
+
+    # Events of one render all come before events of other one
+    renders: List[str] = [name for name, _ in log]
+    assert renders == sorted(renders, key=renders.index)
+    assert [kind for _, kind in log].count(events.FINISHED) == 2
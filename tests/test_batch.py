@@ -0,0 +1,35 @@
+from pathlib import Path
+
+from comix_pdf.batch import render_library
+from comix_pdf.cache import PageCache
+from tests.helpers import make_image, read_pdf_pages
+
+
+def test_render_library_forwards_page_options(tmp_path: Path):
+    library: Path = tmp_path / "library"
+    for volume in ("first", "second"):
+        (library / volume).mkdir(parents=True)
+        for number in range(3):
+            make_image(
+                library / volume, f"{number}.png", (40, 60), "RGB",
+                (90, 90, 90)
+            )
+
+    output_dir: Path = tmp_path / "output"
+    output_dir.mkdir()
+    page_cache = PageCache(tmp_path / "cache")
+    summary = render_library(
+        library, output_dir, resolution=100, workers=2,
+        page_cache=page_cache, max_dpi=50, compression="smallest",
+        detect_grayscale=True
+    )
+
+    assert len(summary.rendered) == 2
+    for result in summary.rendered:
+        pages = read_pdf_pages(result.output_file)
+        assert len(pages) == 3
+        assert {page.image_size for page in pages} == {(20, 30)}
+        assert {page.color_space for page in pages} == {"DeviceGray"}
+
+    # Pages stored by processes of volumes are seen by cache of caller
+    assert page_cache.total_size > 0
@@ -0,0 +1,113 @@
+import zipfile
+from pathlib import Path
+from typing import List
+from xml.etree import ElementTree
+
+import pytest
+
+from comix_pdf import exceptions
+from comix_pdf.cbz import ComicInfo
+from comix_pdf.types import CancellationToken, Comics, RenderReport
+from tests.helpers import make_image
+
+
+@pytest.fixture
+def comics(tmp_path: Path) -> Comics:
+    pages_folder: Path = tmp_path / "pages"
+    pages_folder.mkdir()
+    make_image(pages_folder, "1.png", (20, 30))
+    make_image(pages_folder, "2.jpg", (21, 30))
+    make_image(pages_folder, "3.PNG", (22, 30))
+
+    comics = Comics.load_from_folder(pages_folder)
+    comics.sort_images("name")
+    comics.output_folder = tmp_path
+    comics.output_file_name = "comics"
+    return comics
+
+
+def test_pages_are_stored_byte_for_byte_in_order(comics: Comics):
+    report: RenderReport = comics.render_cbz()
+
+    with zipfile.ZipFile(comics.output_cbz_file_path) as archive:
+        entries: List[zipfile.ZipInfo] = archive.infolist()
+        assert [entry.filename for entry in entries] == [
+            "000.png", "001.jpg", "002.png"
+        ]
+        assert {entry.compress_type for entry in entries} == {
+            zipfile.ZIP_STORED
+        }
+        assert [archive.read(entry) for entry in entries] == [
+            image.read_bytes() for image in comics
+        ]
+
+    assert all(page.passed_through for page in report)
+    assert [page.encoded_size for page in report] == [
+        image.stored_size for image in comics
+    ]
+
+
+def test_comic_info_describes_pages(comics: Comics):
+    comics.render_cbz(ComicInfo(
+        title="Title", series="Series", number="1", writer="Writer",
+        summary="Summary & <more>"
+    ))
+
+    with zipfile.ZipFile(comics.output_cbz_file_path) as archive:
+        assert archive.namelist()[-1] == "ComicInfo.xml"
+        comic_info_xml: bytes = archive.read("ComicInfo.xml")
+
+    assert comic_info_xml.startswith(b"<?xml version='1.0' encoding='utf-8'?>")
+    root = ElementTree.fromstring(comic_info_xml)
+    assert root.tag == "ComicInfo"
+    # Elements follow sequence of ComicInfo.xsd
+    assert [element.tag for element in root] == [
+        "Title", "Series", "Number", "Summary", "Writer", "PageCount",
+        "Pages",
+    ]
+    assert root.findtext("Summary") == "Summary & <more>"
+    assert root.findtext("PageCount") == "3"
+    assert [page.attrib for page in root.find("Pages")] == [
+        {
+            "Image": str(index), "ImageWidth": str(image.size[0]),
+            "ImageHeight": str(image.size[1]),
+            "ImageSize": str(image.stored_size),
+        }
+        for index, image in enumerate(comics)
+    ]
+
+
+def test_unset_fields_of_comic_info_are_not_written(comics: Comics):
+    comics.render_cbz(ComicInfo(title="Title"))
+
+    with zipfile.ZipFile(comics.output_cbz_file_path) as archive:
+        root = ElementTree.fromstring(archive.read("ComicInfo.xml"))
+
+    assert [element.tag for element in root] == [
+        "Title", "PageCount", "Pages"
+    ]
+
+
+def test_archive_without_comic_info(comics: Comics):
+    comics.render_cbz()
+
+    with zipfile.ZipFile(comics.output_cbz_file_path) as archive:
+        assert "ComicInfo.xml" not in archive.namelist()
+
+
+def test_archive_can_not_be_its_own_source(comics: Comics):
+    comics.render_cbz()
+    archive_comics = Comics.load_from_archive(comics.output_cbz_file_path)
+
+    with pytest.raises(exceptions.OutputFileIsInput):
+        archive_comics.render_cbz()
+
+
+def test_cancelled_writing_removes_archive(comics: Comics):
+    token = CancellationToken()
+    token.cancel()
+
+    with pytest.raises(exceptions.OperationCancelled):
+        comics.render_cbz(cancellation_token=token)
+
+    assert not comics.output_cbz_file_path.exists()
@@ -0,0 +1,87 @@
+import shutil
+from pathlib import Path
+from typing import List
+
+import pytest
+from PIL import Image, PdfParser
+
+from comix_pdf.types import Comics, ComicsImage, RenderReport
+from comix_pdf.utils import duplicates
+from tests.helpers import read_pdf_pages
+
+
+@pytest.fixture
+def comics(tmp_path: Path) -> Comics:
+    pages_folder: Path = tmp_path / "pages"
+    pages_folder.mkdir()
+    # Mirrored gradients, so perceptual hashes of pages differ too
+    gradient: Image.Image = Image.linear_gradient("L").rotate(90).resize(
+        (20, 30)
+    )
+    gradient.save(pages_folder / "1.png")
+    shutil.copy(pages_folder / "1.png", pages_folder / "2.png")
+    gradient.transpose(Image.FLIP_LEFT_RIGHT).save(pages_folder / "3.png")
+    shutil.copy(pages_folder / "1.png", pages_folder / "4.png")
+
+    comics = Comics.load_from_folder(pages_folder)
+    comics.sort_images("name")
+    comics.output_folder = tmp_path
+    return comics
+
+
+def image_references(path: Path) -> List[PdfParser.IndirectReference]:
+    parser = PdfParser.PdfParser(str(path))
+    try:
+        references: List[PdfParser.IndirectReference] = []
+        for page_ref in parser.pages:
+            resources = parser.read_indirect(page_ref)[b"Resources"]
+            image_ref, = resources[b"XObject"].values()
+            references.append(image_ref)
+
+        return references
+
+    finally:
+        parser.close()
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_pages_with_same_data_share_one_image(comics: Comics, workers: int):
+    report: RenderReport = comics.render(deduplicate=True, workers=workers)
+    deduplicated_file: Path = comics.output_file_path
+
+    references = image_references(deduplicated_file)
+    assert references[0] == references[1] == references[3]
+    assert references[2] != references[0]
+    assert [page.duplicate_of for page in report] == [None, 0, None, 0]
+    assert report.duplicates == [report[1], report[3]]
+
+    comics.output_file_name = "not_deduplicated.pdf"
+    comics.render(streaming=True)
+    assert read_pdf_pages(deduplicated_file) == read_pdf_pages(
+        comics.output_file_path
+    )
+
+
+def test_pages_are_not_shared_without_deduplication(comics: Comics):
+    comics.render(streaming=True)
+
+    assert len(set(image_references(comics.output_file_path))) == 4
+
+
+def test_first_occurrences_of_source_data(comics: Comics):
+    assert duplicates.first_occurrences(comics) == [0, 0, 2, 0]
+
+
+def test_near_duplicates_are_found_by_look(comics: Comics, tmp_path: Path):
+    with Image.open(comics[2].path) as img:
+        img.resize((42, 60)).save(tmp_path / "resized.png")
+
+    comics.append(ComicsImage(tmp_path / "resized.png"))
+
+    assert duplicates.find_duplicates(comics) == [
+        duplicates.DuplicateGroup([0, 1, 3], True)
+    ]
+    assert duplicates.find_duplicates(comics, near_duplicates=True) == [
+        duplicates.DuplicateGroup([0, 1, 3], True),
+        duplicates.DuplicateGroup([2, 4], False),
+    ]
@@ -0,0 +1,164 @@
+from pathlib import Path
+from typing import Callable, List
+
+import pytest
+from PIL import Image
+
+from comix_pdf.types import Comics, ComicsImage, RenderReport
+from tests.helpers import (
+    PdfPage, decode_pdf_image, make_image, read_pdf_pages, write_png
+)
+
+SIZE = (40, 30)
+
+
+def gradient(mode: str) -> Image.Image:
+    gray: Image.Image = Image.linear_gradient("L").resize(SIZE)
+    if mode == "L":
+        return gray
+
+    rgb: Image.Image = Image.merge("RGB", (
+        gray, gray.transpose(Image.FLIP_LEFT_RIGHT),
+        gray.transpose(Image.FLIP_TOP_BOTTOM)
+    ))
+    if mode == "RGBA":
+        rgb.putalpha(gray)
+        return rgb
+
+    return rgb.convert(mode)
+
+
+def save(mode: str, **options) -> Callable[[Path], Path]:
+    def save_image(folder: Path) -> Path:
+        path: Path = folder / "page.png"
+        gradient(mode).save(path, **options)
+        return path
+
+    return save_image
+
+
+def save_16_bit_gray(folder: Path) -> Path:
+    path: Path = folder / "page.png"
+    gradient("L").point(lambda value: value * 257, "I").convert(
+        "I;16"
+    ).save(path)
+    return path
+
+
+def save_16_bit_rgb(folder: Path) -> Path:
+    rows = [
+        [
+            (x * 1500, y * 2000, (x + y) * 900)
+            for x in range(SIZE[0])
+        ]
+        for y in range(SIZE[1])
+    ]
+    return write_png(folder / "page.png", rows, bit_depth=16)
+
+
+def save_interlaced_rgb(folder: Path) -> Path:
+    image: Image.Image = gradient("RGB")
+    rows = [
+        [image.getpixel((x, y)) for x in range(SIZE[0])]
+        for y in range(SIZE[1])
+    ]
+    return write_png(folder / "page.png", rows, interlaced=True)
+
+
+def render_page(folder: Path, **render_options):
+    comics = Comics.load_from_folder(folder)
+    comics.output_file_name = "rendered.pdf"
+    report: RenderReport = comics.render(**render_options)
+    page, = read_pdf_pages(comics.output_file_path)
+    return page, report[0]
+
+
+@pytest.mark.parametrize("save_image, color_space, bits", [
+    (save("RGB"), "DeviceRGB", 8),
+    (save("L"), "DeviceGray", 8),
+    (save("1"), "DeviceGray", 1),
+], ids=["rgb", "gray", "bilevel"])
+def test_png_samples_are_embedded_as_is(
+    tmp_path: Path, save_image, color_space: str, bits: int
+):
+    path: Path = save_image(tmp_path)
+
+    page, page_report = render_page(tmp_path, compression="flate")
+
+    assert page_report.passed_through
+    assert page.filter == "FlateDecode"
+    assert (page.color_space, page.bits_per_component) == (color_space, bits)
+    with Image.open(path) as source:
+        expected: Image.Image = source.convert(
+            "RGB" if color_space == "DeviceRGB" else "L"
+        )
+
+    assert decode_pdf_image(page).tobytes() == expected.tobytes()
+
+
+@pytest.mark.parametrize("save_image", [
+    save("P"), save("RGBA"), save("L", transparency=0), save_16_bit_gray,
+    save_16_bit_rgb, save_interlaced_rgb,
+], ids=[
+    "palette", "rgba", "transparent-gray", "16-bit-gray", "16-bit-rgb",
+    "interlaced",
+])
+def test_unsupported_png_is_decoded_and_compressed_again(
+    tmp_path: Path, save_image
+):
+    path: Path = save_image(tmp_path)
+
+    page, page_report = render_page(tmp_path, compression="flate")
+
+    assert not page_report.passed_through
+    assert page.filter == "FlateDecode"
+    assert page.bits_per_component == 8
+    expected: Image.Image = ComicsImage(path).convert_to_rgb()
+    decoded: Image.Image = decode_pdf_image(page)
+    assert decoded.mode == expected.mode
+    assert decoded.tobytes() == expected.tobytes()
+
+
+def test_interlaced_png_keeps_its_pixels(tmp_path: Path):
+    save_interlaced_rgb(tmp_path)
+
+    page, _ = render_page(tmp_path, compression="flate")
+
+    assert decode_pdf_image(page).tobytes() == gradient("RGB").tobytes()
+
+
+def test_auto_compression_follows_source_format(tmp_path: Path):
+    make_image(tmp_path, "1.png", SIZE)
+    make_image(tmp_path, "2.jpg", SIZE)
+    comics = Comics.load_from_folder(tmp_path)
+    comics.sort_images("name")
+
+    comics.render(compression="auto")
+
+    assert [
+        page.filter for page in read_pdf_pages(comics.output_file_path)
+    ] == ["FlateDecode", "DCTDecode"]
+
+
+def test_smallest_compression_keeps_smaller_stream(tmp_path: Path):
+    gradient("RGB").save(tmp_path / "1.png")
+    Image.effect_noise((200, 200), 100).convert("RGB").save(
+        tmp_path / "2.png"
+    )
+    comics = Comics.load_from_folder(tmp_path)
+    comics.sort_images("name")
+
+    rendered: List[List[PdfPage]] = []
+    for compression in ("jpeg", "flate", "smallest"):
+        comics.output_file_name = f"{compression}.pdf"
+        comics.render(compression=compression)
+        rendered.append(read_pdf_pages(comics.output_file_path))
+
+    jpeg_pages, flate_pages, smallest_pages = rendered
+    assert [page.filter for page in smallest_pages] == [
+        "FlateDecode", "DCTDecode"
+    ]
+    for jpeg_page, flate_page, smallest_page in zip(*rendered):
+        assert smallest_page == min(
+            jpeg_page, flate_page, key=lambda page: len(page.image_data)
+        )
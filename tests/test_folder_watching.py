@@ -0,0 +1,121 @@
+import os
+import threading
+import time
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from comix_pdf import exceptions
+from comix_pdf.types import CancellationToken, Comics, RenderReport
+from comix_pdf.utils.folder_watching import FolderWatcher
+from tests.helpers import make_image, read_pdf_pages
+
+SETTLE_TIME = 0.5
+
+
+@pytest.fixture(params=[True, False], ids=["inotify", "polling"])
+def use_inotify(request) -> bool:
+    return request.param
+
+
+def append_bytes(path: Path) -> None:
+    with open(path, "ab") as file:
+        file.write(b"\0" * 16)
+
+
+def test_file_is_reported_after_it_stops_changing(
+    tmp_path: Path, use_inotify: bool
+):
+    path: Path = tmp_path / "01.png"
+    with FolderWatcher(
+        tmp_path, SETTLE_TIME, 0.05, use_inotify=use_inotify
+    ) as watcher:
+        path.write_bytes(b"\0" * 16)
+        for _ in range(3):
+            assert watcher.wait_for_files(SETTLE_TIME / 2) == []
+            append_bytes(path)
+
+        last_change: float = time.monotonic()
+        assert watcher.wait_for_files(SETTLE_TIME / 2) == []
+        assert watcher.wait_for_files(5) == [path]
+        assert time.monotonic() - last_change >= SETTLE_TIME
+
+
+def test_changed_file_is_reported_again(tmp_path: Path, use_inotify: bool):
+    path: Path = tmp_path / "01.png"
+    with FolderWatcher(
+        tmp_path, 0.1, 0.05, use_inotify=use_inotify
+    ) as watcher:
+        path.write_bytes(b"\0" * 16)
+        assert watcher.wait_for_files(5) == [path]
+        assert watcher.wait_for_files(0.3) == []
+
+        append_bytes(path)
+        assert watcher.wait_for_files(5) == [path]
+
+
+def test_existing_files_are_reported_only_if_requested(
+    tmp_path: Path, use_inotify: bool
+):
+    paths: List[Path] = [tmp_path / name for name in ("10.png", "9.png")]
+    for path in paths:
+        path.write_bytes(b"\0" * 16)
+        # Files that weren't changed for a while don't wait to settle
+        old_time: float = time.time() - 60
+        os.utime(path, (old_time, old_time))
+
+    with FolderWatcher(
+        tmp_path, 60, 0.05, use_inotify=use_inotify
+    ) as watcher:
+        assert watcher.wait_for_files(0.2) == []
+
+    with FolderWatcher(
+        tmp_path, 60, 0.05, use_inotify=use_inotify, report_existing=True
+    ) as watcher:
+        assert watcher.wait_for_files(0.2) == paths[::-1]
+
+
+def test_watch_folder_appends_settled_pages(tmp_path: Path):
+    make_image(tmp_path, "01.png", (20, 30))
+    comics = Comics.load_from_folder(tmp_path)
+    token = CancellationToken()
+    reports: List[RenderReport] = []
+    updated = threading.Event()
+    # Error that stopped watching, checked after thread is joined
+    errors: List[BaseException] = []
+
+    def on_update(report: RenderReport) -> None:
+        reports.append(report)
+        updated.set()
+
+    def watch() -> None:
+        try:
+            comics.watch_folder(
+                tmp_path, on_update=on_update, cancellation_token=token,
+                settle_time=0.1, poll_interval=0.05
+            )
+
+        except BaseException as error:
+            errors.append(error)
+
+    watcher_thread = threading.Thread(target=watch)
+    watcher_thread.start()
+    try:
+        assert updated.wait(10)
+        updated.clear()
+        make_image(tmp_path, "02.png", (21, 30))
+        (tmp_path / "notes.txt").write_text("not an image")
+        assert updated.wait(10)
+
+    finally:
+        token.cancel()
+        watcher_thread.join(10)
+
+    assert not watcher_thread.is_alive()
+    assert len(errors) == 1
+    assert isinstance(errors[0], exceptions.OperationCancelled)
+    assert [len(report) for report in reports] == [1, 1]
+    assert [
+        page.image_size for page in read_pdf_pages(comics.output_file_path)
+    ] == [(20, 30), (21, 30)]
@@ -0,0 +1,91 @@
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from comix_pdf.pdf import grayscale
+from comix_pdf.types import Comics, RenderReport
+from tests.helpers import decode_pdf_image, make_image, read_pdf_pages
+
+
+@pytest.mark.parametrize("pixel, tolerance, expected", [
+    ((100, 100, 100), 0, True),
+    ((100, 108, 100), 8, True),
+    ((100, 108, 100), 7, False),
+    ((104, 100, 96), 8, True),
+    ((255, 0, 0), 254, False),
+])
+def test_channels_are_compared_with_tolerance(pixel, tolerance, expected):
+    view: Image.Image = Image.new("RGB", (8, 8), (128, 128, 128))
+    view.putpixel((3, 5), pixel)
+
+    assert grayscale.is_near_grayscale(view, tolerance) is expected
+
+
+def test_analysis_view_is_downsampled():
+    img: Image.Image = Image.new("RGB", (1000, 600))
+    small_img: Image.Image = Image.new("RGB", (300, 200))
+
+    assert grayscale.analysis_view(img).size == (334, 200)
+    assert grayscale.analysis_view(small_img) is small_img
+
+
+@pytest.fixture
+def comics(tmp_path: Path) -> Comics:
+    make_image(tmp_path, "1.png", (40, 30), "RGB", (90, 94, 90))
+    make_image(tmp_path, "2.png", (40, 30), "RGB", (200, 30, 40))
+    make_image(tmp_path, "3.jpg", (40, 30), "RGB", (90, 90, 90))
+
+    comics = Comics.load_from_folder(tmp_path)
+    comics.sort_images("name")
+    return comics
+
+
+def test_pages_without_color_are_encoded_as_grayscale(comics: Comics):
+    report: RenderReport = comics.render(detect_grayscale=True)
+
+    pages = read_pdf_pages(comics.output_file_path)
+    assert [page.color_space for page in pages] == [
+        "DeviceGray", "DeviceRGB", "DeviceGray"
+    ]
+    assert [page.converted_to_grayscale for page in report] == [
+        True, False, True
+    ]
+    assert report.converted_to_grayscale == [report[0], report[2]]
+    assert decode_pdf_image(pages[0]).mode == "L"
+
+
+def test_tolerance_limits_difference_of_channels(comics: Comics):
+    report: RenderReport = comics.render(
+        detect_grayscale=True, grayscale_tolerance=2
+    )
+
+    assert [page.converted_to_grayscale for page in report] == [
+        False, False, True
+    ]
+
+
+def test_passed_through_pages_are_not_analyzed(comics: Comics):
+    report: RenderReport = comics.render(
+        detect_grayscale=True, jpeg_passthrough=True
+    )
+
+    assert report[2].passed_through
+    assert not report[2].converted_to_grayscale
+    assert read_pdf_pages(comics.output_file_path)[2].color_space == (
+        "DeviceRGB"
+    )
+
+
+def test_lossless_pages_are_encoded_as_grayscale(tmp_path: Path):
+    make_image(tmp_path, "1.png", (40, 30), "RGBA", (70, 70, 70, 255))
+    comics = Comics.load_from_folder(tmp_path)
+
+    report: RenderReport = comics.render(
+        detect_grayscale=True, compression="flate"
+    )
+
+    page, = read_pdf_pages(comics.output_file_path)
+    assert report[0].converted_to_grayscale
+    assert (page.filter, page.color_space) == ("FlateDecode", "DeviceGray")
+    assert decode_pdf_image(page).getextrema() == (70, 70)
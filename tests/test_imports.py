@@ -0,0 +1,17 @@
+import pkgutil
+import subprocess
+import sys
+
+import pytest
+
+import comix_pdf.utils
+
+
+@pytest.mark.parametrize("module", [
+    f"comix_pdf.utils.{module.name}"
+    for module in pkgutil.iter_modules(comix_pdf.utils.__path__)
+])
+def test_module_imports_first(module: str):
+    # Every module is imported by fresh interpreter, so circular imports
+    # aren't hidden by modules that tests imported before
+    subprocess.run([sys.executable, "-c", f"import {module}"], check=True)
@@ -0,0 +1,111 @@
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+import pytest
+
+from comix_pdf.pdf import encoding
+from comix_pdf.types import Comics, ComicsImage, RenderSettings
+from tests.helpers import make_image, read_pdf_pages
+
+# Footprint of 100x100 RGB page: decoded source and its RGB copy
+PAGE_FOOTPRINT = 100 * 100 * 3 * 2
+# Two pages fit into limit at once, three don't
+MEMORY_LIMIT = PAGE_FOOTPRINT * 2 + PAGE_FOOTPRINT // 2
+
+
+class RecordingExecutor:
+    """
+    Encodes pages right when they are submitted and records when it
+    happens, so pages that are given to workers at once are known.
+    """
+
+    def __init__(self, log: List[Tuple[str, str]]):
+        self.log: List[Tuple[str, str]] = log
+
+    def __enter__(self) -> "RecordingExecutor":
+        return self
+
+    def __exit__(self, *args) -> None:
+        pass
+
+    def submit(self, function: Callable, image: ComicsImage, *args) -> Future:
+        self.log.append(("submit", image.name))
+        future: Future = Future()
+        future.set_result(function(image, *args))
+        return future
+
+
+@pytest.fixture
+def images(tmp_path: Path) -> List[ComicsImage]:
+    sizes = [(100, 100)] * 3 + [(300, 300)] + [(100, 100)] * 3
+    return [
+        ComicsImage(make_image(tmp_path, f"{index}.png", size))
+        for index, size in enumerate(sizes)
+    ]
+
+
+def test_footprint_is_estimated_from_header(images: List[ComicsImage]):
+    settings = RenderSettings()
+
+    assert encoding.page_footprint(images[0], settings) == PAGE_FOOTPRINT
+    assert encoding.page_footprint(
+        images[0], settings._replace(max_dpi=150)
+    ) == 100 * 100 * 3 + 50 * 50 * 3
+
+
+def test_pages_in_workers_fit_into_memory_limit(
+    images: List[ComicsImage], monkeypatch
+):
+    log: List[Tuple[str, str]] = []
+    monkeypatch.setattr(
+        encoding, "ProcessPoolExecutor",
+        lambda max_workers: RecordingExecutor(log)
+    )
+    settings = RenderSettings()
+
+    pages = encoding.encode_images(
+        images, settings, workers=4, memory_limit=MEMORY_LIMIT
+    )
+    for page in pages:
+        log.append(("yield", f"{page.size}"))
+
+    footprints = {
+        image.name: encoding.page_footprint(image, settings)
+        for image in images
+    }
+    in_workers: List[str] = []
+    largest_batch: int = 0
+    for action, name in log:
+        if action == "yield":
+            in_workers.pop(0)
+            continue
+
+        in_workers.append(name)
+        largest_batch = max(largest_batch, len(in_workers))
+        # Page bigger than limit is encoded only alone
+        assert (
+            sum(footprints[name] for name in in_workers) <= MEMORY_LIMIT
+            or in_workers == [name]
+        )
+
+    assert largest_batch == 2
+    assert [name for action, name in log if action == "yield"] == [
+        f"{image.size}" for image in images
+    ]
+
+
+def test_render_with_memory_limit_keeps_pages(tmp_path: Path):
+    for index, size in enumerate([(100, 100), (300, 300), (100, 120)]):
+        make_image(tmp_path, f"{index}.png", size)
+
+    comics = Comics.load_from_folder(tmp_path)
+    comics.sort_images("name")
+    comics.output_file_name = "limited.pdf"
+    comics.render(workers=2, memory_limit=MEMORY_LIMIT)
+    limited_pages = read_pdf_pages(comics.output_file_path)
+
+    comics.output_file_name = "unlimited.pdf"
+    comics.render(streaming=True)
+
+    assert limited_pages == read_pdf_pages(comics.output_file_path)
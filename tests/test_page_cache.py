@@ -0,0 +1,110 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from comix_pdf.cache import PageCache
+from comix_pdf.pdf.encoding import EncodedPage
+from comix_pdf.types import Comics
+from tests.helpers import make_image, read_pdf_pages
+
+
+@pytest.fixture
+def comics(tmp_path: Path) -> Comics:
+    pages_folder: Path = tmp_path / "pages"
+    pages_folder.mkdir()
+    for number in range(3):
+        make_image(pages_folder, f"{number}.png", (20 + number, 30))
+
+    comics = Comics.load_from_folder(pages_folder)
+    comics.sort_images("name")
+    return comics
+
+
+@pytest.fixture
+def page_cache(tmp_path: Path) -> PageCache:
+    return PageCache(tmp_path / "cache")
+
+
+def encoded_page(size: int) -> EncodedPage:
+    return EncodedPage(b"\0" * size, (1, 1))
+
+
+def test_unchanged_pages_are_taken_from_cache(
+    comics: Comics, page_cache: PageCache
+):
+    comics.render(page_cache=page_cache)
+    encoded = read_pdf_pages(comics.output_file_path)
+    assert (page_cache.hits, page_cache.misses) == (0, 3)
+
+    cached = PageCache(page_cache.directory)
+    comics.render(page_cache=cached)
+
+    assert (cached.hits, cached.misses) == (3, 0)
+    assert read_pdf_pages(comics.output_file_path) == encoded
+
+
+def test_changed_source_is_encoded_again(
+    comics: Comics, page_cache: PageCache
+):
+    comics.render(page_cache=page_cache)
+    stat = comics[1].path.stat()
+    os.utime(comics[1].path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10))
+
+    comics.render(page_cache=page_cache)
+
+    assert (page_cache.hits, page_cache.misses) == (2, 4)
+
+
+@pytest.mark.parametrize("render_options", [
+    dict(quality=50), dict(resolution=150), dict(max_dpi=100),
+    dict(compression="flate"),
+])
+def test_changed_settings_encode_pages_again(
+    comics: Comics, page_cache: PageCache, render_options: dict
+):
+    comics.render(page_cache=page_cache)
+
+    comics.render(page_cache=page_cache, **render_options)
+
+    assert (page_cache.hits, page_cache.misses) == (0, 6)
+
+
+def test_least_recently_used_pages_are_evicted(page_cache: PageCache):
+    page_cache.put("first", encoded_page(100))
+    entry_size: int = page_cache.total_size
+    page_cache = PageCache(page_cache.directory, entry_size * 2)
+    page_cache.put("second", encoded_page(100))
+    assert page_cache.get("first") is not None
+
+    page_cache.put("third", encoded_page(100))
+
+    assert page_cache.get("second") is None
+    assert page_cache.get("first") is not None
+    assert page_cache.get("third") is not None
+    assert page_cache.total_size == entry_size * 2
+    assert sorted(os.listdir(page_cache.directory)) == [
+        "first.page", "third.page"
+    ]
+
+
+def test_pages_bigger_than_cache_are_not_stored(tmp_path: Path):
+    page_cache = PageCache(tmp_path / "cache", 50)
+
+    page_cache.put("page", encoded_page(100))
+
+    assert page_cache.get("page") is None
+    assert os.listdir(page_cache.directory) == []
+
+
+def test_caches_sharing_directory_see_pages_of_each_other(
+    page_cache: PageCache
+):
+    other_cache = PageCache(page_cache.directory)
+    page_cache.put("page", encoded_page(100))
+    other_cache.put("page", encoded_page(200))
+
+    page_cache.reload()
+
+    assert page_cache.get("page").data == b"\0" * 200
+    assert os.listdir(page_cache.directory) == ["page.page"]
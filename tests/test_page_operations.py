@@ -0,0 +1,91 @@
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from comix_pdf.types import (
+    Comics, ComicsImage, ExcludePages, InsertPages, MovePages, RestorePages
+)
+from tests.helpers import make_image
+
+
+@pytest.fixture
+def comics(tmp_path: Path) -> Comics:
+    for number in range(6):
+        make_image(tmp_path, f"{number}.png", (10 + number, 10))
+
+    comics = Comics.load_from_folder(tmp_path)
+    comics.sort_images("name")
+    return comics
+
+
+def names(images) -> List[str]:
+    return [image.path.stem for image in images]
+
+
+def test_indices_refer_to_order_before_batch(comics: Comics):
+    comics.apply_operations([
+        MovePages([0], 6),
+        ExcludePages([1, 2]),
+        MovePages([5], 3),
+    ])
+
+    assert names(comics) == ["5", "3", "4", "0"]
+    assert names(
+        excluded_image.image for excluded_image in comics.excluded_images
+    ) == ["1", "2"]
+
+
+def test_pages_put_before_same_page_keep_order_of_operations(
+    comics: Comics, tmp_path: Path
+):
+    inserted = ComicsImage(make_image(tmp_path, "new.png"))
+    comics.apply_operations([
+        MovePages([4, 1], 2),
+        InsertPages([inserted], 2),
+    ])
+
+    assert names(comics) == ["0", "4", "1", "new", "2", "3", "5"]
+
+
+def test_restored_page_returns_before_page_that_followed_it(comics: Comics):
+    comics.apply_operations([ExcludePages([2, 3])])
+    comics.apply_operations([MovePages([3], 0)])
+    comics.apply_operations([RestorePages([0, 1])])
+
+    assert names(comics) == ["5", "0", "1", "2", "3", "4"]
+    assert not comics.excluded_images
+
+
+def test_restored_page_goes_to_requested_position(comics: Comics):
+    comics.apply_operations([ExcludePages([0])])
+    comics.apply_operations([RestorePages([0], to_index=5)])
+
+    assert names(comics) == ["1", "2", "3", "4", "5", "0"]
+
+
+@pytest.mark.parametrize("operations, error", [
+    ([MovePages([0], 7)], IndexError),
+    ([ExcludePages([6])], IndexError),
+    ([RestorePages([0])], IndexError),
+    ([MovePages([1], 0), ExcludePages([1])], ValueError),
+    ([object()], TypeError),
+])
+def test_invalid_batch_changes_nothing(comics: Comics, operations, error):
+    pages_before: List[ComicsImage] = list(comics)
+
+    with pytest.raises(error):
+        comics.apply_operations([ExcludePages([2])] + operations)
+
+    assert list(comics) == pages_before
+    assert not comics.excluded_images
+
+
+def test_pages_are_found_by_id_after_batch(comics: Comics):
+    page_ids: List[int] = [image.page_id for image in comics]
+    comics.apply_operations([MovePages([0, 1], 6), ExcludePages([3])])
+
+    assert comics.page_index(page_ids[0]) == 3
+    assert comics.page(page_ids[1]) is comics[4]
+    with pytest.raises(KeyError):
+        comics.page_index(page_ids[3])
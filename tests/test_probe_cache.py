@@ -0,0 +1,141 @@
+import errno
+import os
+from pathlib import Path
+from typing import List
+
+import pytest
+from PIL import Image
+
+from comix_pdf.cache import ProbeCache
+from comix_pdf.types import ComicsImage
+from comix_pdf.utils.folder_scanning import scan_folder
+from tests.helpers import make_image
+
+
+@pytest.fixture
+def folder(tmp_path: Path) -> Path:
+    folder: Path = tmp_path / "pages"
+    folder.mkdir()
+    for number in range(3):
+        make_image(folder, f"{number}.png", (20 + number, 30))
+
+    (folder / "notes.txt").write_text("not an image")
+    return folder
+
+
+@pytest.fixture
+def probe_cache(tmp_path: Path) -> ProbeCache:
+    with ProbeCache(tmp_path / "probes.sqlite3") as probe_cache:
+        yield probe_cache
+
+
+@pytest.fixture
+def opened_files(monkeypatch) -> List[str]:
+    opened_files: List[str] = []
+    open_image = Image.open
+
+    def record_open(file, *args, **kwargs):
+        opened_files.append(Path(file).name)
+        return open_image(file, *args, **kwargs)
+
+    monkeypatch.setattr(Image, "open", record_open)
+    return opened_files
+
+
+def scanned_sizes(images: List[ComicsImage]) -> List[tuple]:
+    return sorted(image.size for image in images)
+
+
+def test_unchanged_files_are_not_opened_again(
+    folder: Path, probe_cache: ProbeCache, opened_files: List[str]
+):
+    first_scan = scan_folder(folder, probe_cache=probe_cache)
+    assert len(opened_files) == 4
+    opened_files.clear()
+
+    second_scan = scan_folder(folder, workers=2, probe_cache=probe_cache)
+
+    assert opened_files == []
+    assert (probe_cache.hits, probe_cache.misses) == (4, 4)
+    assert scanned_sizes(second_scan) == scanned_sizes(first_scan)
+
+
+def test_cache_is_kept_between_runs(
+    folder: Path, tmp_path: Path, opened_files: List[str]
+):
+    with ProbeCache(tmp_path / "probes.sqlite3") as probe_cache:
+        scan_folder(folder, probe_cache=probe_cache)
+
+    opened_files.clear()
+    with ProbeCache(tmp_path / "probes.sqlite3") as probe_cache:
+        scan_folder(folder, probe_cache=probe_cache)
+
+    assert opened_files == []
+
+
+def test_touched_file_is_probed_again(
+    folder: Path, probe_cache: ProbeCache, opened_files: List[str]
+):
+    scan_folder(folder, probe_cache=probe_cache)
+    path: Path = folder / "1.png"
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10))
+    opened_files.clear()
+
+    scan_folder(folder, probe_cache=probe_cache)
+
+    assert opened_files == ["1.png"]
+
+
+def test_replaced_file_is_probed_again(
+    folder: Path, probe_cache: ProbeCache
+):
+    scan_folder(folder, probe_cache=probe_cache)
+    replacement: Path = make_image(folder.parent, "new.png", (50, 60))
+    os.replace(replacement, folder / "1.png")
+
+    images = scan_folder(folder, probe_cache=probe_cache)
+
+    assert scanned_sizes(images) == [(20, 30), (22, 30), (50, 60)]
+
+
+def test_removed_files_are_evicted(folder: Path, probe_cache: ProbeCache):
+    scan_folder(folder, probe_cache=probe_cache)
+    (folder / "0.png").unlink()
+
+    scan_folder(folder, probe_cache=probe_cache)
+
+    assert sorted(probe_cache.load_folder(folder)) == [
+        "1.png", "2.png", "notes.txt"
+    ]
+
+
+def test_verification_is_not_skipped_by_unverified_results(
+    folder: Path, probe_cache: ProbeCache, opened_files: List[str]
+):
+    scan_folder(folder, probe_cache=probe_cache)
+    opened_files.clear()
+
+    scan_folder(folder, verify=True, probe_cache=probe_cache)
+    assert sorted(set(opened_files)) == ["0.png", "1.png", "2.png"]
+    opened_files.clear()
+
+    scan_folder(folder, verify=True, probe_cache=probe_cache)
+    assert opened_files == []
+
+
+def test_failed_reads_are_not_cached(
+    folder: Path, probe_cache: ProbeCache, monkeypatch
+):
+    def fail_reading(path: Path):
+        raise OSError(errno.EIO, "Input/output error", str(path))
+
+    monkeypatch.setattr(
+        ComicsImage, "probe_header", staticmethod(fail_reading)
+    )
+
+    images = scan_folder(folder, probe_cache=probe_cache)
+
+    assert images == []
+    assert probe_cache.misses == 4
+    assert probe_cache.load_folder(folder) == {}
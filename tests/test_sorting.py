@@ -0,0 +1,125 @@
+import os
+import time
+from pathlib import Path
+from typing import List, Optional
+
+import pytest
+from PIL import Image
+
+from comix_pdf.types import Comics, ComicsImage
+from comix_pdf.types.image import (
+    EXIF_DATE_TIME, EXIF_DATE_TIME_ORIGINAL, EXIF_IFD
+)
+from comix_pdf.types.sort_keys import natural_sort_key
+from tests.helpers import make_image
+
+
+def make_photo(
+    folder: Path, name: str, taken_at: Optional[str] = None,
+    exif_tag: int = EXIF_DATE_TIME_ORIGINAL, modified_at: float = 0
+) -> Path:
+    exif = Image.Exif()
+    if taken_at is not None:
+        if exif_tag == EXIF_DATE_TIME:
+            exif[exif_tag] = taken_at
+
+        else:
+            exif.get_ifd(EXIF_IFD)[exif_tag] = taken_at
+
+    path: Path = folder / name
+    Image.new("RGB", (20, 30)).save(path, exif=exif)
+    os.utime(path, (modified_at, modified_at))
+    return path
+
+
+def names(comics: Comics) -> List[str]:
+    return [image.name for image in comics]
+
+
+def test_numbers_in_names_are_compared_by_value():
+    names_to_sort = ["page10.png", "Page2.png", "page1.png", "page3.png"]
+
+    assert sorted(names_to_sort, key=natural_sort_key) == [
+        "page1.png", "Page2.png", "page3.png", "page10.png"
+    ]
+
+
+def test_images_are_sorted_by_capture_time(tmp_path: Path):
+    now: float = time.time()
+    make_photo(tmp_path, "a.jpg", "2021:05:01 10:00:00", modified_at=now)
+    make_photo(tmp_path, "b.jpg", "2020:01:01 10:00:00", modified_at=now)
+    make_photo(
+        tmp_path, "c.jpg", "2020:06:01 10:00:00", EXIF_DATE_TIME,
+        modified_at=now
+    )
+    make_photo(tmp_path, "d.jpg", modified_at=now - 20)
+    make_photo(tmp_path, "e.jpg", modified_at=now - 40)
+    comics = Comics.load_from_folder(tmp_path)
+
+    comics.sort_images("capture_timestamp")
+
+    # Images without capture time go last, ordered by modification time
+    assert names(comics) == ["b.jpg", "c.jpg", "a.jpg", "e.jpg", "d.jpg"]
+    assert comics[0].sort_keys.capture_timestamp == time.mktime(
+        (2020, 1, 1, 10, 0, 0, 0, 0, -1)
+    )
+
+
+@pytest.mark.parametrize("order, expected", [
+    ("name", ["1.png", "10.png", "2.png"]),
+    ("natural_name", ["1.png", "2.png", "10.png"]),
+    ("modification_timestamp", ["2.png", "10.png", "1.png"]),
+    ("size", ["1.png", "2.png", "10.png"]),
+])
+def test_sorting_does_not_access_files(
+    tmp_path: Path, monkeypatch, order: str, expected: List[str]
+):
+    for index, (name, size) in enumerate(
+        [("1.png", 10), ("2.png", 100), ("10.png", 400)]
+    ):
+        path: Path = make_image(tmp_path, name, (size, size))
+        modified_at: float = [300, 100, 200][index]
+        os.utime(path, (modified_at, modified_at))
+
+    comics = Comics.load_from_folder(tmp_path)
+
+    def fail_stat(*args, **kwargs):
+        raise AssertionError("File was accessed while sorting")
+
+    monkeypatch.setattr(Path, "stat", fail_stat)
+    monkeypatch.setattr(os, "stat", fail_stat)
+    comics.sort_images(order)
+
+    assert names(comics) == expected
+
+
+def test_unknown_order_is_rejected(tmp_path: Path):
+    make_image(tmp_path, "1.png")
+    comics = Comics.load_from_folder(tmp_path)
+
+    with pytest.raises(ValueError):
+        comics.sort_images("color")
+
+
+def test_only_changed_files_refresh_keys(tmp_path: Path):
+    for name in ("1.png", "2.png"):
+        make_image(tmp_path, name, (20, 30))
+
+    comics = Comics.load_from_folder(tmp_path)
+    comics.sort_images("name")
+    make_image(tmp_path, "2.png", (200, 300), color=(1, 2, 3))
+
+    assert comics.refresh_sort_keys() == 1
+    assert comics[1].sort_keys.size == (tmp_path / "2.png").stat().st_size
+    assert comics[1].size == (200, 300)
+    assert comics.refresh_sort_keys() == 0
+
+
+def test_keys_of_scanned_images_come_from_their_stats(tmp_path: Path):
+    path: Path = make_image(tmp_path, "1.png")
+
+    image: ComicsImage = Comics.load_from_folder(tmp_path)[0]
+
+    stat = path.stat()
+    assert image.sort_keys.matches(stat)
+    assert image.sort_keys.modification_timestamp == stat.st_mtime
@@ -0,0 +1,50 @@
+from pathlib import Path
+
+import pytest
+
+from comix_pdf.types import Comics
+from tests.helpers import make_image, read_pdf_pages
+
+
+@pytest.fixture
+def comics(tmp_path: Path) -> Comics:
+    make_image(tmp_path, "01.png", (200, 300), "RGB", (200, 30, 40))
+    make_image(tmp_path, "02.png", (300, 200), "RGBA", (10, 90, 200, 128))
+    make_image(tmp_path, "03.png", (100, 100), "L", 90)
+    make_image(tmp_path, "04.jpg", (120, 160), "RGB", (40, 160, 40))
+
+    comics = Comics.load_from_folder(tmp_path)
+    comics.sort_images("name")
+    return comics
+
+
+def render_pages(comics: Comics, file_name: str, **render_options):
+    comics.output_file_name = file_name
+    comics.render(**render_options)
+    return read_pdf_pages(comics.output_file_path)
+
+
+def test_streaming_render_matches_render_in_memory(comics: Comics):
+    expected = render_pages(comics, "in_memory.pdf")
+    streamed = render_pages(comics, "streamed.pdf", streaming=True)
+
+    assert len(expected) == len(comics)
+    assert streamed == expected
+
+
+def test_parallel_render_matches_render_in_memory(comics: Comics):
+    expected = render_pages(comics, "in_memory.pdf")
+    parallel = render_pages(comics, "parallel.pdf", workers=2)
+
+    assert parallel == expected
+
+
+def test_streaming_render_uses_resolution_for_page_size(comics: Comics):
+    pages = render_pages(
+        comics, "streamed.pdf", streaming=True, resolution=100
+    )
+
+    assert [page.media_box for page in pages] == [
+        [0, 0, 144.0, 216.0], [0, 0, 216.0, 144.0],
+        [0, 0, 72.0, 72.0], [0, 0, 86.4, 115.2],
+    ]
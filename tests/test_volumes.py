@@ -0,0 +1,80 @@
+import os
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from comix_pdf.types import Comics, RenderReport
+from tests.helpers import make_image, read_pdf_pages
+
+
+@pytest.fixture
+def comics(tmp_path: Path) -> Comics:
+    pages_folder: Path = tmp_path / "pages"
+    pages_folder.mkdir()
+    output_folder: Path = tmp_path / "output"
+    output_folder.mkdir()
+    for number in range(5):
+        make_image(pages_folder, f"{number}.png", (20 + number, 30))
+
+    comics = Comics.load_from_folder(pages_folder)
+    comics.sort_images("name")
+    comics.output_folder = output_folder
+    comics.output_file_name = "Title.pdf"
+    return comics
+
+
+@pytest.mark.parametrize("volume_number, volumes_total, name", [
+    (1, 3, "Title - Vol 01.pdf"),
+    (12, 12, "Title - Vol 12.pdf"),
+    (7, 150, "Title - Vol 007.pdf"),
+])
+def test_volume_names_are_numbered(
+    comics: Comics, volume_number: int, volumes_total: int, name: str
+):
+    assert comics.volume_file_name(volume_number, volumes_total) == name
+
+
+def test_long_titles_keep_number_of_volume(comics: Comics):
+    comics.output_file_name = "T" * 300
+    names: List[str] = [
+        comics.volume_file_name(number, 12) for number in range(1, 13)
+    ]
+
+    assert len(set(names)) == len(names)
+    for number, name in enumerate(names, start=1):
+        assert name.endswith(f" - Vol {number:02d}.pdf")
+        assert len(name) <= 255
+
+
+@pytest.mark.parametrize("volume_workers", [1, 2])
+def test_volumes_split_pages(comics: Comics, volume_workers: int):
+    report: RenderReport = comics.render(
+        max_volume_pages=2, volume_workers=volume_workers
+    )
+
+    assert [path.name for path in report.volumes] == [
+        "Title - Vol 01.pdf", "Title - Vol 02.pdf", "Title - Vol 03.pdf"
+    ]
+    assert sorted(os.listdir(comics.output_folder)) == [
+        path.name for path in report.volumes
+    ]
+    assert [
+        [page.image_size for page in read_pdf_pages(path)]
+        for path in report.volumes
+    ] == [[(20, 30), (21, 30)], [(22, 30), (23, 30)], [(24, 30)]]
+    assert [page.page_index for page in report] == list(range(5))
+
+
+def test_volumes_split_by_size(comics: Comics):
+    sizes: List[int] = [image.stored_size for image in comics]
+    report: RenderReport = comics.render(
+        max_volume_size=sizes[0] + sizes[1]
+    )
+
+    assert report.volumes is not None
+    assert sum(
+        len(read_pdf_pages(path)) for path in report.volumes
+    ) == len(comics)
+    for path in report.volumes:
+        assert 1 <= len(read_pdf_pages(path)) <= 2